@@ -0,0 +1,28 @@
+"""add users keyset pagination index
+
+Revision ID: 3e8b6d41f0c2
+Revises: cdfaa3527e2a
+Create Date: 2026-10-19 18:12:05.291847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b6d41f0c2'
+down_revision: Union[str, Sequence[str], None] = 'cdfaa3527e2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at_id', table_name='users')
@@ -0,0 +1,45 @@
+"""add employee projections
+
+Revision ID: fe411c710521
+Revises: 8622524c9257
+Create Date: 2026-10-19 14:02:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fe411c710521'
+down_revision: Union[str, Sequence[str], None] = '8622524c9257'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_projections',
+    sa.Column('employee_id', sa.String(length=36), nullable=False),
+    sa.Column('employee_code', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('last_event_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('department_id', sa.String(length=36), nullable=True),
+    sa.Column('employment_status', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('employee_id')
+    )
+    op.create_index(op.f('ix_employee_projections_department_id'), 'employee_projections', ['department_id'], unique=False)
+    op.create_index(op.f('ix_employee_projections_employee_code'), 'employee_projections', ['employee_code'], unique=False)
+    op.create_index(op.f('ix_employee_projections_user_id'), 'employee_projections', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employee_projections_user_id'), table_name='employee_projections')
+    op.drop_index(op.f('ix_employee_projections_employee_code'), table_name='employee_projections')
+    op.drop_index(op.f('ix_employee_projections_department_id'), table_name='employee_projections')
+    op.drop_table('employee_projections')
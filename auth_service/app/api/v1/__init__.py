@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1 import users, auth, health, roles
+from app.api.v1 import users, auth, health, roles, dead_letters
 
 router = APIRouter(prefix="/v1")
 router.include_router(health.router, prefix="/health", tags=["Health"])
 router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 router.include_router(users.router, prefix="/users", tags=["Users"])
 router.include_router(roles.router, prefix="/roles", tags=["Roles and Permissions"])
+router.include_router(dead_letters.router, prefix="/dead-letters", tags=["Dead Letters"])
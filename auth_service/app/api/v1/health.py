@@ -7,9 +7,11 @@ from app.core.db import async_get_db
 from app.core.health import check_database_health, check_redis_health
 from app.core.schemas import HealthCheck, ReadyCheck
 from app.core.utils.cache import async_get_redis
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from redis.asyncio import Redis
+from shared.cache.metrics import cache_metrics
+from shared.messaging.connection import ConnectionMonitor
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -19,6 +21,16 @@ STATUS_UNHEALTHY = "unhealthy"
 
 LOGGER = logging.getLogger(__name__)
 
+# Server-wide Redis counters exported next to the per-prefix cache metrics
+REDIS_INFO_METRICS = {
+    "used_memory": "gauge",
+    "maxmemory": "gauge",
+    "evicted_keys": "counter",
+    "expired_keys": "counter",
+    "keyspace_hits": "counter",
+    "keyspace_misses": "counter",
+}
+
 
 @router.get("/health", response_model=HealthCheck)
 async def health():
@@ -33,8 +45,18 @@ async def health():
     return JSONResponse(status_code=http_status, content=response)
 
 
+def check_rabbitmq_health(request: Request) -> bool:
+    """The publisher is connected and every consumer is consuming"""
+    rabbitmq = getattr(request.app.state, "rabbitmq", None)
+    consumers = getattr(request.app.state, "event_consumers", {})
+    if rabbitmq is None:
+        return True
+    return rabbitmq.ready and all(consumer.ready for consumer in consumers.values())
+
+
 @router.get("/ready", response_model=ReadyCheck)
 async def ready(
+    request: Request,
     redis: Annotated[Redis, Depends(async_get_redis)],
     db: Annotated[AsyncSession, Depends(async_get_db)],
 ):
@@ -42,9 +64,13 @@ async def ready(
     LOGGER.debug(f"Database health check status: {database_status}")
     redis_status = await check_redis_health(redis=redis)
     LOGGER.debug(f"Redis health check status: {redis_status}")
+    rabbitmq_status = check_rabbitmq_health(request)
+    LOGGER.debug(f"RabbitMQ health check status: {rabbitmq_status}")
 
     overall_status = (
-        STATUS_HEALTHY if database_status and redis_status else STATUS_UNHEALTHY
+        STATUS_HEALTHY
+        if database_status and redis_status and rabbitmq_status
+        else STATUS_UNHEALTHY
     )
     http_status = (
         status.HTTP_200_OK
@@ -59,7 +85,42 @@ async def ready(
         "app": STATUS_HEALTHY,
         "database": STATUS_HEALTHY if database_status else STATUS_UNHEALTHY,
         "redis": STATUS_HEALTHY if redis_status else STATUS_UNHEALTHY,
+        "rabbitmq": STATUS_HEALTHY if rabbitmq_status else STATUS_UNHEALTHY,
         "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
     }
 
     return JSONResponse(status_code=http_status, content=response)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    request: Request, redis: Annotated[Redis, Depends(async_get_redis)]
+):
+    """Cache and messaging metrics in the Prometheus text format"""
+    lines = []
+    try:
+        info = await redis.info()
+    except Exception as e:
+        LOGGER.warning(f"Could not read Redis info for metrics: {e}")
+        info = {}
+
+    for name, metric_type in REDIS_INFO_METRICS.items():
+        if name in info:
+            lines.append(f"# TYPE redis_{name} {metric_type}")
+            lines.append(f"redis_{name} {info[name]}")
+
+    consumers = getattr(request.app.state, "event_consumers", {})
+    if consumers:
+        lines.append("# TYPE event_consumer_in_flight gauge")
+        lines.extend(
+            f'event_consumer_in_flight{{queue="{name}"}} {consumer.in_flight}'
+            for name, consumer in consumers.items()
+        )
+
+    return PlainTextResponse(
+        cache_metrics.render()
+        + ConnectionMonitor.render()
+        + "\n".join(lines)
+        + "\n",
+        media_type="text/plain; version=0.0.4",
+    )
@@ -2,7 +2,6 @@ from typing import List
 
 from app.core.db import SessionDep
 from app.core.dependencies.auth import check_permission, get_current_superuser
-from app.messaging.rabbitmq import RabbitMQDep
 from app.models.auth import User
 from app.schemas.auth import (
     AssignPermissionRequest,
@@ -62,13 +61,12 @@ async def get_role(
 @router.post("/assign-role-to-user", status_code=status.HTTP_200_OK)
 async def assign_role_to_user(
     db: SessionDep,
-    rabbitmq: RabbitMQDep,
     request: AssignRoleRequest,
     current_user: User = Depends(get_current_superuser),
 ):
     """Assign role to user"""
     user_role = await RoleService.assign_role_to_user(
-        db, rabbitmq, request.user_id, request.role_id
+        db, request.user_id, request.role_id
     )
     return {"message": "Role assigned successfully"}
 
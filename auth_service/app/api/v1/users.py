@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from app.core.db import SessionDep
 from app.core.dependencies.auth import (
@@ -10,28 +10,33 @@ from app.models.auth import User
 from app.schemas.auth import UserCreateInternal, UserResponse, UserUpdate, UserWithRoles
 from app.services.auth import AuthService
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from shared.db.pagination import with_next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UserWithRoles])
+@with_next_cursor()
 async def get_users(
     db: SessionDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(check_permission("user:read")),
 ):
-    return await AuthService.get_users(db, limit, skip)
+    return await AuthService.get_users(db, limit, skip, cursor=cursor)
 
 
 @router.get("/admins", response_model=List[UserWithRoles])
+@with_next_cursor()
 async def get_users(
     db: SessionDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: User = Depends(get_current_superuser),
 ):
-    return await AuthService.get_users(db, limit, skip, True)
+    return await AuthService.get_users(db, limit, skip, True, cursor)
 
 
 @router.post(
@@ -1,4 +1,3 @@
-import asyncio
 from collections.abc import AsyncGenerator, Callable
 from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
 from typing import Any
@@ -22,7 +21,7 @@ from app.core.db import async_engine as engine
 from app.core.dependencies.auth import get_current_superuser
 from app.core.health import check_database_health, check_redis_health
 from app.core.utils import cache, queue
-from app.messaging.event_consumer import EmployeeEventConsumer
+from app.messaging.rabbitmq import get_rabbitmq_client
 from app.middleware.client_cache_middleware import ClientCacheMiddleware
 from arq import create_pool
 from arq.connections import RedisSettings
@@ -68,13 +67,6 @@ async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter.total_tokens = number_of_tokens
 
 
-# -------------- consumer --------------
-async def start_event_consumer():
-    """Start event consumer on app startup"""
-    consumer = EmployeeEventConsumer(settings.RABBITMQ_URL)
-    asyncio.create_task(consumer.start())
-
-
 def lifespan_factory(
     settings: (
         DatabaseSettings
@@ -93,7 +85,9 @@ def lifespan_factory(
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncGenerator:
 
-        initialization_complete = asyncio.Event()
+        from asyncio import Event
+
+        initialization_complete = Event()
         app.state.initialization_complete = initialization_complete
 
         await set_threadpool_tokens()
@@ -109,7 +103,7 @@ def lifespan_factory(
                 await create_tables()
 
             if isinstance(settings, RabbitMQSettings):
-                await start_event_consumer()
+                await get_rabbitmq_client()
 
             initialization_complete.set()
 
@@ -122,6 +116,12 @@ def lifespan_factory(
             if isinstance(settings, RedisQueueSettings):
                 await close_redis_queue_pool()
 
+            if isinstance(settings, RabbitMQSettings):
+                from app.messaging.rabbitmq import rabbitmq_client
+
+                if rabbitmq_client:
+                    await rabbitmq_client.close()
+
     return lifespan
 
 
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WarmSet = Callable[[], Awaitable[int]]
+
+warm_sets: dict[str, WarmSet] = {}
+
+
+def warm_set(name: str) -> Callable[[WarmSet], WarmSet]:
+    """Register a coroutine function that preloads one set of hot cache entries.
+
+    The function takes no arguments, opens its own database session if it needs one, and returns
+    the number of entries it wrote.
+
+    Parameters
+    ----------
+    name: str
+        The name used to select the set in `CACHE_WARMING_SETS`.
+    """
+
+    def wrapper(func: WarmSet) -> WarmSet:
+        warm_sets[name] = func
+        return func
+
+    return wrapper
+
+
+async def warm_caches(names: list[str] | None = None, concurrency: int = 2) -> dict[str, Any]:
+    """Run the registered warm sets with bounded concurrency.
+
+    A failing set is logged and reported but never stops the others, since a cold cache is only
+    slower, not wrong.
+
+    Parameters
+    ----------
+    names: List[str] | None, optional
+        The sets to run. Every registered set runs if not given. Unknown names are reported as
+        errors.
+    concurrency: int, default 2
+        The maximum number of sets running at once, which bounds the extra load on the database
+        while a fresh instance is already serving traffic.
+
+    Returns
+    -------
+    Dict[str, Any]
+        For each set, the number of entries written or the error, and the total duration.
+    """
+    selected = names if names else list(warm_sets)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started_at = time.perf_counter()
+
+    async def run(name: str) -> tuple[str, dict[str, Any]]:
+        if name not in warm_sets:
+            return name, {"error": "unknown warm set"}
+
+        async with semaphore:
+            set_started_at = time.perf_counter()
+            try:
+                count = await warm_sets[name]()
+            except Exception as e:
+                logger.exception(f"Cache warm set {name} failed")
+                return name, {"error": str(e)}
+            return name, {
+                "entries": count,
+                "duration": round(time.perf_counter() - set_started_at, 3),
+            }
+
+    results = dict(await asyncio.gather(*(run(name) for name in selected)))
+    report = {
+        "sets": results,
+        "duration": round(time.perf_counter() - started_at, 3),
+    }
+    logger.info(f"Cache warming finished in {report['duration']}s: {results}")
+    return report
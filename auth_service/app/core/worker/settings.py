@@ -1,11 +1,19 @@
+from arq import cron
 from arq.connections import RedisSettings
 
 from app.core.config import settings
-from app.core.worker.functions import sample_background_task, shutdown, startup
+from app.core.worker.functions import (
+    purge_outbox_events,
+    sample_background_task,
+    shutdown,
+    startup,
+    warm_cache,
+)
 
 
 class WorkerSettings:
-    functions = [sample_background_task]
+    functions = [sample_background_task, warm_cache, purge_outbox_events]
+    cron_jobs = [cron(purge_outbox_events, hour={4}, minute={0})]
     redis_settings = RedisSettings(
         host=settings.REDIS_QUEUE_HOST, port=settings.REDIS_QUEUE_PORT
     )
@@ -6,8 +6,10 @@
 
 
 import asyncio
+import logging
 from collections.abc import AsyncGenerator, Callable
 from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
+from datetime import timedelta
 from typing import Any
 
 import anyio
@@ -15,10 +17,13 @@ import redis.asyncio as redis
 from app.api import api_router
 from app.core.config import (
     AppSettings,
+    CacheWarmingSettings,
     ClientSideCacheSettings,
+    ConsumerSettings,
     CORSSettings,
     DatabaseSettings,
     EnvironmentSettings,
+    OutboxSettings,
     RabbitMQSettings,
     RedisCacheSettings,
     RedisQueueSettings,
@@ -28,8 +33,17 @@ from app.core.db import Base, SessionDep
 from app.core.db import async_engine as engine
 from app.core.health import check_database_health, check_redis_health
 from app.core.utils import cache, queue
+from app.core.utils.warmer import warm_caches
 from app.messaging.event_consumer import EmployeeEventConsumer
+from app.messaging.outbox import run_outbox_relay
+from app.messaging.rabbitmq import create_rabbitmq_client
 from app.models import *  # noqa: F403
+from app.services import cache_warming  # noqa: F401
+from shared.db.pagination import NEXT_CURSOR_HEADER
+from shared.messaging.connection import connect_with_retry
+from shared.messaging.consumer import EventConsumer
+from shared.messaging.idempotency import IdempotencyStore
+from shared.messaging.rabbitmq import RabbitMQClient
 from arq import create_pool
 from arq.connections import RedisSettings
 from fastapi import FastAPI
@@ -65,24 +79,68 @@ async def close_redis_queue_pool() -> None:
         await queue.pool.aclose()  # type: ignore
 
 
+# -------------- cache warming --------------
+async def warm_cache(application: FastAPI) -> None:
+    """Preload the hot cache entries and keep the report on the app state"""
+    application.state.cache_warming_report = await warm_caches(
+        settings.CACHE_WARMING_SETS, settings.CACHE_WARMING_CONCURRENCY
+    )
+
+
 # -------------- application --------------
 async def set_threadpool_tokens(number_of_tokens: int = 100) -> None:
     limiter = anyio.to_thread.current_default_thread_limiter()
     limiter.total_tokens = number_of_tokens
 
 
-# -------------- consumer --------------
-async def start_event_consumer():
-    """Start event consumer on app startup"""
-    consumer = EmployeeEventConsumer(settings.RABBITMQ_URL)
-    asyncio.create_task(consumer.start())
-
+# -------------- messaging --------------
+def create_event_consumers() -> list[EventConsumer]:
+    """Event consumers owned by the application, not connected yet"""
+    idempotency = IdempotencyStore(
+        cache.client,
+        settings.SERVICE_NAME,
+        ttl=timedelta(seconds=settings.EVENT_IDEMPOTENCY_TTL),
+        lock_ttl=timedelta(seconds=settings.EVENT_IDEMPOTENCY_LOCK_TTL),
+    )
+    return [
+        EmployeeEventConsumer(settings.RABBITMQ_URL, idempotency),
+    ]
+
+
+async def start_messaging(
+    rabbitmq: RabbitMQClient, consumers: list[EventConsumer]
+) -> None:
+    """Connect the publisher, then start the consumers, retrying while the broker is down"""
+    await connect_with_retry(rabbitmq.ensure_connected, rabbitmq.monitor)
+    await asyncio.gather(*(consumer.start() for consumer in consumers))
+
+
+def log_messaging_failure(task: asyncio.Task) -> None:
+    """Log why messaging did not start, /ready keeps reporting the broker unhealthy"""
+    if not task.cancelled() and task.exception() is not None:
+        logging.error("Messaging failed to start", exc_info=task.exception())
+
+
+async def stop_messaging(
+    rabbitmq: RabbitMQClient,
+    consumers: list[EventConsumer],
+    outbox_relay: asyncio.Task | None,
+    outbox_stopping: asyncio.Event,
+) -> None:
+    """
+    Drain the consumers, let the outbox relay commit its batch, then flush and
+    close the publisher, so no event is dropped or published twice on shutdown
+    """
+    await asyncio.gather(*(consumer.stop() for consumer in consumers))
+
+    if outbox_relay is not None:
+        outbox_stopping.set()
+        try:
+            await asyncio.wait_for(outbox_relay, settings.CONSUMER_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.warning("Outbox relay did not stop in time, cancelled it")
 
-app = FastAPI(
-    title="HR Auth Service",
-    description="Authentication and Authorization Microservice",
-    version="1.0.0",
-)
+    await rabbitmq.close()
 
 
 def lifespan_factory(
@@ -95,6 +153,9 @@ def lifespan_factory(
         | RedisQueueSettings
         | EnvironmentSettings
         | RabbitMQSettings
+        | CacheWarmingSettings
+        | OutboxSettings
+        | ConsumerSettings
     ),
     create_tables_on_start: bool = True,
 ) -> Callable[[FastAPI], _AsyncGeneratorContextManager[Any]]:
@@ -106,8 +167,15 @@ def lifespan_factory(
 
         initialization_complete = Event()
         app.state.initialization_complete = initialization_complete
+        app.state.rabbitmq = None
+        app.state.event_consumers = {}
 
         await set_threadpool_tokens()
+        background_tasks: list[asyncio.Task] = []
+        rabbitmq: RabbitMQClient | None = None
+        consumers: list[EventConsumer] = []
+        outbox_relay: asyncio.Task | None = None
+        outbox_stopping = Event()
 
         try:
             if isinstance(settings, RedisCacheSettings):
@@ -120,13 +188,40 @@ def lifespan_factory(
                 await create_tables()
 
             if isinstance(settings, RabbitMQSettings):
-                await start_event_consumer()
+                rabbitmq = create_rabbitmq_client()
+                consumers = create_event_consumers()
+                app.state.rabbitmq = rabbitmq
+                app.state.event_consumers = {
+                    consumer.queue_name: consumer for consumer in consumers
+                }
+                # Connects in the background, /ready reports the broker until it is up
+                messaging = asyncio.create_task(start_messaging(rabbitmq, consumers))
+                messaging.add_done_callback(log_messaging_failure)
+                background_tasks.append(messaging)
 
             initialization_complete.set()
 
+            if (
+                isinstance(settings, CacheWarmingSettings)
+                and settings.CACHE_WARMING_ENABLED
+            ):
+                # Started after initialization so warming never delays readiness
+                background_tasks.append(asyncio.create_task(warm_cache(app)))
+
+            if isinstance(settings, OutboxSettings) and settings.OUTBOX_RELAY_ENABLED:
+                outbox_relay = asyncio.create_task(run_outbox_relay(outbox_stopping))
+
             yield
 
         finally:
+            for task in background_tasks:
+                task.cancel()
+
+            if rabbitmq is not None:
+                await stop_messaging(rabbitmq, consumers, outbox_relay, outbox_stopping)
+            elif outbox_relay is not None:
+                outbox_relay.cancel()
+
             if isinstance(settings, RedisCacheSettings):
                 await close_redis_cache_pool()
 
@@ -136,6 +231,13 @@ def lifespan_factory(
     return lifespan
 
 
+app = FastAPI(
+    title="HR Auth Service",
+    description="Authentication and Authorization Microservice",
+    version="1.0.0",
+    lifespan=lifespan_factory(settings, create_tables_on_start=False),
+)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -143,6 +245,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=settings.CORS_METHODS,
     allow_headers=settings.CORS_HEADERS,
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -1,92 +1,128 @@
-import aio_pika
-import json
-from sqlalchemy.ext.asyncio import AsyncSession
-
-
-class EmployeeEventConsumer:
-    def __init__(self, rabbitmq_url: str):
-        self.rabbitmq_url = rabbitmq_url
-        self.connection = None
-        self.channel = None
-
-    async def start(self):
-        """Start consuming employee events"""
-        self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
-        self.channel = await self.connection.channel()
-
-        # Declare exchange
-        exchange = await self.channel.declare_exchange(
-            "employee_events", aio_pika.ExchangeType.TOPIC, durable=True
+import asyncio
+import logging
+from typing import List, Tuple
+
+from shared.messaging.batching import MicroBatcher
+from shared.messaging.consumer import EventConsumer
+from shared.messaging.idempotency import IdempotencyStore
+from sqlalchemy import case, update
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.messaging.event_publisher import AuthEventPublisher
+from app.models.auth import User
+from app.services.employee_projection import EmployeeProjectionService
+
+logger = logging.getLogger(__name__)
+
+
+class EmployeeEventConsumer(EventConsumer):
+    """
+    Keep user accounts and the local employee projection in sync with employee events
+    Terminations, email changes and projection updates are applied in micro-batches,
+    one statement per batch
+    """
+
+    def __init__(self, rabbitmq_url: str, idempotency: IdempotencyStore | None = None):
+        super().__init__(
+            rabbitmq_url,
+            exchange_name="employee_events",
+            # Queue for auth service
+            queue_name="auth_service_employee_events",
+            routing_keys=["employee.*"],
+            handlers={
+                "employee.created": self.handle_employee_created,
+                "employee.snapshot": self.handle_employee_created,
+                "employee.terminated": self.handle_employee_terminated,
+                "employee.updated": self.handle_employee_updated,
+            },
+            # Handlers mostly wait on their batch, so let a full batch be in flight
+            prefetch_count=max(
+                settings.CONSUMER_PREFETCH_COUNT, settings.CONSUMER_BATCH_SIZE
+            ),
+            concurrency=max(settings.CONSUMER_CONCURRENCY, settings.CONSUMER_BATCH_SIZE),
+            idempotency=idempotency,
+            max_attempts=settings.CONSUMER_MAX_ATTEMPTS,
+            retry_base_delay=settings.CONSUMER_RETRY_BASE_DELAY,
+            retry_max_delay=settings.CONSUMER_RETRY_MAX_DELAY,
+            drain_timeout=settings.CONSUMER_DRAIN_TIMEOUT,
         )
-
-        # Declare queue for auth service
-        queue = await self.channel.declare_queue(
-            "auth_service_employee_events", durable=True
+        self.terminations: MicroBatcher[str] = MicroBatcher(
+            self.deactivate_users,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
+        )
+        self.email_changes: MicroBatcher[Tuple[str, str]] = MicroBatcher(
+            self.update_emails,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
+        )
+        self.projection: MicroBatcher[dict] = MicroBatcher(
+            self.apply_projection,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
         )
 
-        # Bind to employee events
-        await queue.bind(exchange, routing_key="employee.*")
-
-        # Start consuming
-        await queue.consume(self.process_message)
-
-    # TODO; is this necessary
-    async def stop(self):
-        if self.channel and self.consumer_tag:
-            await self.channel.cancel(self.consumer_tag)
-
-        if self.channel:
-            await self.channel.close()
-
-        if self.connection:
-            await self.connection.close()
-
-    async def process_message(self, message: aio_pika.IncomingMessage):
-        """Process incoming employee event"""
-        async with message.process():
-            event_data = json.loads(message.body.decode())
-
-            event_type = event_data.get("event_type")
-
-            if event_type == "employee.terminated":
-                await self.handle_employee_terminated(event_data)
-            elif event_type == "employee.updated":
-                await self.handle_employee_updated(event_data)
+    async def handle_employee_created(self, event_data: dict):
+        """Handle employee creation and snapshots - update the projection"""
+        await self.projection.submit(event_data)
 
     async def handle_employee_terminated(self, event_data: dict):
         """Handle employee termination - deactivate user account"""
-        from sqlalchemy import select, update
-        from app.models.auth import User
-
-        user_id = event_data["user_id"]
-
-        async with AsyncSession() as db:
-            # Find user by user_id
-            stmt = select(User).where(User.id == user_id)
-            result = await db.execute(stmt)
-            user = result.scalar_one_or_none()
-
-            if user:
-                # Deactivate user account
-                user.is_active = False
-                await db.commit()
-                print(f"Deactivated user account for employee with user_id: {user_id}")
+        updates = [self.projection.submit(event_data)]
+        user_id = event_data.get("user_id")
+        if user_id:
+            updates.append(self.terminations.submit(user_id))
+        await asyncio.gather(*updates)
 
     async def handle_employee_updated(self, event_data: dict):
         """Handle employee updates - sync email changes"""
-        from sqlalchemy import select
-        from models.auth import User
-
-        user_id = event_data["user_id"]
-        updated_fields = event_data.get("updated_fields", {})
-
-        if "email" in updated_fields:
-            async with AsyncSession() as db:
-                stmt = select(User).where(User.id == user_id)
-                result = await db.execute(stmt)
-                user = result.scalar_one_or_none()
+        updates = [self.projection.submit(event_data)]
+        user_id = event_data.get("user_id")
+        if user_id and "email" in event_data.get("updated_fields", {}):
+            updates.append(
+                self.email_changes.submit((user_id, event_data["employee_email"]))
+            )
+        await asyncio.gather(*updates)
+
+    @staticmethod
+    async def apply_projection(events: List[dict]):
+        async with local_session() as db:
+            await EmployeeProjectionService.apply_events(db, events)
+
+    @staticmethod
+    async def deactivate_users(user_ids: List[str]):
+        """Deactivate the accounts of terminated employees and announce each deactivation"""
+        async with local_session() as db:
+            stmt = (
+                update(User)
+                .where(User.id.in_(set(user_ids)), User.is_active.is_(True))
+                .values(is_active=False)
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            deactivated = result.scalars().all()
+
+            # Staged in the same transaction, only for accounts this batch actually changed
+            for user_id in deactivated:
+                await AuthEventPublisher.publish_user_deactivated(db, user_id)
+            await db.commit()
+
+        logger.info(f"Deactivated {len(deactivated)} user accounts")
+
+    @staticmethod
+    async def update_emails(changes: List[Tuple[str, str]]):
+        """Apply the email changes of a batch, the latest one winning per user"""
+        emails = dict(changes)
+        async with local_session() as db:
+            stmt = (
+                update(User)
+                .where(User.id.in_(emails))
+                .values(email=case(emails, value=User.id))
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.execute(stmt)
+            await db.commit()
 
-                if user:
-                    user.email = event_data["employee_email"]
-                    await db.commit()
-                    print(f"Updated email for user {user.id}")
+        logger.info(f"Updated email for {result.rowcount} users")
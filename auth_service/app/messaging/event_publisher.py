@@ -1,7 +1,12 @@
-from uuid import uuid4
 from typing import List
-from datetime import datetime
-from app.messaging.rabbitmq import RabbitMQClient
+from app.messaging.outbox import stage_event
+from shared.messaging.events import (
+    UserDeactivatedEvent,
+    UserPermissionsChangedEvent,
+    UserRoleAssignedEvent,
+    UserRoleRemovedEvent,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class AuthEventPublisher:
@@ -9,7 +14,7 @@ class AuthEventPublisher:
     
     @staticmethod
     async def publish_permissions_changed(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         user_id: str,
         old_permissions: List[str],
         new_permissions: List[str]
@@ -18,81 +23,55 @@ class AuthEventPublisher:
         Publish when user's permissions change
         All services listen and invalidate their caches
         """
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "user.permissions.changed",
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "old_permissions": old_permissions,
-            "new_permissions": new_permissions,
-            "added_permissions": list(set(new_permissions) - set(old_permissions)),
-            "removed_permissions": list(set(old_permissions) - set(new_permissions))
-        }
-        
-        await rabbitmq.publish_event(
-            routing_key="user.permissions.changed",
-            event_data=event
+        event = UserPermissionsChangedEvent(
+            user_id=str(user_id),
+            old_permissions=old_permissions,
+            new_permissions=new_permissions,
+            added_permissions=list(set(new_permissions) - set(old_permissions)),
+            removed_permissions=list(set(old_permissions) - set(new_permissions))
         )
-        print(f"📤 Published permissions changed for user {user_id}")
+        
+        stage_event(db, "user.permissions.changed", event)
+        print(f"📤 Staged permissions changed for user {user_id}")
     
     @staticmethod
     async def publish_role_assigned(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         user_id: str,
         role_id: str,
         role_name: str
     ):
         """Publish when role is assigned to user"""
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "user.role.assigned",
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "role_id": role_id,
-            "role_name": role_name
-        }
-        
-        await rabbitmq.publish_event(
-            routing_key="user.role.assigned",
-            event_data=event
+        event = UserRoleAssignedEvent(
+            user_id=str(user_id),
+            role_id=str(role_id),
+            role_name=role_name
         )
+        
+        stage_event(db, "user.role.assigned", event)
     
     @staticmethod
     async def publish_role_removed(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         user_id: str,
         role_id: str,
         role_name: str
     ):
         """Publish when role is removed from user"""
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "user.role.removed",
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id,
-            "role_id": role_id,
-            "role_name": role_name
-        }
-        
-        await rabbitmq.publish_event(
-            routing_key="user.role.removed",
-            event_data=event
+        event = UserRoleRemovedEvent(
+            user_id=str(user_id),
+            role_id=str(role_id),
+            role_name=role_name
         )
+        
+        stage_event(db, "user.role.removed", event)
     
     @staticmethod
     async def publish_user_deactivated(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         user_id: str
     ):
         """Publish when user is deactivated"""
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "user.deactivated",
-            "timestamp": datetime.utcnow().isoformat(),
-            "user_id": user_id
-        }
+        event = UserDeactivatedEvent(user_id=str(user_id))
         
-        await rabbitmq.publish_event(
-            routing_key="user.deactivated",
-            event_data=event
-        )
+        stage_event(db, "user.deactivated", event)
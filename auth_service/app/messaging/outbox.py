@@ -0,0 +1,27 @@
+import asyncio
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.messaging.rabbitmq import get_rabbitmq_client
+from app.models.event_log import EventLogEntry
+from app.models.outbox import OutboxEvent
+from shared.messaging.outbox import Outbox
+
+# This service's outbox and event log tables
+outbox = Outbox(OutboxEvent, EventLogEntry, settings.OUTBOX_MAX_ATTEMPTS)
+
+stage_event = outbox.stage_event
+relay_outbox_batch = outbox.relay_outbox_batch
+purge_published_events = outbox.purge_published_events
+replay_event_log = outbox.replay_event_log
+
+
+async def run_outbox_relay(stopping: asyncio.Event | None = None):
+    """Relay this service's outbox with the configured batch size and poll interval"""
+    await outbox.run_outbox_relay(
+        local_session,
+        get_rabbitmq_client,
+        settings.OUTBOX_BATCH_SIZE,
+        settings.OUTBOX_POLL_INTERVAL,
+        stopping,
+    )
@@ -1,2 +1,5 @@
 from app.models.token_blacklist import TokenBlacklist
-from app.models.auth import User, UserRole, Role, Permission, RolePermission 
\ No newline at end of file
+from app.models.auth import User, UserRole, Role, Permission, RolePermission
+from app.models.outbox import OutboxEvent
+from app.models.employee_projection import EmployeeProjection
+from app.models.event_log import EventLogEntry
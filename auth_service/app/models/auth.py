@@ -4,13 +4,17 @@ from typing import List, Optional
 
 from app.models.base import BaseModel, BaseImmutableModel
 from app.core.config import settings
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 # USER
 class User(BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination orders listings by (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
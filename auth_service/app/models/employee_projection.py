@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+# EMPLOYEE PROJECTION
+class EmployeeProjection(Base):
+    """
+    Local read model of the employee fields this service needs
+    Maintained from employee events, so reads never call the employee service
+    """
+
+    __tablename__ = "employee_projections"
+
+    employee_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    employee_code: Mapped[str] = mapped_column(String(50), index=True)
+    email: Mapped[str] = mapped_column(String(255))
+    # Timestamp of the event the row reflects, older events are ignored
+    last_event_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    user_id: Mapped[Optional[str]] = mapped_column(
+        String(36), nullable=True, index=True, default=None
+    )
+    first_name: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True, default=None
+    )
+    last_name: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True, default=None
+    )
+    department_id: Mapped[Optional[str]] = mapped_column(
+        String(36), nullable=True, index=True, default=None
+    )
+    employment_status: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True, default=None
+    )
+
+    @property
+    def full_name(self) -> str:
+        return " ".join(name for name in (self.first_name, self.last_name) if name)
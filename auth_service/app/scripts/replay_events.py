@@ -0,0 +1,67 @@
+"""
+Replay events from this service's event log
+
+Streams logged events in publish order, filtered by type and time range, either
+straight into one queue (e.g. to rebuild a new or purged consumer) or back onto the
+exchange under their original routing keys. Consumers deduplicate on event_id, so
+events a consumer already handled within its idempotency TTL are skipped.
+
+    python -m app.scripts.replay_events --queue employee_service_auth_events \
+        --type user.deactivated --since 2026-01-01
+"""
+
+import argparse
+import asyncio
+from datetime import UTC, datetime
+
+from app.core.db import local_session
+from app.messaging.outbox import replay_event_log
+from app.messaging.rabbitmq import get_rabbitmq_client
+from shared.messaging.outbox import rabbitmq_sink
+
+
+def timestamp(value: str) -> datetime:
+    """ISO timestamp, naive ones are read as UTC"""
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+async def main(args: argparse.Namespace):
+    rabbitmq = await get_rabbitmq_client()
+    try:
+        async with local_session() as db:
+            replayed, last_sequence = await replay_event_log(
+                db,
+                rabbitmq_sink(rabbitmq, args.queue),
+                event_types=args.types,
+                since=args.since,
+                until=args.until,
+                after_sequence=args.after_sequence,
+                batch_size=args.batch_size,
+            )
+    finally:
+        await rabbitmq.close()
+    print(f"Replayed {replayed} events, last sequence {last_sequence}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--queue", help="Publish into this queue only, instead of the exchange"
+    )
+    parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        help="Event type to replay, repeatable (default: all)",
+    )
+    parser.add_argument("--since", type=timestamp, help="Events at or after this time")
+    parser.add_argument("--until", type=timestamp, help="Events before this time")
+    parser.add_argument(
+        "--after-sequence",
+        type=int,
+        default=0,
+        help="Resume after this sequence, as printed by an interrupted replay",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
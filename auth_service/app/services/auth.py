@@ -22,6 +22,7 @@ from sqlalchemy import or_, select, delete, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 from shared.auth.jwt_utils import JWTManager
+from shared.db.pagination import paginate
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/sign-in")
@@ -226,23 +227,26 @@ class AuthService:
             ],
         )
 
+    @staticmethod
     async def get_users(
         db: AsyncSession,
         limit: int = 50,
         offset: int = 0,
         include_superusers: bool = False,
+        cursor: Optional[str] = None,
     ) -> List[UserWithRoles]:
-        result = await db.execute(
-            select(User)
-            .options(selectinload(User.user_roles).selectinload(UserRole.role))
-            .limit(limit)
-            .offset(offset)
-            .order_by(User.created_at.desc())
+        """Get users, newest first, after `cursor` if given"""
+        stmt = select(User).options(
+            selectinload(User.user_roles).selectinload(UserRole.role)
         )
 
         if not include_superusers:
             stmt = stmt.where(User.is_superuser == False)
 
+        stmt = paginate(
+            stmt, User.created_at, User.id, limit, cursor, offset, descending=True
+        )
+        result = await db.execute(stmt)
         users = result.scalars().all()
 
         return [
@@ -1,7 +1,6 @@
 from typing import Optional, List
 
 from app.messaging.event_publisher import AuthEventPublisher
-from app.messaging.rabbitmq import RabbitMQClient
 from app.models.auth import Role, RolePermission, UserRole
 from app.schemas.auth import RoleCreate, RoleWithPermissions, PermissionResponse
 from fastapi import HTTPException, status
@@ -84,7 +83,7 @@ class RoleService:
 
     @staticmethod
     async def assign_role_to_user(
-        db: AsyncSession, rabbitmq: RabbitMQClient, user_id: str, role_id: str
+        db: AsyncSession, user_id: str, role_id: str
     ) -> UserRole:
         # TEST
         # await db.execute(
@@ -109,27 +108,26 @@ class RoleService:
                 detail="Role already assigned to user",
             )
 
+        role_result = await db.execute(select(Role.name).where(Role.id == role_id))
+        role_name = role_result.scalar_one()
+
         user_role = UserRole(user_id=user_id, role_id=role_id)
         db.add(user_role)
+
+        # Stage event, committed together with the assignment
+        await AuthEventPublisher.publish_role_assigned(db, user_id, role_id, role_name)
+
         await db.commit()
         await db.refresh(user_role)
-        
-        role_result = await db.execute(select(Role.name).where(Role.id == role_id))
-        role_name = role_result.scalar_one()
-        
-        # Publish event
-        await AuthEventPublisher.publish_role_assigned(
-            rabbitmq, user_id, role_id, role_name
-        )
 
         return user_role
 
     @staticmethod
-    async def remove_role_from_user(
-        db: AsyncSession, rabbitmq: RabbitMQClient, user_id: str, role_id: str
-    ):
+    async def remove_role_from_user(db: AsyncSession, user_id: str, role_id: str):
         result = await db.execute(
-            select(UserRole).where(
+            select(UserRole)
+            .options(selectinload(UserRole.role))
+            .where(
                 UserRole.user_id == user_id,
                 UserRole.role_id == role_id,
             )
@@ -143,14 +141,15 @@ class RoleService:
             )
 
         await db.delete(user_role)
-        await db.commit()
 
-        # Publish event
+        # Stage event, committed together with the removal
         if user_role.role:
             await AuthEventPublisher.publish_role_removed(
-                rabbitmq, user_id, role_id, user_role.role.name
+                db, user_id, role_id, user_role.role.name
             )
 
+        await db.commit()
+
         # Invalidate cache
         cache = await get_permission_cache()
         await cache.invalidate_all_for_user(user_id)
@@ -0,0 +1,143 @@
+import bisect
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Dict, List, Tuple
+
+# Upper bounds of the histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LOOKUP_RESULTS = ("hit", "miss", "stale")
+
+# Called with (event, prefix, value) for every recorded sample
+Observer = Callable[[str, str, float], None]
+
+
+def metric_prefix(key_or_prefix: str) -> str:
+    """Reduce a cache key, tag or key prefix to its first segment.
+
+    Keeps the label set small: 'payroll_records:{employee_id}' and 'payroll_records:42' are both
+    reported as 'payroll_records'.
+    """
+    return key_or_prefix.split(":", 1)[0]
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class CacheMetrics:
+    """
+    In-process cache metrics, rendered in the Prometheus text format
+    Each worker process keeps its own counters, like any Prometheus client
+    """
+
+    def __init__(self):
+        self.lookups: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.evictions: Dict[str, int] = defaultdict(int)
+        self.recompute: Dict[str, _Histogram] = {}
+        self.payload: Dict[str, _Histogram] = {}
+        self.observers: List[Observer] = []
+
+    def add_observer(self, observer: Observer):
+        """Forward every sample to another sink, e.g. StatsD or Sentry"""
+        self.observers.append(observer)
+
+    def _notify(self, event: str, prefix: str, value: float):
+        for observer in self.observers:
+            observer(event, prefix, value)
+
+    def record_lookup(self, prefix: str, result: str):
+        """Count a cache read as a hit, a miss or a stale serve"""
+        prefix = metric_prefix(prefix)
+        self.lookups[(prefix, result)] += 1
+        self._notify(result, prefix, 1)
+
+    def record_eviction(self, prefix: str, count: int = 1):
+        """Count cache keys deleted by an invalidation"""
+        if count <= 0:
+            return
+        prefix = metric_prefix(prefix)
+        self.evictions[prefix] += count
+        self._notify("eviction", prefix, count)
+
+    def observe_recompute(self, prefix: str, seconds: float):
+        """Record how long a cache miss took to recompute"""
+        prefix = metric_prefix(prefix)
+        if prefix not in self.recompute:
+            self.recompute[prefix] = _Histogram(LATENCY_BUCKETS)
+        self.recompute[prefix].observe(seconds)
+        self._notify("recompute_seconds", prefix, seconds)
+
+    def observe_payload(self, prefix: str, size: int):
+        """Record the size in bytes of a value written to the cache"""
+        prefix = metric_prefix(prefix)
+        if prefix not in self.payload:
+            self.payload[prefix] = _Histogram(SIZE_BUCKETS)
+        self.payload[prefix].observe(size)
+        self._notify("payload_bytes", prefix, size)
+
+    def timer(self) -> Callable[[], float]:
+        """Start a timer, returning a function that gives the elapsed seconds"""
+        started_at = time.perf_counter()
+        return lambda: time.perf_counter() - started_at
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = [
+            "# HELP cache_lookups_total Cache reads by key prefix and result.",
+            "# TYPE cache_lookups_total counter",
+        ]
+        for (prefix, result), count in sorted(self.lookups.items()):
+            lines.append(
+                f'cache_lookups_total{{prefix="{prefix}",result="{result}"}} {count}'
+            )
+
+        lines += [
+            "# HELP cache_evictions_total Cache keys deleted by invalidation, by key prefix.",
+            "# TYPE cache_evictions_total counter",
+        ]
+        for prefix, count in sorted(self.evictions.items()):
+            lines.append(f'cache_evictions_total{{prefix="{prefix}"}} {count}')
+
+        lines += self._render_histograms(
+            "cache_recompute_seconds",
+            "Time spent recomputing a missed value, by key prefix.",
+            self.recompute,
+        )
+        lines += self._render_histograms(
+            "cache_payload_bytes",
+            "Size of the values written to the cache, by key prefix.",
+            self.payload,
+        )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histograms(
+        name: str, description: str, histograms: Dict[str, _Histogram]
+    ) -> List[str]:
+        lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+        for prefix, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{{prefix="{prefix}",le="{bound}"}} {cumulative}'
+                )
+            total = cumulative + histogram.counts[-1]
+            lines.append(f'{name}_bucket{{prefix="{prefix}",le="+Inf"}} {total}')
+            lines.append(f'{name}_sum{{prefix="{prefix}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{prefix="{prefix}"}} {total}')
+        return lines
+
+
+# Global metrics instance
+cache_metrics = CacheMetrics()
@@ -0,0 +1,68 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class MicroBatcher(Generic[T]):
+    """
+    Collect items submitted by concurrent handlers and process them together
+
+    A batch is flushed once `max_size` items are waiting or `max_wait` seconds after
+    its first item arrived. `submit` returns once its item's batch was processed. If a
+    batch fails, its items are retried one by one, so only the offending ones fail.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[T]], Awaitable[None]],
+        max_size: int = 100,
+        max_wait: float = 0.05,
+    ):
+        self.process_batch = process_batch
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def submit(self, item: T):
+        """Add an item to the next batch and wait until that batch is processed"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            await self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        try:
+            await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            for item, future in batch:
+                try:
+                    await self.process_batch([item])
+                except Exception as item_error:
+                    future.set_exception(item_error)
+                else:
+                    future.set_result(None)
+            return
+
+        for _, future in batch:
+            future.set_result(None)
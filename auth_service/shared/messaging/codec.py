@@ -0,0 +1,36 @@
+import json
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - JSON is used instead
+    msgpack = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+
+def supported_content_types() -> Tuple[str, ...]:
+    """Content types this process can decode, most compact first"""
+    return (MSGPACK, JSON) if msgpack is not None else (JSON,)
+
+
+def negotiate_content_type(preferred: str) -> str:
+    """Use the preferred content type if it can be encoded here, otherwise JSON"""
+    return preferred if preferred in supported_content_types() else JSON
+
+
+def encode(event_data: Dict[str, Any], content_type: str = JSON) -> Tuple[bytes, str]:
+    """Serialize an event, returning the body and the content type actually used"""
+    if negotiate_content_type(content_type) == MSGPACK:
+        return msgpack.packb(event_data, use_bin_type=True), MSGPACK
+    return json.dumps(event_data).encode(), JSON
+
+
+def decode(body: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """Deserialize an event by its content type, messages without one are JSON"""
+    if content_type == MSGPACK:
+        if msgpack is None:
+            raise ValueError("Received a msgpack event but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body.decode())
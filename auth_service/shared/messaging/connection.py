@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Dict, Optional, TypeVar
+
+import aio_pika
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ConnectionMonitor:
+    """
+    Track the state of a robust RabbitMQ connection for readiness checks and metrics
+
+    aio_pika reconnects on its own, the monitor only listens to its close and
+    reconnect callbacks. The latest monitor created under each name is kept in
+    `ConnectionMonitor.monitors`, so they can be rendered together.
+    """
+
+    monitors: Dict[str, "ConnectionMonitor"] = {}
+
+    def __init__(self, name: str):
+        self.name = name
+        self.connected = False
+        self.connect_attempts = 0
+        self.reconnects = 0
+        self.disconnects = 0
+        self.last_error: Optional[str] = None
+        self.last_change_at: Optional[datetime] = None
+        ConnectionMonitor.monitors[name] = self
+
+    def attach(self, connection: aio_pika.abc.AbstractRobustConnection):
+        """Start tracking a freshly opened connection"""
+        connection.close_callbacks.add(self._on_close)
+        connection.reconnect_callbacks.add(self._on_reconnect)
+        self._set_connected(True)
+
+    def _set_connected(self, connected: bool):
+        self.connected = connected
+        self.last_change_at = datetime.now(UTC)
+
+    def _on_close(self, sender, exc: Optional[BaseException] = None):
+        self.disconnects += 1
+        if exc is not None:
+            self.last_error = str(exc)
+        self._set_connected(False)
+
+    def _on_reconnect(self, sender):
+        self.reconnects += 1
+        self._set_connected(True)
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "connected": self.connected,
+            "connect_attempts": self.connect_attempts,
+            "reconnects": self.reconnects,
+            "disconnects": self.disconnects,
+            "last_error": self.last_error,
+            "last_change_at": (
+                self.last_change_at.isoformat(timespec="seconds")
+                if self.last_change_at
+                else None
+            ),
+        }
+
+    @classmethod
+    def render(cls) -> str:
+        """Connection metrics of every monitor in the Prometheus text format"""
+        if not cls.monitors:
+            return ""
+        metrics = (
+            ("rabbitmq_connected", "gauge", lambda m: int(m.connected)),
+            ("rabbitmq_connect_attempts_total", "counter", lambda m: m.connect_attempts),
+            ("rabbitmq_reconnects_total", "counter", lambda m: m.reconnects),
+            ("rabbitmq_disconnects_total", "counter", lambda m: m.disconnects),
+        )
+        lines = []
+        for name, metric_type, value in metrics:
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(
+                f'{name}{{connection="{monitor.name}"}} {value(monitor)}'
+                for monitor in cls.monitors.values()
+            )
+        return "\n".join(lines) + "\n"
+
+
+async def connect_with_retry(
+    connect: Callable[[], Awaitable[T]],
+    monitor: ConnectionMonitor,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+) -> T:
+    """
+    Run `connect` until it succeeds, backing off exponentially between attempts
+
+    aio_pika only reconnects connections that were established once, so this covers
+    a broker that is unreachable when the service starts. Retries until cancelled.
+    """
+    delay = base_delay
+    while True:
+        monitor.connect_attempts += 1
+        try:
+            return await connect()
+        except (ConnectionError, OSError, aio_pika.exceptions.AMQPError) as e:
+            monitor.last_error = str(e)
+            logger.warning(
+                f"Could not connect {monitor.name} to RabbitMQ, retrying in {delay}s: {e}"
+            )
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
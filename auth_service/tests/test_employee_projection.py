@@ -0,0 +1,45 @@
+from datetime import UTC, datetime, timedelta
+
+from app.models.employee_projection import EmployeeProjection
+from app.services.employee_projection import EmployeeProjectionService
+from sqlalchemy import delete
+
+NOW = datetime.now(UTC)
+
+
+def employee_event(event_type, seconds, **fields):
+    return {
+        "event_type": event_type,
+        "timestamp": (NOW + timedelta(seconds=seconds)).isoformat(),
+        "employee_id": "e1",
+        "employee_code": "EMP00001",
+        "employee_email": "jane@example.com",
+        "user_id": "u1",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "department_id": "d1",
+        "employment_status": "active",
+        **fields,
+    }
+
+
+async def test_cleared_fields_reach_the_projection(db_session):
+    await db_session.execute(delete(EmployeeProjection))
+    await EmployeeProjectionService.apply_events(
+        db_session, [employee_event("employee.created", 0)]
+    )
+
+    # Moved out of every department, then an older event arrives late
+    await EmployeeProjectionService.apply_events(
+        db_session,
+        [
+            employee_event("employee.updated", 10, department_id=None),
+            employee_event("employee.updated", 5, department_id="d2"),
+        ],
+    )
+    db_session.expunge_all()
+    employee = await EmployeeProjectionService.get_employee(db_session, "e1")
+    assert employee.department_id is None
+
+    await db_session.execute(delete(EmployeeProjection))
+    await db_session.commit()
@@ -0,0 +1,52 @@
+"""add event log
+
+Revision ID: 02277d9a300a
+Revises: 691879c73e7b
+Create Date: 2026-10-19 15:21:07.530911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '02277d9a300a'
+down_revision: Union[str, Sequence[str], None] = '691879c73e7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_log',
+    sa.Column('event_id', sa.String(length=36), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('routing_key', sa.String(length=255), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('sequence', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('sequence'),
+    sa.UniqueConstraint('event_id')
+    )
+    op.create_index(op.f('ix_event_log_occurred_at'), 'event_log', ['occurred_at'], unique=False)
+    op.create_index('ix_event_log_type_occurred_at', 'event_log', ['event_type', 'occurred_at'], unique=False)
+
+    # Backfill with the published events the outbox still holds
+    op.execute("""
+        INSERT INTO event_log (event_id, event_type, routing_key, payload, occurred_at, published_at)
+        SELECT payload->>'event_id', payload->>'event_type', routing_key, payload,
+               (payload->>'timestamp')::timestamptz, published_at
+        FROM outbox_events
+        WHERE published_at IS NOT NULL
+        ORDER BY published_at, created_at
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_event_log_type_occurred_at', table_name='event_log')
+    op.drop_index(op.f('ix_event_log_occurred_at'), table_name='event_log')
+    op.drop_table('event_log')
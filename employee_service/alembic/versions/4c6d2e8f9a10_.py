@@ -0,0 +1,54 @@
+"""add workforce analytics rollups
+
+Revision ID: 4c6d2e8f9a10
+Revises: e7a3c9d15b42
+Create Date: 2026-10-19 21:03:17.582240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c6d2e8f9a10'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c9d15b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('headcount_rollups',
+    sa.Column('department_id', sa.String(length=36), nullable=False),
+    sa.Column('position_id', sa.String(length=36), nullable=False),
+    sa.Column('employment_type', sa.String(length=20), nullable=False),
+    sa.Column('employment_status', sa.String(length=20), nullable=False),
+    sa.Column('headcount', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('department_id', 'position_id', 'employment_type', 'employment_status')
+    )
+    op.create_table('workforce_employees',
+    sa.Column('employee_id', sa.String(length=36), nullable=False),
+    sa.Column('department_id', sa.String(length=36), nullable=False),
+    sa.Column('position_id', sa.String(length=36), nullable=False),
+    sa.Column('employment_type', sa.String(length=20), nullable=False),
+    sa.Column('employment_status', sa.String(length=20), nullable=False),
+    sa.Column('hire_month', sa.String(length=7), nullable=True),
+    sa.Column('termination_month', sa.String(length=7), nullable=True),
+    sa.Column('last_event_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('employee_id')
+    )
+    op.create_table('workforce_trends',
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('hires', sa.Integer(), nullable=False),
+    sa.Column('terminations', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('month')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('workforce_trends')
+    op.drop_table('workforce_employees')
+    op.drop_table('headcount_rollups')
@@ -0,0 +1,43 @@
+"""add code sequences
+
+Revision ID: 5b1d0e8c4a27
+Revises: 02277d9a300a
+Create Date: 2026-10-19 17:02:44.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d0e8c4a27'
+down_revision: Union[str, Sequence[str], None] = '02277d9a300a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('code_sequences',
+    sa.Column('prefix', sa.String(length=10), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('prefix')
+    )
+    op.add_column('departments', sa.Column('code_prefix', sa.String(length=10), nullable=True))
+    # Continue after the codes generated from count(*) so far
+    op.execute(
+        """
+        INSERT INTO code_sequences (prefix, next_value)
+        SELECT 'EMP', COALESCE(MAX(CAST(SUBSTRING(employee_code FROM 4) AS BIGINT)), -1) + 1
+        FROM employees
+        WHERE employee_code ~ '^EMP[0-9]+$'
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('departments', 'code_prefix')
+    op.drop_table('code_sequences')
@@ -0,0 +1,39 @@
+"""add employee search indexes
+
+Revision ID: 9d2e5f7a1c84
+Revises: c41f7a9e2b53
+Create Date: 2026-10-19 19:04:51.733016
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e5f7a1c84'
+down_revision: Union[str, Sequence[str], None] = 'c41f7a9e2b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_employees_search_document', 'employees', [sa.text("to_tsvector('simple', first_name || ' ' || last_name || ' ' || email || ' ' || employee_code)")], unique=False, postgresql_using='gin')
+    op.create_index('ix_employees_full_name_trgm', 'employees', [sa.text("(first_name || ' ' || last_name) gin_trgm_ops")], unique=False, postgresql_using='gin')
+    op.create_index('ix_employees_email_trgm', 'employees', [sa.text('email gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('ix_employees_code_trgm', 'employees', [sa.text('employee_code gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('ix_departments_name_trgm', 'departments', [sa.text('name gin_trgm_ops')], unique=False, postgresql_using='gin')
+    op.create_index('ix_positions_title_trgm', 'positions', [sa.text('title gin_trgm_ops')], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_positions_title_trgm', table_name='positions')
+    op.drop_index('ix_departments_name_trgm', table_name='departments')
+    op.drop_index('ix_employees_code_trgm', table_name='employees')
+    op.drop_index('ix_employees_email_trgm', table_name='employees')
+    op.drop_index('ix_employees_full_name_trgm', table_name='employees')
+    op.drop_index('ix_employees_search_document', table_name='employees')
@@ -0,0 +1,34 @@
+"""add keyset pagination indexes
+
+Revision ID: c41f7a9e2b53
+Revises: 5b1d0e8c4a27
+Create Date: 2026-10-19 18:10:37.604219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7a9e2b53'
+down_revision: Union[str, Sequence[str], None] = '5b1d0e8c4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_departments_created_at_id', 'departments', ['created_at', 'id'], unique=False)
+    op.create_index('ix_positions_created_at_id', 'positions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_employees_created_at_id', 'employees', ['created_at', 'id'], unique=False)
+    op.create_index('ix_employees_department_created_at_id', 'employees', ['department_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employees_department_created_at_id', table_name='employees')
+    op.drop_index('ix_employees_created_at_id', table_name='employees')
+    op.drop_index('ix_positions_created_at_id', table_name='positions')
+    op.drop_index('ix_departments_created_at_id', table_name='departments')
@@ -0,0 +1,37 @@
+"""add employee changes
+
+Revision ID: e7a3c9d15b42
+Revises: 9d2e5f7a1c84
+Create Date: 2026-10-19 20:12:38.104577
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c9d15b42'
+down_revision: Union[str, Sequence[str], None] = '9d2e5f7a1c84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_changes',
+    sa.Column('employee_id', sa.String(length=36), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('previous', sa.JSON(), nullable=False),
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_employee_changes_employee_changed_at', 'employee_changes', ['employee_id', 'changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employee_changes_employee_changed_at', table_name='employee_changes')
+    op.drop_table('employee_changes')
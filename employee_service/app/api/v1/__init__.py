@@ -1,8 +1,19 @@
 from fastapi import APIRouter
-from app.api.v1 import employee, position, department, health
+from app.api.v1 import (
+    analytics,
+    dead_letters,
+    department,
+    employee,
+    health,
+    hierarchy,
+    position,
+)
 
 router = APIRouter(prefix="/v1")
 router.include_router(health.router, prefix="/health", tags=["Health"])
 router.include_router(employee.router, prefix="/employees", tags=["Employees"])
 router.include_router(position.router, prefix="/positions", tags=["Positions"])
 router.include_router(department.router, prefix="/departments", tags=["Departments"])
+router.include_router(hierarchy.router, prefix="/hierarchy", tags=["Hierarchy"])
+router.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+router.include_router(dead_letters.router, prefix="/dead-letters", tags=["Dead Letters"])
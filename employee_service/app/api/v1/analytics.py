@@ -0,0 +1,34 @@
+from app.core.db import SessionDep
+from app.core.dependencies.auth import check_permission
+from app.core.utils.cache import cache
+from app.core.utils.etag import with_etag
+from app.schemas.employment import WorkforceAnalytics
+from app.services.workforce_analytics import WorkforceAnalyticsService
+from fastapi import APIRouter, Depends, Query, Request
+
+router = APIRouter()
+
+
+@router.get("/workforce", response_model=WorkforceAnalytics)
+@with_etag
+@cache(
+    key_prefix="workforce_analytics",
+    expiration=300,
+    query_key_params=["months"],
+    tags=["analytics", "departments"],
+)
+async def get_workforce_analytics(
+    request: Request,
+    db: SessionDep,
+    months: int = Query(12, ge=1, le=60, description="Months of hire and termination trends"),
+    current_user=Depends(check_permission("employee:read")),
+):
+    """
+    Headcount by department, position, employment type and status, with monthly
+    hires and terminations
+
+    Served from rollups kept current by employee events, so figures trail writes by
+    the event delay. Send the returned ETag as If-None-Match to get a 304 when
+    nothing changed.
+    """
+    return await WorkforceAnalyticsService.get_workforce(db, months)
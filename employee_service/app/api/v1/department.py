@@ -1,14 +1,16 @@
-from typing import List
+from typing import List, Optional
 
 from app.core.db import SessionDep
 from app.core.dependencies.auth import check_permission, get_current_active_user
+from app.core.utils.cache import cache, invalidate_tags
 from app.schemas.employment import (
     DepartmentCreate,
     DepartmentResponse,
     DepartmentUpdate,
 )
 from app.services.department import DepartmentService
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from shared.db.pagination import with_next_cursor
 
 router = APIRouter()
 
@@ -25,21 +27,26 @@ async def create_department(
 ):
     """Create a new department"""
     department = await DepartmentService.create_department(db, department_data)
+    await invalidate_tags("departments")
     return department
 
 
 @router.get("/departments", response_model=List[DepartmentResponse])
+@with_next_cursor()
+@cache(key_prefix="departments", query_key_params=["skip", "limit", "cursor"])
 async def get_departments(
+    request: Request,
     db: SessionDep,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     # current_user=Depends(check_permission("employee:read")),
     current_user=Depends(get_current_active_user),
     
 ):
     """Get all departments"""
-    departments = await DepartmentService.get_departments(db, skip, limit)
-    return departments
+    departments = await DepartmentService.get_departments(db, skip, limit, cursor)
+    return [DepartmentResponse.model_validate(department) for department in departments]
 
 
 @router.get("/departments/{department_id}", response_model=DepartmentResponse)
@@ -68,4 +75,6 @@ async def update_department(
     department = await DepartmentService.update_department(
         db, department_id, department_data
     )
+    # Employee responses embed their department
+    await invalidate_tags("departments", "employees")
     return department
@@ -1,19 +1,59 @@
+import io
+import uuid
 from datetime import date
 from typing import List, Optional
 
 import httpx
-from app.core.db import SessionDep
+from app.core.config import settings
+from app.core.db import SessionDep, local_session
 from app.core.dependencies.auth import check_permission, get_current_user_from_token
-from app.messaging.rabbitmq import RabbitMQDep
+from app.core.utils import queue
+from app.core.utils.cache import cache, invalidate_tags
 from app.schemas.employment import (
+    EMPLOYEE_BATCH_DEFAULT_FIELDS,
+    EmployeeAsOfRequest,
+    EmployeeAsOfResponse,
+    EmployeeBatchRequest,
+    EmployeeBatchResponse,
+    EmployeeBulkReport,
+    EmployeeBulkTransition,
+    EmployeeChangeResponse,
     EmployeeCreate,
+    EmployeeImportReport,
     EmployeeResponse,
+    EmployeeSearchResult,
     EmployeeUpdate,
     EmployeeWithRelations,
+    employee_projection_model,
 )
-from app.services.employee import EmployeeService
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.services.employee import (
+    EMPLOYEE_FIELDS,
+    EMPLOYEE_RELATIONS,
+    EmployeeService,
+    parse_fieldset,
+)
+from app.services.employee_bulk import EmployeeBulkService
+from app.services.employee_history import EmployeeHistoryService
+from app.services.employee_import import (
+    EmployeeImportService,
+    import_format,
+    iter_import_rows,
+)
+from app.services.employee_search import EmployeeSearchService
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from shared.auth.jwt_utils import TokenData
+from shared.db.pagination import with_next_cursor
 
 router = APIRouter()
 
@@ -25,7 +65,10 @@ async def create_employee(
     current_user=Depends(check_permission("employee:write")),
 ):
     """Create a new employee"""
-    employee = await EmployeeService.create_employee(db, employee_data)
+    employee = await EmployeeService.create_employee(
+        db, employee_data, with_event=True
+    )
+    await invalidate_tags("employees")
     return employee
 
 
@@ -41,43 +84,260 @@ async def create_employee(
     # payload = employee_data.model_copy(update={"user_id": current_user.user_id})
     # employee = await EmployeeService.create_employee(db, payload)
     employee_data.user_id = current_user.user_id
-    employee = await EmployeeService.create_employee(db, employee_data)
+    employee = await EmployeeService.create_employee(
+        db, employee_data, with_event=True
+    )
+    await invalidate_tags("employees")
     return employee
 
 
-@router.get("/", response_model=List[EmployeeResponse])
+@router.get(
+    "/",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": List[EmployeeResponse]}},
+)
+@with_next_cursor()
+@cache(
+    key_prefix="employees",
+    expiration=300,
+    query_key_params=[
+        "department_id",
+        "position_id",
+        "manager_id",
+        "employment_status",
+        "reports_to",
+        "skip",
+        "limit",
+        "cursor",
+        "fields",
+        "include",
+    ],
+    scope="permissions",
+)
 async def get_employees(
+    request: Request,
     db: SessionDep,
     department_id: Optional[str] = None,
     position_id: Optional[str] = None,
     manager_id: Optional[str] = None,
     employment_status: Optional[str] = None,
+    reports_to: Optional[str] = Query(
+        None, description="Only direct and indirect reports of this manager"
+    ),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return, all by default"
+    ),
+    include: Optional[str] = Query(
+        None, description="Comma-separated relationships to embed, none by default"
+    ),
     current_user=Depends(check_permission("employee:read")),
 ):
-    """Get employees with optional filters"""
+    """
+    Get employees with optional filters
+
+    `fields` narrows the loaded and returned columns, id and created_at are always
+    returned as the cursor is built from them.
+    """
+    fieldset = parse_fieldset(fields, EMPLOYEE_FIELDS, ("id", "created_at"))
+    relations = parse_fieldset(include, EMPLOYEE_RELATIONS) or frozenset()
     employees = await EmployeeService.get_employees(
-        db, department_id, position_id, manager_id, employment_status, skip, limit
+        db,
+        department_id,
+        position_id,
+        manager_id,
+        employment_status,
+        skip,
+        limit,
+        cursor,
+        reports_to,
+        fieldset,
+        relations,
+    )
+    model = employee_projection_model(fieldset, relations)
+    return [model.model_validate(employee) for employee in employees]
+
+
+@router.post(
+    "/batch",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": EmployeeBatchResponse}},
+)
+async def get_employees_batch(
+    batch: EmployeeBatchRequest,
+    current_user=Depends(check_permission("employee:read")),
+):
+    """
+    Look up to EMPLOYEE_BATCH_MAX_KEYS employees by id or code in one query
+
+    Returns a compact projection unless `fields` are given, id and employee_code are
+    always included. The body is streamed as rows are read from the database.
+    """
+    if len(batch.ids) + len(batch.codes) > settings.EMPLOYEE_BATCH_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EMPLOYEE_BATCH_MAX_KEYS} ids and codes per batch",
+        )
+    fieldset = parse_fieldset(
+        batch.fields or EMPLOYEE_BATCH_DEFAULT_FIELDS,
+        EMPLOYEE_FIELDS,
+        ("id", "employee_code"),
+    )
+    fields = [field for field in EMPLOYEE_FIELDS if field in fieldset]
+
+    async def body():
+        # Its own session, open for as long as the response streams
+        async with local_session() as db:
+            async for chunk in EmployeeService.stream_employees_batch_json(
+                db, batch.ids, batch.codes, fields
+            ):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+@router.post("/bulk", response_model=EmployeeBulkReport)
+async def bulk_transition_employees(
+    transition: EmployeeBulkTransition,
+    response: Response,
+    db: SessionDep,
+    current_user=Depends(check_permission("employee:write")),
+):
+    """
+    Terminate, suspend, reassign the manager of or move many employees at once
+
+    Small transitions are applied right away. Larger ones run in the worker and
+    answer 202 with a `job_id` whose progress is read from `/bulk/{job_id}`.
+    """
+    await EmployeeBulkService.validate(db, transition)
+    if len(transition.employee_ids) <= settings.EMPLOYEE_BULK_SYNC_LIMIT or (
+        queue.pool is None
+    ):
+        return await EmployeeBulkService.apply(db, transition)
+
+    job_id = uuid.uuid4().hex
+    report = EmployeeBulkReport(
+        action=transition.action,
+        status="queued",
+        job_id=job_id,
+        total=len(set(transition.employee_ids)),
+    )
+    await EmployeeBulkService.save_progress(report)
+    await queue.pool.enqueue_job(
+        "apply_employee_bulk_transition",
+        transition.model_dump(mode="json"),
+        job_id,
+        _job_id=job_id,
+    )
+    response.status_code = status.HTTP_202_ACCEPTED
+    return report
+
+
+@router.get("/bulk/{job_id}", response_model=EmployeeBulkReport)
+async def get_bulk_transition(
+    job_id: str,
+    current_user=Depends(check_permission("employee:write")),
+):
+    """Progress of a background bulk transition"""
+    report = await EmployeeBulkService.get_progress(job_id)
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bulk transition not found"
+        )
+    return report
+
+
+@router.post("/as-of", response_model=EmployeeAsOfResponse)
+async def get_employees_as_of(
+    request_data: EmployeeAsOfRequest,
+    db: SessionDep,
+    current_user=Depends(check_permission("employee:read")),
+):
+    """
+    Employees as they were at a point in time
+
+    Ids of employees unknown or not yet created then are listed under `missing`.
+    """
+    if len(request_data.ids) > settings.EMPLOYEE_AS_OF_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.EMPLOYEE_AS_OF_MAX_IDS} ids per request",
+        )
+    return await EmployeeHistoryService.get_employees_as_of(
+        db, request_data.ids, request_data.as_of
     )
-    return employees
 
 
-@router.get("/{employee_id}", response_model=EmployeeWithRelations)
+@router.get("/search", response_model=List[EmployeeSearchResult])
+@cache(
+    key_prefix="employee_search",
+    expiration=60,
+    query_key_params=["q", "employment_status", "limit"],
+    tags=["employees"],
+    scope="permissions",
+)
+async def search_employees(
+    request: Request,
+    db: SessionDep,
+    q: str = Query(..., min_length=2, max_length=100),
+    employment_status: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=50),
+    current_user=Depends(check_permission("employee:read")),
+):
+    """Search employees by name, email, code, department or position, typos tolerated"""
+    return await EmployeeSearchService.search_employees(
+        db, q, employment_status, limit
+    )
+
+
+@router.get(
+    "/{employee_id}",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": EmployeeWithRelations}},
+)
+@cache(
+    key_prefix="employee:{employee_id}",
+    query_key_params=["fields", "include"],
+    tags=["employees", "departments"],
+)
 async def get_employee(
+    request: Request,
     employee_id: str,
     db: SessionDep,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return, all by default"
+    ),
+    include: Optional[str] = Query(
+        None, description="Comma-separated relationships to embed, all by default"
+    ),
     current_user=Depends(check_permission("employee:read")),
 ):
     """Get employee by ID with relationships"""
+    fieldset = parse_fieldset(fields, EMPLOYEE_FIELDS, ("id",))
+    relations = parse_fieldset(include, EMPLOYEE_RELATIONS)
+    if relations is None:
+        relations = frozenset(EMPLOYEE_RELATIONS)
     employee = await EmployeeService.get_employee(
-        db, employee_id, include_relations=True
+        db, employee_id, fields=fieldset, include=relations
     )
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
         )
-    return employee
+    return employee_projection_model(fieldset, relations).model_validate(employee)
+
+
+@router.get("/{employee_id}/history", response_model=List[EmployeeChangeResponse])
+async def get_employee_history(
+    employee_id: str,
+    db: SessionDep,
+    limit: int = Query(100, ge=1, le=500),
+    current_user=Depends(check_permission("employee:read")),
+):
+    """Changes made to an employee, newest first"""
+    return await EmployeeHistoryService.get_history(db, employee_id, limit)
 
 
 @router.get("/code/{employee_code}", response_model=EmployeeResponse)
@@ -104,9 +364,43 @@ async def update_employee(
 ):
     """Update employee"""
     employee = await EmployeeService.update_employee(db, employee_id, employee_data)
+    await invalidate_tags("employees")
     return employee
 
 
+@router.post("/import", response_model=EmployeeImportReport)
+async def import_employees(
+    db: SessionDep,
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(
+        None,
+        alias="format",
+        description="csv, json or jsonl, taken from the file extension by default",
+    ),
+    current_user=Depends(check_permission("employee:write")),
+):
+    """Bulk import employees from a CSV, JSON or JSON Lines file"""
+    file_format = file_format or import_format(file.filename or "")
+    if file_format not in ("csv", "json", "jsonl"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported import format, use csv, json or jsonl",
+        )
+
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await EmployeeImportService.import_employees(
+            db, iter_import_rows(lines, file_format)
+        )
+    finally:
+        # Leave closing the upload to FastAPI
+        lines.detach()
+
+    if report.created:
+        await invalidate_tags("employees")
+    return report
+
+
 @router.post("/{employee_id}/terminate", response_model=EmployeeResponse)
 async def terminate_employee(
     employee_id: str,
@@ -115,9 +409,10 @@ async def terminate_employee(
     current_user=Depends(check_permission("employee:write")),
 ):
     """Terminate an employee"""
-    employee = await EmployeeService.terminate_employee(
+    employee = await EmployeeService.terminate_employee_with_events(
         db, employee_id, termination_date
     )
+    await invalidate_tags("employees")
     return employee
 
 
@@ -132,7 +427,6 @@ async def create_employee_with_account(
     username: str,
     password: str,
     db: SessionDep,
-    rabbitmq: RabbitMQDep,
     current_user=Depends(check_permission("employee:write")),
 ):
     """Create employee and user account in auth service"""
@@ -140,9 +434,7 @@ async def create_employee_with_account(
     from app.core.config import settings
 
     # 1. Create employee in Employee Management service
-    employee = await EmployeeService.create_employee_with_events(
-        db, employee_data, rabbitmq
-    )
+    employee = await EmployeeService.create_employee_with_events(db, employee_data)
 
     # 2. Create user account in Auth service
     auth_client = AuthServiceClient(settings.AUTH_SERVICE_URL)
@@ -155,14 +447,17 @@ async def create_employee_with_account(
             auth_token=current_user.access_token,  # Pass through from request
         )
     except httpx.HTTPError as e:
-        # Rollback employee creation if auth service fails
-        await db.delete(employee)
-        await db.commit()
+        # Roll back the employee creation if the auth service fails
+        await EmployeeService.discard_created_employee(
+            db, employee, reason="User account creation failed"
+        )
+        await invalidate_tags("employees")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create user account: {str(e)}",
         )
 
+    await invalidate_tags("employees")
     return employee
 
 
@@ -0,0 +1,57 @@
+from typing import List, Optional
+
+from app.core.db import SessionDep
+from app.core.dependencies.auth import check_permission
+from app.schemas.employment import DepartmentTreeNode, OrgChartEmployee
+from app.services.hierarchy import HierarchyService
+from fastapi import APIRouter, Depends, Query
+
+router = APIRouter()
+
+
+@router.get("/employees/{employee_id}/chain", response_model=List[OrgChartEmployee])
+async def get_reporting_chain(
+    employee_id: str,
+    db: SessionDep,
+    current_user=Depends(check_permission("employee:read")),
+):
+    """Managers of an employee, from the direct manager up to the top"""
+    chart = await HierarchyService.get_chart(db)
+    return chart.reporting_chain(employee_id)
+
+
+@router.get(
+    "/employees/{employee_id}/reports", response_model=List[OrgChartEmployee]
+)
+async def get_reports(
+    employee_id: str,
+    db: SessionDep,
+    max_depth: Optional[int] = Query(
+        None, ge=1, description="1 for direct reports only, all levels by default"
+    ),
+    current_user=Depends(check_permission("employee:read")),
+):
+    """Direct and indirect reports of a manager"""
+    chart = await HierarchyService.get_chart(db)
+    return chart.all_reports(employee_id, max_depth)
+
+
+@router.get("/departments/headcounts", response_model=List[DepartmentTreeNode])
+async def get_department_headcounts(
+    db: SessionDep,
+    current_user=Depends(check_permission("employee:read")),
+):
+    """Headcount of every department, on its own and with its sub-departments"""
+    chart = await HierarchyService.get_chart(db)
+    return chart.headcounts()
+
+
+@router.get("/departments/{department_id}/tree", response_model=DepartmentTreeNode)
+async def get_department_tree(
+    department_id: str,
+    db: SessionDep,
+    current_user=Depends(check_permission("employee:read")),
+):
+    """A department and its sub-departments, nested, with headcounts"""
+    chart = await HierarchyService.get_chart(db)
+    return chart.department_tree(department_id)
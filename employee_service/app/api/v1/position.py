@@ -5,6 +5,7 @@ from app.core.dependencies.auth import check_permission
 from app.schemas.employment import PositionCreate, PositionResponse
 from app.services.position import PositionService
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from shared.db.pagination import with_next_cursor
 
 router = APIRouter()
 
@@ -23,16 +24,20 @@ async def create_position(
 
 
 @router.get("/positions", response_model=List[PositionResponse])
+@with_next_cursor()
 async def get_positions(
     db: SessionDep,
     department_id: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user=Depends(check_permission("employee:read")),
 ):
     """Get positions with optional department filter"""
-    positions = await PositionService.get_positions(db, department_id, skip, limit)
-    return positions
+    positions = await PositionService.get_positions(
+        db, department_id, skip, limit, cursor
+    )
+    return [PositionResponse.model_validate(position) for position in positions]
 
 
 @router.get("/positions/{position_id}", response_model=PositionResponse)
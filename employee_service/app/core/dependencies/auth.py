@@ -4,6 +4,7 @@ from app.core.config import settings
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from shared.auth.jwt_utils import JWTManager, TokenData
+from shared.cache.metrics import cache_metrics
 from shared.cache.permissions import PermissionCache, get_permission_cache
 
 oauth2_scheme = OAuth2PasswordBearer(
@@ -54,8 +55,9 @@ async def get_current_user_from_token(
         print(f"✅ Using cached permissions for user {token_data.user_id}")
         token_data.permissions = cached_permissions
     else:
-        # Cache the permissions from token
+        # Cache the permissions from token, which may be as old as the token itself
         print(f"📝 Caching permissions for user {token_data.user_id}")
+        cache_metrics.record_lookup("user_permissions", "stale")
         await cache.set_user_permissions(token_data.user_id, token_data.permissions)
 
     return token_data
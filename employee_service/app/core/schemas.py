@@ -19,9 +19,29 @@ class ReadyCheck(BaseModel):
     app: str
     database: str
     redis: str
+    rabbitmq: str
     timestamp: str
 
 
+class DeadLetter(BaseModel):
+    event_id: str | None
+    event_type: str | None
+    attempts: int
+    error: str | None
+    dead_lettered_at: str | None
+    event: dict[str, Any] | str
+
+
+class DeadLetterReplay(BaseModel):
+    # Only replay these events, otherwise every dead letter within the limit
+    event_ids: list[str] | None = None
+    limit: int = Field(default=100, ge=1, le=1000)
+
+
+class DeadLetterReplayResult(BaseModel):
+    replayed: int
+
+
 # -------------- mixins --------------
 class UUIDSchema(BaseModel):
     id: uuid_pkg.UUID = Field(default_factory=lambda: str(uuid_pkg.uuid4()))
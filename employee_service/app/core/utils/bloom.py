@@ -0,0 +1,143 @@
+import hashlib
+import math
+from collections.abc import AsyncIterable, Iterable
+
+from app.core.utils import cache
+
+
+class BloomFilter:
+    """Redis-backed Bloom filter.
+
+    The filter is stored as a Redis bitmap, so every service instance shares it. Membership checks
+    can return false positives but never false negatives, which makes it safe to skip the database
+    whenever the filter says a value was never added.
+
+    Parameters
+    ----------
+    name: str
+        The Redis key of the bitmap.
+    capacity: int
+        The number of values the filter is sized for.
+    error_rate: float
+        The false positive rate expected once `capacity` values have been added.
+
+    Note
+    ----
+        - A filter that has never been rebuilt is not trusted: `might_contain` answers True until
+          `rebuild` has run once, so a cold filter never hides existing rows.
+        - Values cannot be removed. Deleted rows stay in the filter until the next `rebuild`.
+        - Values added while a rebuild runs are written to both the live and the new bitmap,
+          so swapping the new one in never loses them.
+    """
+
+    def __init__(self, name: str, capacity: int, error_rate: float) -> None:
+        self.name = name
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    @property
+    def _ready_key(self) -> str:
+        return f"{self.name}:ready"
+
+    @property
+    def _building_key(self) -> str:
+        return f"{self.name}:building"
+
+    @property
+    def _rebuilding_key(self) -> str:
+        return f"{self.name}:rebuilding"
+
+    def _offsets(self, value: str) -> list[int]:
+        """Compute the bit offsets of a value using double hashing."""
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    async def add_many(self, values: Iterable[str], key: str | None = None) -> None:
+        """Add values to the filter, and to the bitmap being rebuilt if there is one."""
+        if cache.client is None:
+            return
+
+        offsets = [offset for value in values for offset in self._offsets(value)]
+        keys = [key] if key else [self.name]
+        if key is None and await cache.client.exists(self._rebuilding_key):
+            keys.append(self._building_key)
+
+        async with cache.client.pipeline(transaction=True) as pipe:
+            for target in keys:
+                operation = pipe.bitfield(target)
+                for offset in offsets:
+                    operation.set("u1", offset, 1)
+                operation.execute()
+            await pipe.execute()
+
+    async def might_contain(self, value: str) -> bool:
+        """Check whether a value may have been added to the filter.
+
+        Returns
+        -------
+        bool
+            False only if the value was definitely never added.
+        """
+        if cache.client is None:
+            return True
+
+        async with cache.client.pipeline(transaction=False) as pipe:
+            pipe.exists(self._ready_key)
+            operation = pipe.bitfield(self.name)
+            for offset in self._offsets(value):
+                operation.get("u1", offset)
+            operation.execute()
+            ready, bits = await pipe.execute()
+
+        return not ready or all(bits)
+
+    async def rebuild(self, values: AsyncIterable[str], batch_size: int = 5000) -> int:
+        """Rebuild the filter from the source of truth and atomically swap it in.
+
+        Parameters
+        ----------
+        values: AsyncIterable[str]
+            Every value that should be in the filter.
+        batch_size: int, default 5000
+            The number of values written per round trip.
+
+        Returns
+        -------
+        int
+            The number of values added.
+        """
+        if cache.client is None:
+            return 0
+
+        building_key = self._building_key
+        await cache.client.delete(building_key)
+        # Set before reading the source, so a value committed after the read has passed it
+        # is added to the new bitmap by `add_many`. Expires if the rebuild dies.
+        await cache.client.set(self._rebuilding_key, 1, ex=60 * 60)
+
+        count = 0
+        batch: list[str] = []
+        async for value in values:
+            batch.append(value)
+            if len(batch) >= batch_size:
+                await self.add_many(batch, key=building_key)
+                count += len(batch)
+                batch = []
+        if batch:
+            await self.add_many(batch, key=building_key)
+            count += len(batch)
+
+        # Values added during the rebuild may have created the new bitmap on their own
+        swap = count or await cache.client.exists(building_key)
+        async with cache.client.pipeline(transaction=True) as pipe:
+            if swap:
+                pipe.rename(building_key, self.name)
+            else:
+                pipe.delete(self.name)
+            pipe.set(self._ready_key, 1)
+            pipe.delete(self._rebuilding_key)
+            await pipe.execute()
+
+        return count
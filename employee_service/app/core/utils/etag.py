@@ -0,0 +1,40 @@
+import functools
+import hashlib
+import json
+from typing import Any, Callable
+
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the If-None-Match header of a request names the given ETag"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def with_etag(func: Callable) -> Callable:
+    """
+    Serve a JSON endpoint with an ETag, answering 304 Not Modified when it matches
+
+    The tag hashes the body, so it works on top of @cache, whose hits never run the
+    endpoint body, and every instance hands out the same tag for the same data.
+    Clients are told to revalidate on each use. The endpoint needs a `request`
+    parameter.
+    """
+
+    @functools.wraps(func)
+    async def inner(*args: Any, **kwargs: Any) -> Response:
+        result = await func(*args, **kwargs)
+        body = json.dumps(jsonable_encoder(result), separators=(",", ":")).encode()
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(kwargs["request"], etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return inner
@@ -1,7 +1,12 @@
 import asyncio
 import logging
 
+import redis.asyncio as redis
 import uvloop
+from app.core.config import settings
+from app.core.db import local_session
+from app.core.utils import cache
+from app.core.utils.warmer import warm_caches
 from arq.worker import Worker
 
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
@@ -15,10 +20,66 @@ async def sample_background_task(ctx: Worker, name: str) -> str:
     return f"Task {name} is complete!"
 
 
+async def rebuild_employee_lookup_filter(ctx: Worker) -> int:
+    """Rebuild the employee lookup Bloom filter, dropping deleted employees"""
+    from app.services.employee import EmployeeService
+
+    async with local_session() as db:
+        count = await EmployeeService.rebuild_lookup_filter(db)
+    logging.info(f"Employee lookup filter rebuilt with {count} values")
+    return count
+
+
+async def warm_cache(ctx: Worker, names: list[str] | None = None) -> dict:
+    """Preload the hot cache entries, e.g. right after a deploy"""
+    from app.services import cache_warming  # noqa: F401
+
+    return await warm_caches(
+        names or settings.CACHE_WARMING_SETS, settings.CACHE_WARMING_CONCURRENCY
+    )
+
+
+async def purge_outbox_events(ctx: Worker) -> int:
+    """Delete outbox events published longer ago than the retention period"""
+    from app.messaging.outbox import purge_published_events
+
+    async with local_session() as db:
+        count = await purge_published_events(db, settings.OUTBOX_RETENTION_DAYS)
+    logging.info(f"Purged {count} published outbox events")
+    return count
+
+
+async def publish_employee_snapshot(ctx: Worker) -> int:
+    """Publish every employee's current state to seed or rebuild other services' projections"""
+    from app.services.employee import EmployeeService
+
+    async with local_session() as db:
+        count = await EmployeeService.publish_snapshot(db)
+    logging.info(f"Staged snapshot events for {count} employees")
+    return count
+
+
+async def apply_employee_bulk_transition(ctx: Worker, transition: dict, job_id: str) -> dict:
+    """Apply a bulk employee transition too large to run in the request"""
+    from app.schemas.employment import EmployeeBulkTransition
+    from app.services.employee_bulk import EmployeeBulkService
+
+    async with local_session() as db:
+        report = await EmployeeBulkService.apply(
+            db, EmployeeBulkTransition.model_validate(transition), job_id
+        )
+    logging.info(f"Bulk {report.action.value} updated {report.updated} of {report.total} employees")
+    return report.model_dump(mode="json")
+
+
 # -------- base functions --------
 async def startup(ctx: Worker) -> None:
+    cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    cache.client = redis.Redis.from_pool(cache.pool)  # type: ignore
     logging.info("Worker Started")
 
 
 async def shutdown(ctx: Worker) -> None:
+    if cache.client is not None:
+        await cache.client.aclose()  # type: ignore
     logging.info("Worker end")
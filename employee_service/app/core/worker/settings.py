@@ -1,11 +1,33 @@
+from arq import cron
 from arq.connections import RedisSettings
 
 from app.core.config import settings
-from app.core.worker.functions import sample_background_task, shutdown, startup
+from app.core.worker.functions import (
+    apply_employee_bulk_transition,
+    publish_employee_snapshot,
+    purge_outbox_events,
+    rebuild_employee_lookup_filter,
+    sample_background_task,
+    shutdown,
+    startup,
+    warm_cache,
+)
 
 
 class WorkerSettings:
-    functions = [sample_background_task]
+    functions = [
+        sample_background_task,
+        rebuild_employee_lookup_filter,
+        warm_cache,
+        purge_outbox_events,
+        publish_employee_snapshot,
+        apply_employee_bulk_transition,
+    ]
+    cron_jobs = [
+        # Bloom filters cannot forget values, so deleted employees are dropped nightly
+        cron(rebuild_employee_lookup_filter, hour={3}, minute={0}),
+        cron(purge_outbox_events, hour={4}, minute={0}),
+    ]
     redis_settings = RedisSettings(
         host=settings.REDIS_QUEUE_HOST, port=settings.REDIS_QUEUE_PORT
     )
@@ -0,0 +1,59 @@
+from typing import List
+
+from shared.messaging.batching import MicroBatcher
+from shared.messaging.consumer import EventConsumer
+from shared.messaging.idempotency import IdempotencyStore
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.core.utils.cache import invalidate_tags
+from app.services.workforce_analytics import (
+    WORKFORCE_EVENTS,
+    WorkforceAnalyticsService,
+)
+
+
+class EmployeeEventConsumer(EventConsumer):
+    """
+    Keep the workforce analytics rollups current from this service's own employee events
+    Events are applied in micro-batches, one transaction per batch
+    """
+
+    def __init__(self, rabbitmq_url: str, idempotency: IdempotencyStore | None = None):
+        super().__init__(
+            rabbitmq_url,
+            exchange_name="employee_events",
+            # Queue is unique per service, e.g. "employee_service_employee_events"
+            queue_name=f"{settings.SERVICE_NAME}_employee_events",
+            routing_keys=["employee.*"],
+            handlers={
+                event_type: self.handle_employee_event
+                for event_type in WORKFORCE_EVENTS
+            },
+            # Handlers mostly wait on their batch, so let a full batch be in flight
+            prefetch_count=max(
+                settings.CONSUMER_PREFETCH_COUNT, settings.CONSUMER_BATCH_SIZE
+            ),
+            concurrency=max(settings.CONSUMER_CONCURRENCY, settings.CONSUMER_BATCH_SIZE),
+            idempotency=idempotency,
+            max_attempts=settings.CONSUMER_MAX_ATTEMPTS,
+            retry_base_delay=settings.CONSUMER_RETRY_BASE_DELAY,
+            retry_max_delay=settings.CONSUMER_RETRY_MAX_DELAY,
+            drain_timeout=settings.CONSUMER_DRAIN_TIMEOUT,
+        )
+        self.rollups: MicroBatcher[dict] = MicroBatcher(
+            self.apply_events,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
+        )
+
+    async def handle_employee_event(self, event_data: dict):
+        """Handle any employee event - update the rollups"""
+        await self.rollups.submit(event_data)
+
+    @staticmethod
+    async def apply_events(events: List[dict]):
+        async with local_session() as db:
+            applied = await WorkforceAnalyticsService.apply_events(db, events)
+        if applied:
+            await invalidate_tags("analytics")
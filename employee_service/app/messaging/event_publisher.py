@@ -1,81 +1,88 @@
-from typing import Optional
-from uuid import uuid4
-from datetime import datetime, UTC
+from datetime import datetime
+from typing import Any, Dict, Optional
 from app.models.employment import Employee
-from app.messaging.rabbitmq import RabbitMQClient
+from app.messaging.outbox import stage_event
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.events import (
     EmployeeCreatedEvent,
+    EmployeeSnapshotEvent,
     EmployeeUpdatedEvent,
     EmployeeTerminatedEvent
 )
 
 
 class EventPublisher:
+
+    @staticmethod
+    def _employee_fields(employee: Employee) -> Dict[str, Any]:
+        """Fields every employee event carries, including the current projected state"""
+        status = employee.employment_status
+        employment_type = employee.employment_type
+        return {
+            "user_id": str(employee.user_id),
+            "employee_id": str(employee.id),
+            "employee_code": employee.employee_code,
+            "employee_email": employee.email,
+            "first_name": employee.first_name,
+            "last_name": employee.last_name,
+            "department_id": (
+                str(employee.department_id) if employee.department_id else None
+            ),
+            "employment_status": getattr(status, "value", status),
+            "position_id": str(employee.position_id) if employee.position_id else None,
+            "employment_type": getattr(employment_type, "value", employment_type),
+            "hire_date": employee.hire_date,
+            "termination_date": employee.termination_date,
+        }
     
     @staticmethod
     async def publish_employee_created(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         employee: Employee
     ):
-        """Publish employee created event"""
-        event = EmployeeCreatedEvent(
-            event_id=str(uuid4()),
-            timestamp=datetime.now(UTC),
-            user_id=str(employee.user_id),
-            employee_id=str(employee.id),
-            employee_code=employee.employee_code,
-            employee_email=employee.email,
-            first_name=employee.first_name,
-            last_name=employee.last_name,
-            hire_date=employee.hire_date.isoformat(),
-            department_id=str(employee.department_id),
-            position_id=str(employee.position_id)
-        )
+        """Stage employee created event in the outbox"""
+        event = EmployeeCreatedEvent(**EventPublisher._employee_fields(employee))
         
-        await rabbitmq.publish_event(
-            routing_key="employee.created",
-            event_data=event.model_dump()
-        )
+        stage_event(db, "employee.created", event)
     
     @staticmethod
     async def publish_employee_updated(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         employee: Employee,
         updated_fields: dict
     ):
-        """Publish employee updated event"""
+        """Stage employee updated event in the outbox"""
         event = EmployeeUpdatedEvent(
-            event_id=str(uuid4()),
-            timestamp=datetime.now(UTC),
-            employee_id=str(employee.id),
-            employee_code=employee.employee_code,
-            employee_email=employee.email,
+            **EventPublisher._employee_fields(employee),
             updated_fields=updated_fields
         )
         
-        await rabbitmq.publish_event(
-            routing_key="employee.updated",
-            event_data=event.model_dump()
-        )
+        stage_event(db, "employee.updated", event)
     
     @staticmethod
     async def publish_employee_terminated(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         employee: Employee,
         reason: Optional[str] = None
     ):
-        """Publish employee terminated event"""
+        """Stage employee terminated event in the outbox"""
         event = EmployeeTerminatedEvent(
-            event_id=str(uuid4()),
-            timestamp=datetime.now(UTC),
-            employee_id=str(employee.id),
-            employee_code=employee.employee_code,
-            employee_email=employee.email,
-            termination_date=employee.termination_date.isoformat(),
+            **EventPublisher._employee_fields(employee),
             reason=reason
         )
         
-        await rabbitmq.publish_event(
-            routing_key="employee.terminated",
-            event_data=event.model_dump()
+        stage_event(db, "employee.terminated", event)
+
+    @staticmethod
+    async def publish_employee_snapshot(
+        db: AsyncSession,
+        employee: Employee,
+        taken_at: datetime
+    ):
+        """Stage the current state of an employee, timestamped when the snapshot started"""
+        event = EmployeeSnapshotEvent(
+            **EventPublisher._employee_fields(employee),
+            timestamp=taken_at
         )
+        
+        stage_event(db, "employee.snapshot", event)
@@ -0,0 +1,14 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+# CODE SEQUENCE
+class CodeSequence(Base):
+    """Next number to hand out for codes with a given prefix, e.g. 'EMP'"""
+
+    __tablename__ = "code_sequences"
+
+    prefix: Mapped[str] = mapped_column(String(10), primary_key=True)
+    next_value: Mapped[int] = mapped_column(BigInteger)
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+
+# EMPLOYEE CHANGE
+class EmployeeChange(Base):
+    """
+    Values an employee's fields had before a change, one row per change
+    Walking the changes after a point in time back from the current row
+    reconstructs the employee as of then
+    """
+
+    __tablename__ = "employee_changes"
+    __table_args__ = (
+        # Point-in-time queries range scan the changes of each employee after a time
+        Index("ix_employee_changes_employee_changed_at", "employee_id", "changed_at"),
+    )
+
+    employee_id: Mapped[str] = mapped_column(String(36), ForeignKey("employees.id"))
+    changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # Only the fields that changed, with their previous JSON values
+    previous: Mapped[dict] = mapped_column(JSON)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        init=False,
+    )
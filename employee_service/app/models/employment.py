@@ -2,11 +2,43 @@ import enum
 from datetime import date
 from typing import List, Optional
 
-from sqlalchemy import JSON, Date, Enum, ForeignKey, String, Text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import BaseModel
 
+# Expressions behind the employee search indexes, queries must repeat them verbatim
+EMPLOYEE_FULL_NAME_SQL = "(first_name || ' ' || last_name)"
+EMPLOYEE_SEARCH_DOCUMENT_SQL = (
+    "to_tsvector('simple', first_name || ' ' || last_name || ' ' || email || ' ' "
+    "|| employee_code)"
+)
+
+# Trigram indexes need the pg_trgm extension
+event.listen(
+    BaseModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name: str, expression: str) -> Index:
+    """GIN trigram index for fuzzy matching, created on Postgres only"""
+    return Index(
+        name, text(f"{expression} gin_trgm_ops"), postgresql_using="gin"
+    ).ddl_if(dialect="postgresql")
+
 
 class EmploymentStatus(str, enum.Enum):
     ACTIVE = "active"
@@ -31,12 +63,21 @@ class Gender(str, enum.Enum):
 
 class Department(BaseModel):
     __tablename__ = "departments"
+    __table_args__ = (
+        # Keyset pagination orders listings by (created_at, id)
+        Index("ix_departments_created_at_id", "created_at", "id"),
+        trigram_index("ix_departments_name_trgm", "name"),
+    )
 
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     parent_department_id: Mapped[Optional[str]] = mapped_column(
         String(36), ForeignKey("departments.id"), nullable=True
     )
+    # Prefix of the codes of employees created in this department, e.g. "ENG"
+    code_prefix: Mapped[Optional[str]] = mapped_column(
+        String(10), nullable=True, default=None
+    )
 
     # Relationships
     parent_department: Mapped[Optional["Department"]] = relationship(
@@ -58,6 +99,11 @@ class Department(BaseModel):
 
 class Position(BaseModel):
     __tablename__ = "positions"
+    __table_args__ = (
+        # Keyset pagination orders listings by (created_at, id)
+        Index("ix_positions_created_at_id", "created_at", "id"),
+        trigram_index("ix_positions_title_trgm", "title"),
+    )
 
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -77,6 +123,23 @@ class Position(BaseModel):
 
 class Employee(BaseModel):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Keyset pagination orders listings by (created_at, id)
+        Index("ix_employees_created_at_id", "created_at", "id"),
+        # Listings filtered by department page within it
+        Index(
+            "ix_employees_department_created_at_id", "department_id", "created_at", "id"
+        ),
+        # Full-text and fuzzy search
+        Index(
+            "ix_employees_search_document",
+            text(EMPLOYEE_SEARCH_DOCUMENT_SQL),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        trigram_index("ix_employees_full_name_trgm", EMPLOYEE_FULL_NAME_SQL),
+        trigram_index("ix_employees_email_trgm", "email"),
+        trigram_index("ix_employees_code_trgm", "employee_code"),
+    )
 
     user_id: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
     employee_code: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -0,0 +1,11 @@
+from shared.messaging.outbox import EventLogEntryMixin
+
+from app.core.db import Base
+
+
+# EVENT LOG
+class EventLogEntry(EventLogEntryMixin, Base):
+    """
+    Append-only record of every event this service published
+    Kept after the outbox is purged, so consumers can be rebuilt by replaying it
+    """
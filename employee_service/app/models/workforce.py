@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db import Base
+
+# Rollup keys cannot be NULL, an employee without a department or position is keyed ""
+NO_VALUE = ""
+
+
+# WORKFORCE ANALYTICS
+class WorkforceEmployee(Base):
+    """
+    Analytics dimensions of an employee, as of the latest employee event applied
+    An event moves the employee's counts from the rollups of this row to its own
+    """
+
+    __tablename__ = "workforce_employees"
+
+    employee_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    department_id: Mapped[str] = mapped_column(String(36))
+    position_id: Mapped[str] = mapped_column(String(36))
+    employment_type: Mapped[str] = mapped_column(String(20))
+    employment_status: Mapped[str] = mapped_column(String(20))
+    # "2026-03", the months the employee counts as a hire and a termination in
+    hire_month: Mapped[Optional[str]] = mapped_column(String(7))
+    termination_month: Mapped[Optional[str]] = mapped_column(String(7))
+    last_event_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class HeadcountRollup(Base):
+    """Employees per combination of department, position, type and status"""
+
+    __tablename__ = "headcount_rollups"
+
+    department_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    position_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    employment_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    employment_status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    headcount: Mapped[int] = mapped_column(Integer)
+
+
+class WorkforceTrend(Base):
+    """Hires and terminations per month"""
+
+    __tablename__ = "workforce_trends"
+
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    hires: Mapped[int] = mapped_column(Integer, default=0)
+    terminations: Mapped[int] = mapped_column(Integer, default=0)
@@ -1,8 +1,16 @@
 from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Type
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    create_model,
+    model_validator,
+)
 
 
 class EmploymentStatusEnum(str, Enum):
@@ -31,6 +39,7 @@ class DepartmentBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
     description: Optional[str] = None
     parent_department_id: Optional[str] = None
+    code_prefix: Optional[str] = Field(None, pattern=r"^[A-Z]{2,10}$", example="ENG")
 
 
 class DepartmentCreate(DepartmentBase):
@@ -41,6 +50,7 @@ class DepartmentUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     parent_department_id: Optional[str] = None
+    code_prefix: Optional[str] = Field(None, pattern=r"^[A-Z]{2,10}$")
 
 
 class DepartmentResponse(DepartmentBase):
@@ -147,3 +157,242 @@ class EmployeeWithRelations(EmployeeResponse):
     department: Optional[DepartmentResponse] = None
     position: Optional[PositionResponse] = None
     manager: Optional[EmployeeResponse] = None
+
+
+@lru_cache(maxsize=256)
+def employee_projection_model(
+    fields: Optional[FrozenSet[str]], include: FrozenSet[str]
+) -> Type[BaseModel]:
+    """
+    Response model holding only the requested employee fields and relationships
+
+    Fields keep their EmployeeWithRelations definitions and order. `fields=None`
+    means every column.
+    """
+    selected = [
+        name
+        for name in EmployeeWithRelations.model_fields
+        if (name in include)
+        or (name in EmployeeResponse.model_fields and (fields is None or name in fields))
+    ]
+    return create_model(
+        "EmployeeProjection",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (
+                EmployeeWithRelations.model_fields[name].annotation,
+                EmployeeWithRelations.model_fields[name],
+            )
+            for name in selected
+        },
+    )
+
+
+# Batch lookup Schemas
+# Columns returned by a batch lookup unless others are requested
+EMPLOYEE_BATCH_DEFAULT_FIELDS = (
+    "id",
+    "employee_code",
+    "first_name",
+    "last_name",
+    "email",
+    "employment_status",
+    "department_id",
+    "position_id",
+)
+
+
+class EmployeeBatchRequest(BaseModel):
+    ids: List[str] = []
+    codes: List[str] = []
+    fields: Optional[List[str]] = Field(
+        None, description="Columns to return, a compact projection by default"
+    )
+
+    @model_validator(mode="after")
+    def check_keys(self):
+        if not self.ids and not self.codes:
+            raise ValueError("Provide ids or codes")
+        return self
+
+
+class EmployeeBatchMissing(BaseModel):
+    ids: List[str] = []
+    codes: List[str] = []
+
+
+class EmployeeBatchResponse(BaseModel):
+    # Only the requested fields of each employee, in no particular order
+    employees: List[dict]
+    # Requested keys that matched no employee
+    missing: EmployeeBatchMissing
+
+
+# History Schemas
+class EmployeeFieldChange(BaseModel):
+    old: Any = None
+    new: Any = None
+
+
+class EmployeeChangeResponse(BaseModel):
+    changed_at: datetime
+    changes: Dict[str, EmployeeFieldChange]
+
+
+class EmployeeAsOf(EmployeeBase):
+    id: str
+    hire_date: date
+    termination_date: Optional[date]
+    employment_status: EmploymentStatusEnum
+    employment_type: EmploymentTypeEnum
+    department_id: Optional[str]
+    position_id: Optional[str]
+    manager_id: Optional[str]
+
+
+class EmployeeAsOfRequest(BaseModel):
+    as_of: datetime
+    ids: List[str] = Field(..., min_length=1)
+
+
+class EmployeeAsOfResponse(BaseModel):
+    as_of: datetime
+    employees: List[EmployeeAsOf] = []
+    # Unknown ids and employees created after as_of
+    missing: List[str] = []
+
+
+# Analytics Schemas
+class HeadcountBucket(BaseModel):
+    # None for employees without one, e.g. no position
+    key: Optional[str]
+    headcount: int
+
+
+class DepartmentHeadcount(BaseModel):
+    department_id: Optional[str]
+    name: Optional[str] = None
+    parent_department_id: Optional[str] = None
+    headcount: int = 0
+    # Including sub-departments
+    total_headcount: int = 0
+
+
+class WorkforceTrendPoint(BaseModel):
+    month: str
+    hires: int = 0
+    terminations: int = 0
+
+
+class WorkforceAnalytics(BaseModel):
+    # Employees not terminated, which every breakdown but by_status counts
+    headcount: int
+    by_department: List[DepartmentHeadcount]
+    by_position: List[HeadcountBucket]
+    by_employment_type: List[HeadcountBucket]
+    by_status: List[HeadcountBucket]
+    trends: List[WorkforceTrendPoint]
+
+
+# Bulk transition Schemas
+class EmployeeBulkAction(str, Enum):
+    TERMINATE = "terminate"
+    SUSPEND = "suspend"
+    REASSIGN_MANAGER = "reassign_manager"
+    MOVE_DEPARTMENT = "move_department"
+
+
+# Argument each action needs
+BULK_ACTION_ARGUMENTS = {
+    EmployeeBulkAction.TERMINATE: "termination_date",
+    EmployeeBulkAction.REASSIGN_MANAGER: "manager_id",
+    EmployeeBulkAction.MOVE_DEPARTMENT: "department_id",
+}
+
+
+class EmployeeBulkTransition(BaseModel):
+    action: EmployeeBulkAction
+    employee_ids: List[str] = Field(..., min_length=1)
+    termination_date: Optional[date] = None
+    reason: Optional[str] = None
+    manager_id: Optional[str] = None
+    department_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_arguments(self):
+        argument = BULK_ACTION_ARGUMENTS.get(self.action)
+        if argument and getattr(self, argument) is None:
+            raise ValueError(f"{argument} is required to {self.action.value}")
+        return self
+
+
+class EmployeeBulkReport(BaseModel):
+    action: EmployeeBulkAction
+    # queued, running, completed or failed
+    status: str = "completed"
+    # Set when the transition runs in the background, to poll its progress
+    job_id: Optional[str] = None
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    # Not found, deleted, terminated or already in the target state
+    skipped: int = 0
+    error: Optional[str] = None
+
+
+# Search Schemas
+class EmployeeSearchResult(BaseModel):
+    id: str
+    employee_code: str
+    first_name: str
+    last_name: str
+    email: EmailStr
+    employment_status: EmploymentStatusEnum
+    department_id: Optional[str] = None
+    department_name: Optional[str] = None
+    position_id: Optional[str] = None
+    position_title: Optional[str] = None
+    # Relevance between 0 and 1, results are sorted by it
+    score: float
+
+
+# Bulk import Schemas
+class EmployeeImportRow(EmployeeCreate):
+    # Codes are assigned on import, like for single creates
+    employee_code: Optional[str] = None
+
+
+class EmployeeImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class EmployeeImportReport(BaseModel):
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    # Capped, `failed` counts every rejected row
+    errors: List[EmployeeImportError] = []
+
+
+# Hierarchy Schemas
+class OrgChartEmployee(BaseModel):
+    id: str
+    employee_code: str
+    first_name: str
+    last_name: str
+    manager_id: Optional[str] = None
+    department_id: Optional[str] = None
+    position_id: Optional[str] = None
+    # Levels between this employee and the one queried
+    depth: int = 0
+
+
+class DepartmentTreeNode(BaseModel):
+    id: str
+    name: str
+    parent_department_id: Optional[str] = None
+    # Employees in the department itself, and in it and all its sub-departments
+    headcount: int = 0
+    total_headcount: int = 0
+    children: List["DepartmentTreeNode"] = []
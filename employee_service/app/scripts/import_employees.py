@@ -0,0 +1,56 @@
+"""
+Bulk import employees from a CSV, JSON or JSON Lines file
+
+Rows are validated and inserted in batches. Valid rows are created even if others
+fail, and the failures are printed with their row numbers.
+
+    python -m app.scripts.import_employees acquired_company.csv
+"""
+
+import argparse
+import asyncio
+
+import redis.asyncio as redis
+from app.core.config import settings
+from app.core.db import local_session
+from app.core.utils import cache
+from app.services.employee_import import (
+    EmployeeImportService,
+    import_format,
+    iter_import_rows,
+)
+
+
+async def main(args: argparse.Namespace):
+    file_format = args.format or import_format(args.path)
+    if file_format is None:
+        raise SystemExit("Unknown file extension, pass --format")
+
+    # The import updates the Bloom filters and invalidates cached employees and org
+    # charts through the cache client, connected here as the worker does
+    cache.pool = redis.ConnectionPool.from_url(settings.REDIS_CACHE_URL)
+    cache.client = redis.Redis.from_pool(cache.pool)  # type: ignore
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as lines:
+            async with local_session() as db:
+                report = await EmployeeImportService.import_employees(
+                    db, iter_import_rows(lines, file_format), args.batch_size
+                )
+        if report.created:
+            await cache.invalidate_tags("employees")
+    finally:
+        await cache.client.aclose()  # type: ignore
+
+    for error in report.errors:
+        print(f"Row {error.row}: {'; '.join(error.errors)}")
+    print(
+        f"Imported {report.created} of {report.total} employees, {report.failed} failed"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "json", "jsonl"])
+    parser.add_argument("--batch-size", type=int)
+    asyncio.run(main(parser.parse_args()))
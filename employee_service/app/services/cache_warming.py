@@ -0,0 +1,70 @@
+import json
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.core.utils.cache import build_query_cache_key, set_cached_many
+from app.core.utils.warmer import warm_set
+from app.models.employment import Employee, EmploymentStatus
+from app.schemas.employment import DepartmentResponse, EmployeeWithRelations
+from app.services.department import DepartmentService
+from app.services.employee import EmployeeService
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+# Keys, tags and expirations mirror the @cache decorators of the endpoints being warmed
+CACHE_EXPIRATION = 3600
+
+
+@warm_set("active_employees")
+async def warm_active_employees() -> int:
+    """Preload the detail cache of the most recently hired active employees"""
+    stmt = (
+        select(Employee)
+        .where(Employee.employment_status == EmploymentStatus.ACTIVE)
+        .options(
+            selectinload(Employee.department),
+            selectinload(Employee.position),
+            selectinload(Employee.manager),
+        )
+        .order_by(Employee.hire_date.desc())
+        .limit(settings.CACHE_WARMING_MAX_ENTRIES)
+        .execution_options(yield_per=500)
+    )
+
+    count = 0
+    async with local_session() as db:
+        result = await db.stream_scalars(stmt)
+        async for employees in result.partitions():
+            entries = {
+                build_query_cache_key(f"employee:{employee.id}", {}): json.dumps(
+                    jsonable_encoder(EmployeeWithRelations.model_validate(employee))
+                )
+                for employee in employees
+            }
+            await set_cached_many(entries, CACHE_EXPIRATION, ["employees", "departments"])
+            count += len(entries)
+    return count
+
+
+@warm_set("departments")
+async def warm_departments() -> int:
+    """Preload the first page of the departments list"""
+    async with local_session() as db:
+        departments = await DepartmentService.get_departments(db, skip=0, limit=100)
+
+    cache_key = build_query_cache_key("departments", {"skip": 0, "limit": 100})
+    serialized_data = json.dumps(
+        jsonable_encoder(
+            [DepartmentResponse.model_validate(department) for department in departments]
+        )
+    )
+    await set_cached_many({cache_key: serialized_data}, CACHE_EXPIRATION, ["departments"])
+    return 1
+
+
+@warm_set("employee_lookup_filter")
+async def warm_employee_lookup_filter() -> int:
+    """Rebuild the lookup Bloom filter so a fresh deploy trusts it immediately"""
+    async with local_session() as db:
+        return await EmployeeService.rebuild_lookup_filter(db)
@@ -0,0 +1,82 @@
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.code_sequence import CodeSequence
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class CodeSequenceService:
+
+    @staticmethod
+    async def allocate(db: AsyncSession, prefix: str, count: int = 1) -> int:
+        """
+        Reserve `count` consecutive numbers under a prefix, returning the first
+
+        One upsert whatever the count, so bulk imports take a whole block at once.
+        The counter row stays locked until the caller commits, which keeps codes
+        unique and gapless under concurrent creates.
+        """
+        dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(CodeSequence)
+            .values(prefix=prefix, next_value=count)
+            .on_conflict_do_update(
+                index_elements=[CodeSequence.prefix],
+                set_={"next_value": CodeSequence.next_value + count},
+            )
+            .returning(CodeSequence.next_value)
+        )
+        next_value = await db.scalar(stmt)
+        return next_value - count
+
+    @staticmethod
+    async def advance_past(db: AsyncSession, prefix: str, number: int) -> None:
+        """
+        Make sure the numbers handed out under a prefix start after `number`
+
+        Used when a code in the generated format is given explicitly, so the
+        sequence never hands it out again. Never moves the counter backwards.
+        """
+        dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(CodeSequence)
+            .values(prefix=prefix, next_value=number + 1)
+            .on_conflict_do_update(
+                index_elements=[CodeSequence.prefix],
+                set_={
+                    "next_value": case(
+                        (CodeSequence.next_value > number, CodeSequence.next_value),
+                        else_=number + 1,
+                    )
+                },
+            )
+        )
+        await db.execute(stmt)
+
+    @staticmethod
+    def parse_code(code: str, prefix: str) -> Optional[int]:
+        """Number of a code in the format generated under `prefix`, None for any other"""
+        digits = code[len(prefix) :]
+        if (
+            code.startswith(prefix)
+            and len(digits) >= settings.EMPLOYEE_CODE_DIGITS
+            and digits.isascii()
+            and digits.isdigit()
+        ):
+            return int(digits)
+        return None
+
+    @staticmethod
+    def format_code(prefix: str, number: int) -> str:
+        return f"{prefix}{number:0{settings.EMPLOYEE_CODE_DIGITS}}"
+
+    @staticmethod
+    async def next_codes(db: AsyncSession, prefix: str, count: int = 1) -> List[str]:
+        """Allocate `count` codes under a prefix"""
+        first = await CodeSequenceService.allocate(db, prefix, count)
+        return [
+            CodeSequenceService.format_code(prefix, number)
+            for number in range(first, first + count)
+        ]
@@ -2,6 +2,8 @@ from typing import List, Optional
 
 from fastapi import HTTPException, status
 from app.schemas.employment import DepartmentCreate, DepartmentUpdate
+from app.services.hierarchy import HierarchyService
+from shared.db.pagination import paginate
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -49,6 +51,7 @@ class DepartmentService:
         db.add(department)
         await db.commit()
         await db.refresh(department)
+        await HierarchyService.invalidate_chart()
 
         return department
 
@@ -63,10 +66,15 @@ class DepartmentService:
 
     @staticmethod
     async def get_departments(
-        db: AsyncSession, skip: int = 0, limit: int = 100
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Department]:
-        """Get all departments"""
-        stmt = select(Department).offset(skip).limit(limit)
+        """Get all departments, after `cursor` if given"""
+        stmt = paginate(
+            select(Department), Department.created_at, Department.id, limit, cursor, skip
+        )
         result = await db.execute(stmt)
         return result.scalars().all()
 
@@ -90,5 +98,6 @@ class DepartmentService:
 
         await db.commit()
         await db.refresh(department)
+        await HierarchyService.invalidate_chart()
 
         return department
@@ -1,14 +1,89 @@
-from datetime import date
-from typing import List, Optional
-
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, date, datetime
+from typing import Any, Collection, Dict, FrozenSet, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.utils.bloom import BloomFilter
+from app.core.utils.cache import forget_missing, is_known_missing, remember_missing
 from app.messaging.event_publisher import EventPublisher
-from app.messaging.rabbitmq import RabbitMQClient
-from app.models.employment import Department, Employee, Position
-from app.schemas.employment import EmployeeCreate, EmployeeUpdate
+from app.models.employment import Department, Employee, EmploymentStatus, Position
+from app.models.outbox import OutboxEvent
+from app.schemas.employment import EmployeeCreate, EmployeeResponse, EmployeeUpdate
+from app.services.code_sequence import CodeSequenceService
+from app.services.employee_history import EmployeeHistoryService
+from app.services.hierarchy import HierarchyService
 from fastapi import HTTPException, status
-from sqlalchemy import and_, delete, func, or_, select
+from fastapi.encoders import jsonable_encoder
+from shared.db.pagination import paginate
+from sqlalchemy import String, and_, any_, bindparam, delete, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, selectinload
+
+# Unique columns served by the lookup filters
+LOOKUP_FIELDS = ("id", "employee_code", "user_id")
+
+# Columns that can be requested with `fields=`
+EMPLOYEE_FIELDS = tuple(EmployeeResponse.model_fields)
+
+# Relationships that can be loaded with an employee, and the column each one joins on
+EMPLOYEE_RELATIONS = {
+    "department": "department_id",
+    "position": "position_id",
+    "manager": "manager_id",
+}
+
+
+def parse_fieldset(
+    value: Optional[str | Collection[str]],
+    allowed: Collection[str],
+    required: Sequence[str] = (),
+) -> Optional[FrozenSet[str]]:
+    """
+    Parse a comma-separated `fields=` or `include=` query parameter, or a list
+
+    None when the parameter was not given, so callers can apply their default.
+    `required` names are always part of a given fieldset.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.split(",")
+    names = {name.strip() for name in value if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields {', '.join(sorted(unknown))}, "
+            f"expected some of {', '.join(allowed)}",
+        )
+    return frozenset(names.union(required))
+
+
+def employee_load_options(
+    fields: Optional[Collection[str]] = None, include: Collection[str] = ()
+) -> list:
+    """
+    Loader options fetching only the requested columns and relationships
+
+    Deferred columns are never touched by the projection models, so nothing is
+    lazy-loaded afterwards. Join columns of included relationships are loaded even
+    when not requested.
+    """
+    options = []
+    if fields is not None:
+        columns = set(fields) | {"id"} | {EMPLOYEE_RELATIONS[name] for name in include}
+        options.append(load_only(*(getattr(Employee, column) for column in columns)))
+    options.extend(selectinload(getattr(Employee, name)) for name in include)
+    return options
+
+
+employee_lookup_filter = BloomFilter(
+    "bloom:employees",
+    capacity=settings.EMPLOYEE_BLOOM_FILTER_CAPACITY,
+    error_rate=settings.EMPLOYEE_BLOOM_FILTER_ERROR_RATE,
+)
 
 
 class EmployeeService:
@@ -17,41 +92,45 @@ class EmployeeService:
     async def create_employee(
         db: AsyncSession,
         employee_data: EmployeeCreate,
+        with_event: bool = False,
     ) -> Employee:
-        """Create a new employee"""
+        """Create a new employee, optionally staging its created event in the outbox"""
         # TEST
         # await db.execute(delete(Employee))
         # await db.execute(delete(Position))
         # await db.execute(delete(Department))
         # await db.commit()
 
-        # Check if employee with same email or code exists
+        # Check if employee with same user_id or email exists. The code given is
+        # replaced by one from the sequence below, so it is not checked
         stmt = select(Employee).where(
             or_(
                 Employee.user_id == employee_data.user_id,
                 Employee.email == employee_data.email,
-                Employee.employee_code == employee_data.employee_code,
             )
         )
         result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
+        existing = result.scalars().first()
 
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Employee with this user_id, email or employee code already exists",
+                detail="Employee with this user_id or email already exists",
             )
 
         # Verify department exists
-        if employee_data.position_id:
+        code_prefix = settings.EMPLOYEE_CODE_PREFIX
+        if employee_data.department_id:
             dept_stmt = select(Department).where(
                 Department.id == employee_data.department_id
             )
             dept_result = await db.execute(dept_stmt)
-            if not dept_result.scalar_one_or_none():
+            department = dept_result.scalar_one_or_none()
+            if not department:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Department not found"
                 )
+            code_prefix = department.code_prefix or code_prefix
 
         # Verify position exists
         if employee_data.position_id:
@@ -70,67 +149,137 @@ class EmployeeService:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Manager not found"
                 )
-        statement = select(func.count()).select_from(Employee)
-        result = await db.execute(statement)
-        count: int = result.scalar()
-        employee_data.employee_code = f"EMP{count:05}"
-        print("employee_data", employee_data)
+
+        # Taken last, the sequence row stays locked until the commit below
+        [employee_data.employee_code] = await CodeSequenceService.next_codes(
+            db, code_prefix
+        )
         employee = Employee(**employee_data.model_dump())
         db.add(employee)
+        if with_event:
+            # Committed with the employee, then published by the outbox relay
+            await EventPublisher.publish_employee_created(db, employee)
         await db.commit()
         await db.refresh(employee)
+        await EmployeeService._register_lookups(employee)
+        await HierarchyService.invalidate_chart()
 
         return employee
 
     @staticmethod
-    async def get_employee(
-        db: AsyncSession, employee_id: str, include_relations: bool = False
+    async def _get_employee_by(
+        db: AsyncSession,
+        field: str,
+        value: str,
+        include_relations: bool = False,
+        fields: Optional[Collection[str]] = None,
+        include: Optional[Collection[str]] = None,
     ) -> Optional[Employee]:
-        """Get employee by ID with optional relationships"""
-        stmt = select(Employee).where(Employee.id == employee_id)
+        """
+        Get employee by a unique column, skipping the database for known misses
 
-        if include_relations:
-            stmt = stmt.options(
-                selectinload(Employee.department),
-                selectinload(Employee.position),
-                selectinload(Employee.manager),
-            )
+        `fields` and `include` narrow the loaded columns and relationships,
+        `include_relations` loads every relationship.
+        """
+        if await EmployeeService._is_known_missing(field, value):
+            return None
+
+        stmt = select(Employee).where(getattr(Employee, field) == value)
+
+        if include is None:
+            include = EMPLOYEE_RELATIONS if include_relations else ()
+        stmt = stmt.options(*employee_load_options(fields, include))
 
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        employee = result.scalar_one_or_none()
+
+        if employee is None:
+            await remember_missing(
+                f"employee:{field}", value, settings.NEGATIVE_CACHE_EXPIRATION
+            )
+        return employee
 
     @staticmethod
-    async def get_employee_by_user_id(
-        db: AsyncSession, user_id: str, include_relations: bool = False
+    async def _is_known_missing(field: str, value: str) -> bool:
+        """Check the Bloom filter, then the negative cache, for a lookup"""
+        if settings.EMPLOYEE_BLOOM_FILTER_ENABLED and not (
+            await employee_lookup_filter.might_contain(f"{field}:{value}")
+        ):
+            return True
+        return await is_known_missing(f"employee:{field}", value)
+
+    @staticmethod
+    async def _register_lookups(employee: Employee) -> None:
+        """Make a newly created employee visible to the lookup filters"""
+        await EmployeeService._register_many_lookups([employee])
+
+    @staticmethod
+    async def _register_many_lookups(employees: List[Employee]) -> None:
+        """Make newly created employees visible to the lookup filters in bulk"""
+        lookups = [
+            (field, getattr(employee, field))
+            for employee in employees
+            for field in LOOKUP_FIELDS
+        ]
+        if not lookups:
+            return
+        if settings.EMPLOYEE_BLOOM_FILTER_ENABLED:
+            await employee_lookup_filter.add_many(
+                f"{field}:{value}" for field, value in lookups
+            )
+        await forget_missing(
+            *[(f"employee:{field}", value) for field, value in lookups]
+        )
+
+    @staticmethod
+    async def iter_lookup_values(db: AsyncSession) -> AsyncIterator[str]:
+        """Stream every value the lookup Bloom filter should contain"""
+        stmt = select(Employee.id, Employee.employee_code, Employee.user_id)
+        result = await db.stream(stmt.execution_options(yield_per=5000))
+        async for employee_id, employee_code, user_id in result:
+            yield f"id:{employee_id}"
+            yield f"employee_code:{employee_code}"
+            yield f"user_id:{user_id}"
+
+    @staticmethod
+    async def rebuild_lookup_filter(db: AsyncSession) -> int:
+        """Rebuild the lookup Bloom filter from the employees table"""
+        if not settings.EMPLOYEE_BLOOM_FILTER_ENABLED:
+            return 0
+        return await employee_lookup_filter.rebuild(
+            EmployeeService.iter_lookup_values(db)
+        )
+
+    @staticmethod
+    async def get_employee(
+        db: AsyncSession,
+        employee_id: str,
+        include_relations: bool = False,
+        fields: Optional[Collection[str]] = None,
+        include: Optional[Collection[str]] = None,
     ) -> Optional[Employee]:
         """Get employee by ID with optional relationships"""
-        stmt = select(Employee).where(Employee.user_id == user_id)
+        return await EmployeeService._get_employee_by(
+            db, "id", employee_id, include_relations, fields, include
+        )
 
-        if include_relations:
-            stmt = stmt.options(
-                selectinload(Employee.department),
-                selectinload(Employee.position),
-                selectinload(Employee.manager),
-            )
+    @staticmethod
+    async def get_employee_by_user_id(
+        db: AsyncSession, user_id: str, include_relations: bool = False
+    ) -> Optional[Employee]:
+        """Get employee by user ID with optional relationships"""
+        return await EmployeeService._get_employee_by(
+            db, "user_id", user_id, include_relations
+        )
 
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
-    
     @staticmethod
     async def get_employee_by_code(
         db: AsyncSession, employee_code: str, include_relations: bool = False
     ) -> Optional[Employee]:
         """Get employee by employee code"""
-        stmt = select(Employee).where(Employee.employee_code == employee_code)
-
-        if include_relations:
-            stmt = stmt.options(
-                selectinload(Employee.department),
-                selectinload(Employee.position),
-                selectinload(Employee.manager),
-            )
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        return await EmployeeService._get_employee_by(
+            db, "employee_code", employee_code, include_relations
+        )
 
     @staticmethod
     async def get_employee_by_email(db: AsyncSession, email: str) -> Optional[Employee]:
@@ -148,9 +297,13 @@ class EmployeeService:
         employment_status: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
+        reports_to: Optional[str] = None,
+        fields: Optional[Collection[str]] = None,
+        include: Collection[str] = (),
     ) -> List[Employee]:
-        """Get employees with optional filters"""
-        stmt = select(Employee)
+        """Get employees with optional filters, oldest first, after `cursor` if given"""
+        stmt = select(Employee).options(*employee_load_options(fields, include))
 
         conditions = []
         if department_id:
@@ -161,11 +314,15 @@ class EmployeeService:
             conditions.append(Employee.manager_id == manager_id)
         if employment_status:
             conditions.append(Employee.employment_status == employment_status)
+        if reports_to:
+            conditions.append(
+                Employee.id.in_(HierarchyService.report_ids_query(reports_to))
+            )
 
         if conditions:
             stmt = stmt.where(and_(*conditions))
 
-        stmt = stmt.offset(skip).limit(limit)
+        stmt = paginate(stmt, Employee.created_at, Employee.id, limit, cursor, skip)
         result = await db.execute(stmt)
         return result.scalars().all()
 
@@ -205,19 +362,36 @@ class EmployeeService:
                     status_code=status.HTTP_404_NOT_FOUND, detail="Position not found"
                 )
 
-        for field, value in update_data.items():
+        updated_fields = {
+            field: value
+            for field, value in update_data.items()
+            if getattr(employee, field) != value
+        }
+        if updated_fields:
+            EmployeeHistoryService.record_change(db, employee, updated_fields)
+        for field, value in updated_fields.items():
             setattr(employee, field, value)
 
+        if updated_fields:
+            # Committed with the change, keeps other services' projections current
+            await EventPublisher.publish_employee_updated(db, employee, updated_fields)
+
         await db.commit()
         await db.refresh(employee)
+        if updated_fields:
+            await HierarchyService.invalidate_chart()
 
         return employee
 
     @staticmethod
     async def terminate_employee(
-        db: AsyncSession, employee_id: str, termination_date: date
+        db: AsyncSession,
+        employee_id: str,
+        termination_date: date,
+        with_event: bool = False,
+        reason: Optional[str] = None,
     ) -> Employee:
-        """Terminate an employee"""
+        """Terminate an employee, optionally staging its terminated event in the outbox"""
         stmt = select(Employee).where(Employee.id == employee_id)
         result = await db.execute(stmt)
         employee = result.scalar_one_or_none()
@@ -227,41 +401,170 @@ class EmployeeService:
                 status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
             )
 
+        changes = {
+            "employment_status": EmploymentStatus.TERMINATED,
+            "termination_date": termination_date,
+        }
+        changed = [f for f, value in changes.items() if getattr(employee, f) != value]
+        if changed:
+            EmployeeHistoryService.record_change(db, employee, changed)
         employee.employment_status = "terminated"
         employee.termination_date = termination_date
+        if with_event:
+            await EventPublisher.publish_employee_terminated(db, employee, reason)
 
         await db.commit()
         await db.refresh(employee)
+        await HierarchyService.invalidate_chart()
 
         return employee
 
+    @staticmethod
+    async def stream_employees_batch(
+        db: AsyncSession,
+        ids: Collection[str],
+        codes: Collection[str],
+        fields: Collection[str],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the requested columns of the employees with any of the ids or codes
+
+        One query whatever the number of keys: on Postgres each key list is bound as a
+        single array and matched with `= ANY(:keys)`, so thousands of keys do not turn
+        into thousands of bind parameters. Rows are fetched `EMPLOYEE_BATCH_FETCH_SIZE`
+        at a time, so memory stays flat for large batches.
+        """
+        postgres = db.bind.dialect.name == "postgresql"
+        conditions = []
+        for column, keys in ((Employee.id, ids), (Employee.employee_code, codes)):
+            if not keys:
+                continue
+            if postgres:
+                array = bindparam(column.key, list(keys), type_=ARRAY(String))
+                conditions.append(column == any_(array))
+            else:
+                conditions.append(column.in_(keys))
+
+        stmt = (
+            select(*(getattr(Employee, field) for field in fields))
+            .where(or_(*conditions), Employee.is_deleted.is_(False))
+            .execution_options(yield_per=settings.EMPLOYEE_BATCH_FETCH_SIZE)
+        )
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            for row in rows:
+                yield dict(row._mapping)
+
+    @staticmethod
+    async def stream_employees_batch_json(
+        db: AsyncSession,
+        ids: Collection[str],
+        codes: Collection[str],
+        fields: Collection[str],
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode a batch lookup as `{"employees": [...], "missing": {...}}`, in chunks
+
+        `fields` must hold id and employee_code, which tell the keys found apart
+        from the missing ones.
+        """
+        missing_ids, missing_codes = set(ids), set(codes)
+        chunk = [b'{"employees":[']
+        separator = b""
+        async for row in EmployeeService.stream_employees_batch(
+            db, ids, codes, fields
+        ):
+            missing_ids.discard(row["id"])
+            missing_codes.discard(row["employee_code"])
+            chunk.append(separator + json.dumps(jsonable_encoder(row)).encode())
+            separator = b","
+            if len(chunk) >= settings.EMPLOYEE_BATCH_FETCH_SIZE:
+                yield b"".join(chunk)
+                chunk = []
+        missing = {"ids": sorted(missing_ids), "codes": sorted(missing_codes)}
+        chunk.append(b'],"missing":' + json.dumps(missing).encode() + b"}")
+        yield b"".join(chunk)
+
+    @staticmethod
+    async def publish_snapshot(db: AsyncSession, batch_size: int = 1000) -> int:
+        """
+        Stage a snapshot event for every employee, so other services can seed or
+        rebuild their projections. Pages by id and commits once per page.
+        """
+        taken_at = datetime.now(UTC)
+        last_id = ""
+        count = 0
+        while True:
+            stmt = (
+                select(Employee)
+                .where(Employee.id > last_id, Employee.is_deleted.is_(False))
+                .order_by(Employee.id)
+                .limit(batch_size)
+            )
+            result = await db.execute(stmt)
+            employees = result.scalars().all()
+            if not employees:
+                return count
+
+            for employee in employees:
+                await EventPublisher.publish_employee_snapshot(db, employee, taken_at)
+            await db.commit()
+
+            count += len(employees)
+            last_id = employees[-1].id
+
     #  Event driven
     @staticmethod
     async def create_employee_with_events(
-        db: AsyncSession, employee_data: EmployeeCreate, rabbitmq: RabbitMQClient
+        db: AsyncSession, employee_data: EmployeeCreate
     ) -> Employee:
-        """Create employee and publish event"""
-        employee = await EmployeeService.create_employee(db, employee_data)
-
-        # Publish event
-        await EventPublisher.publish_employee_created(rabbitmq, employee)
+        """Create employee and stage its event in the same transaction"""
+        return await EmployeeService.create_employee(
+            db, employee_data, with_event=True
+        )
 
-        return employee
+    @staticmethod
+    async def discard_created_employee(
+        db: AsyncSession, employee: Employee, reason: str
+    ) -> None:
+        """
+        Undo the create of an employee whose follow-up step failed
+
+        While the relay has not published its employee.created event, the employee
+        is deleted together with the event, so no other service ever sees it. The
+        relay locks rows it publishes, so the delete waits for a batch in flight.
+        Once the event is out, the employee is terminated instead, which reaches
+        the other services through the outbox like any other change.
+        """
+        result = await db.execute(
+            delete(OutboxEvent).where(
+                OutboxEvent.published_at.is_(None),
+                OutboxEvent.routing_key == "employee.created",
+                OutboxEvent.payload["employee_id"].as_string() == employee.id,
+            )
+        )
+        if result.rowcount:
+            await db.delete(employee)
+            await db.commit()
+            await HierarchyService.invalidate_chart()
+            return
+
+        await EmployeeService.terminate_employee(
+            db,
+            employee.id,
+            datetime.now(UTC).date(),
+            with_event=True,
+            reason=reason,
+        )
 
     @staticmethod
     async def terminate_employee_with_events(
         db: AsyncSession,
         employee_id: str,
         termination_date: date,
-        rabbitmq: RabbitMQClient,
         reason: Optional[str] = None,
     ) -> Employee:
-        """Terminate employee and publish event"""
-        employee = await EmployeeService.terminate_employee(
-            db, employee_id, termination_date
+        """Terminate employee and stage its event in the same transaction"""
+        return await EmployeeService.terminate_employee(
+            db, employee_id, termination_date, with_event=True, reason=reason
         )
-
-        # Publish event
-        await EventPublisher.publish_employee_terminated(rabbitmq, employee, reason)
-
-        return employee
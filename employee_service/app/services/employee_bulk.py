@@ -0,0 +1,207 @@
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.utils import cache
+from app.core.utils.cache import invalidate_tags
+from app.messaging.event_publisher import EventPublisher
+from app.models.employment import Department, Employee, EmploymentStatus
+from app.schemas.employment import (
+    EmployeeBulkAction,
+    EmployeeBulkReport,
+    EmployeeBulkTransition,
+)
+from app.services.employee_history import EmployeeHistoryService
+from app.services.hierarchy import HierarchyService
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BULK_PROGRESS_KEY_PREFIX = "employee_bulk"
+
+
+class EmployeeBulkService:
+
+    @staticmethod
+    async def validate(db: AsyncSession, transition: EmployeeBulkTransition) -> None:
+        """Check the transition's size and target, once for the whole batch"""
+        if len(set(transition.employee_ids)) > settings.EMPLOYEE_BULK_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {settings.EMPLOYEE_BULK_MAX_IDS} employees per transition",
+            )
+
+        if transition.action == EmployeeBulkAction.MOVE_DEPARTMENT:
+            department = await db.get(Department, transition.department_id)
+            if department is None or department.is_deleted:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Department not found"
+                )
+
+        if transition.action == EmployeeBulkAction.REASSIGN_MANAGER:
+            manager = await db.get(Employee, transition.manager_id)
+            if (
+                manager is None
+                or manager.is_deleted
+                or manager.employment_status == EmploymentStatus.TERMINATED
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Manager not found"
+                )
+            # Reporting to one of the moved employees would close a loop
+            chart = await HierarchyService.get_chart(db)
+            above = {transition.manager_id} | {
+                employee.id for employee in chart.reporting_chain(transition.manager_id)
+            }
+            if above & set(transition.employee_ids):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="The new manager reports to an employee being reassigned",
+                )
+
+    @staticmethod
+    def _changes(transition: EmployeeBulkTransition):
+        """Values to set, and the condition of the rows they would actually change"""
+        if transition.action == EmployeeBulkAction.TERMINATE:
+            values = {
+                "employment_status": EmploymentStatus.TERMINATED,
+                "termination_date": transition.termination_date,
+            }
+            return values, Employee.employment_status != EmploymentStatus.TERMINATED
+        if transition.action == EmployeeBulkAction.SUSPEND:
+            values = {"employment_status": EmploymentStatus.SUSPENDED}
+            return values, Employee.employment_status.not_in(
+                [EmploymentStatus.TERMINATED, EmploymentStatus.SUSPENDED]
+            )
+        if transition.action == EmployeeBulkAction.REASSIGN_MANAGER:
+            values = {"manager_id": transition.manager_id}
+            return values, Employee.manager_id.is_distinct_from(transition.manager_id)
+        values = {"department_id": transition.department_id}
+        return values, Employee.department_id.is_distinct_from(transition.department_id)
+
+    @staticmethod
+    async def apply(
+        db: AsyncSession,
+        transition: EmployeeBulkTransition,
+        job_id: Optional[str] = None,
+    ) -> EmployeeBulkReport:
+        """
+        Apply a transition to many employees with one UPDATE ... RETURNING per chunk
+
+        Each chunk is committed with the events of the employees it changed, which
+        the outbox relay publishes in batches. Employees the transition would not
+        change are skipped. With a `job_id`, progress is saved after every chunk for
+        `get_progress`. Caches and the org chart are invalidated once at the end.
+        """
+        employee_ids = list(dict.fromkeys(transition.employee_ids))
+        report = EmployeeBulkReport(
+            action=transition.action,
+            status="running",
+            job_id=job_id,
+            total=len(employee_ids),
+        )
+        values, changes = EmployeeBulkService._changes(transition)
+        chunk_size = settings.EMPLOYEE_BULK_CHUNK_SIZE
+
+        try:
+            for start in range(0, len(employee_ids), chunk_size):
+                chunk = employee_ids[start : start + chunk_size]
+                targets = (
+                    Employee.id.in_(chunk), Employee.is_deleted.is_(False), changes
+                )
+                # Values being overwritten, locked until the commit for the history
+                previous = await db.execute(
+                    select(Employee.id, *[getattr(Employee, field) for field in values])
+                    .where(*targets)
+                    .with_for_update()
+                )
+                previous = {row.id: row._mapping for row in previous}
+                changed_at = datetime.now(UTC)
+                stmt = (
+                    update(Employee)
+                    .where(*targets)
+                    .values(**values, updated_at=changed_at)
+                    .returning(Employee)
+                    # Employees already in the session take the returned values
+                    .execution_options(
+                        synchronize_session=False, populate_existing=True
+                    )
+                )
+                employees = (await db.scalars(stmt)).all()
+                await EmployeeHistoryService.record_changes(
+                    db,
+                    [
+                        (
+                            employee.id,
+                            {field: previous[employee.id][field] for field in values},
+                        )
+                        for employee in employees
+                    ],
+                    changed_at,
+                )
+                await EmployeeBulkService._stage_events(db, transition, employees)
+                await db.commit()
+
+                report.processed += len(chunk)
+                report.updated += len(employees)
+                report.skipped += len(chunk) - len(employees)
+                if job_id:
+                    await EmployeeBulkService.save_progress(report)
+        except Exception as e:
+            report.status = "failed"
+            report.error = str(e)
+            if job_id:
+                await EmployeeBulkService.save_progress(report)
+            raise
+        finally:
+            if report.updated:
+                await invalidate_tags("employees")
+                await HierarchyService.invalidate_chart()
+
+        report.status = "completed"
+        if job_id:
+            await EmployeeBulkService.save_progress(report)
+        return report
+
+    @staticmethod
+    async def _stage_events(
+        db: AsyncSession, transition: EmployeeBulkTransition, employees: List[Employee]
+    ) -> None:
+        if transition.action == EmployeeBulkAction.TERMINATE:
+            for employee in employees:
+                await EventPublisher.publish_employee_terminated(
+                    db, employee, transition.reason
+                )
+            return
+
+        field = {
+            EmployeeBulkAction.SUSPEND: "employment_status",
+            EmployeeBulkAction.REASSIGN_MANAGER: "manager_id",
+            EmployeeBulkAction.MOVE_DEPARTMENT: "department_id",
+        }[transition.action]
+        for employee in employees:
+            value = getattr(employee, field)
+            updated_fields: Dict[str, Any] = {field: getattr(value, "value", value)}
+            await EventPublisher.publish_employee_updated(db, employee, updated_fields)
+
+    @staticmethod
+    def _progress_key(job_id: str) -> str:
+        return f"{BULK_PROGRESS_KEY_PREFIX}:{job_id}"
+
+    @staticmethod
+    async def save_progress(report: EmployeeBulkReport) -> None:
+        if cache.client is None:
+            return
+        await cache.client.set(
+            EmployeeBulkService._progress_key(report.job_id),
+            report.model_dump_json(),
+            ex=settings.EMPLOYEE_BULK_PROGRESS_TTL,
+        )
+
+    @staticmethod
+    async def get_progress(job_id: str) -> Optional[EmployeeBulkReport]:
+        """Latest progress of a background transition, None once it expired"""
+        if cache.client is None:
+            return None
+        data = await cache.client.get(EmployeeBulkService._progress_key(job_id))
+        return EmployeeBulkReport.model_validate_json(data) if data else None
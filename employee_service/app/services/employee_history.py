@@ -0,0 +1,151 @@
+from collections import defaultdict
+from datetime import UTC, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.employee_change import EmployeeChange
+from app.models.employment import Employee
+from app.schemas.employment import (
+    EmployeeAsOf,
+    EmployeeAsOfResponse,
+    EmployeeChangeResponse,
+    EmployeeFieldChange,
+)
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Columns a point-in-time query returns, the changes of any other are not read back
+EMPLOYEE_AS_OF_FIELDS = tuple(EmployeeAsOf.model_fields)
+
+
+class EmployeeHistoryService:
+
+    @staticmethod
+    def record_change(
+        db: AsyncSession,
+        employee: Employee,
+        fields: Iterable[str],
+        changed_at: Optional[datetime] = None,
+    ) -> None:
+        """Stage the current values of the fields a change is about to overwrite"""
+        previous = {field: getattr(employee, field) for field in fields}
+        db.add(
+            EmployeeChange(
+                employee_id=employee.id,
+                changed_at=changed_at or datetime.now(UTC),
+                previous=jsonable_encoder(previous),
+            )
+        )
+
+    @staticmethod
+    async def record_changes(
+        db: AsyncSession,
+        previous: List[Tuple[str, Dict[str, Any]]],
+        changed_at: datetime,
+    ) -> None:
+        """Insert the previous values of many employees' fields at once"""
+        if not previous:
+            return
+        await db.execute(
+            insert(EmployeeChange),
+            [
+                {
+                    "employee_id": employee_id,
+                    "changed_at": changed_at,
+                    "previous": jsonable_encoder(values),
+                }
+                for employee_id, values in previous
+            ],
+        )
+
+    @staticmethod
+    async def get_history(
+        db: AsyncSession, employee_id: str, limit: int = 100
+    ) -> List[EmployeeChangeResponse]:
+        """An employee's changes, newest first, with the values before and after each"""
+        employee = await db.get(Employee, employee_id)
+        if not employee:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
+            )
+
+        stmt = (
+            select(EmployeeChange)
+            .where(EmployeeChange.employee_id == employee_id)
+            .order_by(EmployeeChange.changed_at.desc(), EmployeeChange.id.desc())
+            .limit(limit)
+        )
+        history = []
+        # Each change's new values are the previous values of the one after it
+        state: Dict[str, Any] = {}
+        for change in await db.scalars(stmt):
+            changes = {}
+            for field, old in change.previous.items():
+                new = state[field] if field in state else getattr(employee, field, None)
+                changes[field] = EmployeeFieldChange(
+                    old=old, new=jsonable_encoder(new)
+                )
+            history.append(
+                EmployeeChangeResponse(changed_at=change.changed_at, changes=changes)
+            )
+            state.update(change.previous)
+        return history
+
+    @staticmethod
+    async def get_employees_as_of(
+        db: AsyncSession, employee_ids: List[str], as_of: datetime
+    ) -> EmployeeAsOfResponse:
+        """
+        Employees as they were at `as_of`
+
+        Each chunk reads the current rows of employees that existed then and, with a
+        range scan of (employee_id, changed_at), the changes made since. Undoing
+        those changes newest first leaves the values each field had at `as_of`.
+        """
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=UTC)
+        employee_ids = list(dict.fromkeys(employee_ids))
+        columns = [getattr(Employee, field) for field in EMPLOYEE_AS_OF_FIELDS]
+        response = EmployeeAsOfResponse(as_of=as_of)
+        chunk_size = settings.EMPLOYEE_AS_OF_CHUNK_SIZE
+
+        for start in range(0, len(employee_ids), chunk_size):
+            chunk = employee_ids[start : start + chunk_size]
+            rows = await db.execute(
+                select(*columns).where(
+                    Employee.id.in_(chunk), Employee.created_at <= as_of
+                )
+            )
+            states = {row.id: dict(row._mapping) for row in rows}
+
+            changes = defaultdict(list)
+            stmt = (
+                select(EmployeeChange.employee_id, EmployeeChange.previous)
+                .where(
+                    EmployeeChange.employee_id.in_(list(states)),
+                    EmployeeChange.changed_at > as_of,
+                )
+                .order_by(
+                    EmployeeChange.employee_id,
+                    EmployeeChange.changed_at.desc(),
+                    EmployeeChange.id.desc(),
+                )
+            )
+            for employee_id, previous in await db.execute(stmt):
+                changes[employee_id].append(previous)
+
+            for employee_id in chunk:
+                state = states.get(employee_id)
+                if state is None:
+                    response.missing.append(employee_id)
+                    continue
+                for previous in changes[employee_id]:
+                    state.update(
+                        (field, value)
+                        for field, value in previous.items()
+                        if field in state
+                    )
+                response.employees.append(EmployeeAsOf.model_validate(state))
+        return response
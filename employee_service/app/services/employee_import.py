@@ -0,0 +1,337 @@
+import csv
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.messaging.event_publisher import EventPublisher
+from app.models.employment import (
+    Department,
+    Employee,
+    EmploymentStatus,
+    EmploymentType,
+    Gender,
+    Position,
+)
+from app.schemas.employment import (
+    EmployeeImportError,
+    EmployeeImportReport,
+    EmployeeImportRow,
+)
+from app.services.code_sequence import CodeSequenceService
+from app.services.employee import EmployeeService
+from app.services.hierarchy import HierarchyService
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# File extension of each import format
+IMPORT_FORMATS = {".csv": "csv", ".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+# (row number in the file, raw values)
+RawRow = Tuple[int, Dict[str, Any]]
+
+# (row number in the file, id the employee is inserted with, validated row)
+ValidRow = Tuple[int, str, EmployeeImportRow]
+
+
+def import_format(filename: str) -> Optional[str]:
+    """Import format of a file, from its extension"""
+    return IMPORT_FORMATS.get(Path(filename).suffix.lower())
+
+
+def iter_import_rows(lines: Iterable[str], file_format: str) -> Iterator[RawRow]:
+    """
+    Parse an import file into raw rows, numbered from 1
+
+    CSV and JSON Lines are parsed a line at a time, so a file is never held in
+    memory. A JSON file must hold one array and is parsed whole. Malformed rows are
+    passed on as is and rejected by validation.
+    """
+    if file_format == "csv":
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, _from_csv(row)
+    elif file_format == "jsonl":
+        number = 0
+        for line in lines:
+            if line.strip():
+                number += 1
+                yield number, _parse_json(line)
+    elif file_format == "json":
+        yield from enumerate(json.loads("".join(lines)), start=1)
+    else:
+        raise ValueError(f"Unsupported import format {file_format}")
+
+
+def _parse_json(value: str) -> Any:
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def _from_csv(row: Dict[str, str]) -> Dict[str, Any]:
+    # Empty cells are missing values, the address column holds JSON
+    values = {field: value for field, value in row.items() if value not in ("", None)}
+    if "address" in values:
+        values["address"] = _parse_json(values["address"])
+    return values
+
+
+class EmployeeImportService:
+
+    @staticmethod
+    async def import_employees(
+        db: AsyncSession,
+        rows: Iterable[RawRow],
+        batch_size: Optional[int] = None,
+    ) -> EmployeeImportReport:
+        """
+        Validate and insert employees in batches, reporting the rows that failed
+
+        References are checked against id sets loaded once per import, uniqueness
+        with one query per batch, so a batch costs a handful of queries instead of
+        five per employee. Each batch takes one block of codes per prefix, is inserted
+        with one multi-row INSERT ... ON CONFLICT DO NOTHING and committed together
+        with its employee.created events.
+
+        A file that cannot be parsed is rejected with a 400 while nothing has been
+        committed. Once a batch has been, the rows imported so far are kept and the
+        parse error is reported on the row it stopped at.
+        """
+        batch_size = batch_size or settings.EMPLOYEE_IMPORT_BATCH_SIZE
+        report = EmployeeImportReport()
+        references, prefixes = await EmployeeImportService._load_references(db)
+        # Values of the rows accepted so far, with the id each row is inserted with
+        seen: Dict[str, Dict[str, str]] = {
+            "user_id": {},
+            "email": {},
+            "employee_code": {},
+        }
+        committed = False
+
+        rows = iter(rows)
+        while True:
+            try:
+                batch = list(islice(rows, batch_size))
+            except (ValueError, csv.Error) as e:
+                if not committed:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"Could not parse the import file: {e}",
+                    )
+                report.total += 1
+                EmployeeImportService._reject(
+                    report, report.total, [f"Could not parse the import file: {e}"]
+                )
+                break
+            if not batch:
+                break
+            report.total += len(batch)
+            valid = await EmployeeImportService._validate_batch(
+                db, batch, references, seen, report
+            )
+            if valid:
+                await EmployeeImportService._insert_batch(db, valid, prefixes, report)
+                committed = True
+            report.errors.sort(key=lambda error: error.row)
+        return report
+
+    @staticmethod
+    async def _load_references(
+        db: AsyncSession,
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, str]]:
+        """Ids of departments and positions, and the code prefix of each department"""
+        departments = (
+            await db.execute(select(Department.id, Department.code_prefix))
+        ).all()
+        positions = await db.scalars(select(Position.id))
+        prefixes = {
+            department_id: code_prefix or settings.EMPLOYEE_CODE_PREFIX
+            for department_id, code_prefix in departments
+        }
+        references = {"department_id": set(prefixes), "position_id": set(positions)}
+        return references, prefixes
+
+    @staticmethod
+    def _reject(report: EmployeeImportReport, row: int, errors: List[str]):
+        report.failed += 1
+        if len(report.errors) < settings.EMPLOYEE_IMPORT_MAX_ERRORS:
+            report.errors.append(EmployeeImportError(row=row, errors=errors))
+
+    @staticmethod
+    async def _validate_batch(
+        db: AsyncSession,
+        batch: List[RawRow],
+        references: Dict[str, Set[str]],
+        seen: Dict[str, Dict[str, str]],
+        report: EmployeeImportReport,
+    ) -> List[ValidRow]:
+        """
+        Check a batch's rows, returning the valid ones with the id each is given
+
+        `manager_id` may name an existing employee, or the user_id or employee_code
+        of a row accepted earlier in the file, which is resolved to that row's id.
+        """
+        parsed: List[Tuple[int, EmployeeImportRow]] = []
+        for number, raw in batch:
+            try:
+                parsed.append((number, EmployeeImportRow.model_validate(raw)))
+            except ValidationError as e:
+                EmployeeImportService._reject(
+                    report,
+                    number,
+                    [
+                        ": ".join(
+                            filter(
+                                None, (".".join(map(str, error["loc"])), error["msg"])
+                            )
+                        )
+                        for error in e.errors()
+                    ],
+                )
+
+        # One query for the employees the batch collides with or names as managers
+        user_ids = {row.user_id for _, row in parsed}
+        emails = {row.email for _, row in parsed}
+        codes = {row.employee_code for _, row in parsed if row.employee_code}
+        manager_ids = {row.manager_id for _, row in parsed if row.manager_id}
+        result = await db.execute(
+            select(
+                Employee.id, Employee.user_id, Employee.email, Employee.employee_code
+            ).where(
+                or_(
+                    Employee.user_id.in_(user_ids),
+                    Employee.email.in_(emails),
+                    Employee.employee_code.in_(codes),
+                    Employee.id.in_(manager_ids),
+                )
+            )
+        )
+        existing: Dict[str, Set[str]] = {
+            "id": set(),
+            "user_id": set(),
+            "email": set(),
+            "employee_code": set(),
+        }
+        for employee_id, user_id, email, employee_code in result:
+            existing["id"].add(employee_id)
+            existing["user_id"].add(user_id)
+            existing["email"].add(email)
+            existing["employee_code"].add(employee_code)
+
+        valid = []
+        for number, row in parsed:
+            errors = []
+            for field in ("user_id", "email", "employee_code"):
+                value = getattr(row, field)
+                if value is None:
+                    continue
+                if value in existing[field]:
+                    errors.append(
+                        f"{field}: an employee with this value already exists"
+                    )
+                elif value in seen[field]:
+                    errors.append(f"{field}: duplicated in the file")
+            for field, name in (
+                ("department_id", "Department"),
+                ("position_id", "Position"),
+            ):
+                value = getattr(row, field)
+                if value and value not in references[field]:
+                    errors.append(f"{field}: {name} not found")
+            if row.manager_id and row.manager_id not in existing["id"]:
+                manager_id = seen["user_id"].get(row.manager_id) or seen[
+                    "employee_code"
+                ].get(row.manager_id)
+                if manager_id:
+                    row.manager_id = manager_id
+                else:
+                    errors.append("manager_id: Manager not found")
+
+            if errors:
+                EmployeeImportService._reject(report, number, errors)
+                continue
+            employee_id = str(uuid.uuid4())
+            for field in ("user_id", "email", "employee_code"):
+                value = getattr(row, field)
+                if value is not None:
+                    seen[field][value] = employee_id
+            valid.append((number, employee_id, row))
+        return valid
+
+    @staticmethod
+    async def _insert_batch(
+        db: AsyncSession,
+        valid: List[ValidRow],
+        prefixes: Dict[str, str],
+        report: EmployeeImportReport,
+    ):
+        # Codes given in the generated format move their sequence past them first
+        for prefix in set(prefixes.values()) | {settings.EMPLOYEE_CODE_PREFIX}:
+            numbers = [
+                CodeSequenceService.parse_code(row.employee_code, prefix)
+                for _, _, row in valid
+                if row.employee_code
+            ]
+            numbers = [number for number in numbers if number is not None]
+            if numbers:
+                await CodeSequenceService.advance_past(db, prefix, max(numbers))
+
+        # One block of codes per prefix, rows that bring their own code take none
+        needing_codes: Dict[str, List[EmployeeImportRow]] = {}
+        for _, _, row in valid:
+            if not row.employee_code:
+                prefix = prefixes.get(row.department_id, settings.EMPLOYEE_CODE_PREFIX)
+                needing_codes.setdefault(prefix, []).append(row)
+        codes: Dict[int, str] = {}
+        for prefix, rows in needing_codes.items():
+            block = await CodeSequenceService.next_codes(db, prefix, len(rows))
+            codes.update({id(row): code for row, code in zip(rows, block)})
+
+        now = datetime.now(UTC)
+        values = []
+        for _, employee_id, row in valid:
+            data = row.model_dump()
+            values.append(
+                {
+                    **data,
+                    "id": employee_id,
+                    "employee_code": row.employee_code or codes[id(row)],
+                    "employment_type": EmploymentType(data["employment_type"]),
+                    "gender": Gender(data["gender"]) if data["gender"] else None,
+                    "employment_status": EmploymentStatus.ACTIVE,
+                    "created_at": now,
+                    "updated_at": now,
+                    "deleted_at": None,
+                    "is_deleted": False,
+                }
+            )
+
+        dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(Employee).on_conflict_do_nothing().returning(Employee)
+        result = await db.scalars(stmt, values)
+        employees = result.all()
+
+        # Rows inserted concurrently since validation are skipped by ON CONFLICT
+        inserted = {employee.user_id for employee in employees}
+        for number, _, row in valid:
+            if row.user_id not in inserted:
+                EmployeeImportService._reject(
+                    report,
+                    number,
+                    ["An employee with this user_id, email or code already exists"],
+                )
+
+        for employee in employees:
+            await EventPublisher.publish_employee_created(db, employee)
+        await db.commit()
+        await EmployeeService._register_many_lookups(employees)
+        await HierarchyService.invalidate_chart()
+        report.created += len(employees)
@@ -0,0 +1,128 @@
+from typing import List, Optional
+
+from app.core.config import settings
+from app.models.employment import (
+    EMPLOYEE_FULL_NAME_SQL,
+    EMPLOYEE_SEARCH_DOCUMENT_SQL,
+    Department,
+    Employee,
+    Position,
+)
+from app.schemas.employment import EmployeeSearchResult
+from sqlalchemy import Select, case, func, literal, literal_column, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class EmployeeSearchService:
+
+    @staticmethod
+    async def search_employees(
+        db: AsyncSession,
+        query: str,
+        employment_status: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[EmployeeSearchResult]:
+        """
+        Employees matching a free-text query, best first
+
+        The query is matched against name, email, code, department and position.
+        """
+        query = query.strip()
+        if db.bind.dialect.name == "postgresql":
+            stmt = EmployeeSearchService._postgres_search(query)
+        else:
+            stmt = EmployeeSearchService._substring_search(query)
+
+        stmt = stmt.where(Employee.is_deleted == False)
+        if employment_status:
+            stmt = stmt.where(Employee.employment_status == employment_status)
+        stmt = stmt.order_by(literal_column("score").desc(), Employee.id).limit(limit)
+
+        result = await db.execute(stmt)
+        return [EmployeeSearchResult(**row._mapping) for row in result]
+
+    @staticmethod
+    def _columns(score) -> Select:
+        return (
+            select(
+                Employee.id,
+                Employee.employee_code,
+                Employee.first_name,
+                Employee.last_name,
+                Employee.email,
+                Employee.employment_status,
+                Employee.department_id,
+                Department.name.label("department_name"),
+                Employee.position_id,
+                Position.title.label("position_title"),
+                score.label("score"),
+            )
+            .outerjoin(Department, Employee.department_id == Department.id)
+            .outerjoin(Position, Employee.position_id == Position.id)
+        )
+
+    @staticmethod
+    def _postgres_search(query: str) -> Select:
+        """
+        Full-text and trigram search, each branch served by its own GIN index
+
+        Candidates are the union of the index hits, so the OR never turns into a
+        scan, and only they are scored. Word similarity on the name and trigram
+        similarity elsewhere tolerate typos, the tsvector match handles whole words
+        in any order.
+        """
+        full_name = literal_column(EMPLOYEE_FULL_NAME_SQL)
+        document = literal_column(EMPLOYEE_SEARCH_DOCUMENT_SQL)
+        ts_query = func.websearch_to_tsquery(literal_column("'simple'"), query)
+
+        candidates = union(
+            select(Employee.id).where(document.op("@@")(ts_query)),
+            select(Employee.id).where(literal(query).op("<%")(full_name)),
+            select(Employee.id).where(Employee.email.op("%")(query)),
+            select(Employee.id).where(Employee.employee_code.ilike(f"{query}%")),
+            select(Employee.id)
+            .join(Department, Employee.department_id == Department.id)
+            .where(Department.name.op("%")(query)),
+            select(Employee.id)
+            .join(Position, Employee.position_id == Position.id)
+            .where(Position.title.op("%")(query)),
+        ).subquery()
+
+        weight = settings.EMPLOYEE_SEARCH_RELATED_WEIGHT
+        score = func.greatest(
+            func.ts_rank(document, ts_query),
+            func.word_similarity(query, full_name),
+            func.similarity(Employee.email, query),
+            func.similarity(Employee.employee_code, query),
+            func.coalesce(func.similarity(Department.name, query), 0) * weight,
+            func.coalesce(func.similarity(Position.title, query), 0) * weight,
+        )
+        return EmployeeSearchService._columns(score).where(
+            Employee.id.in_(select(candidates.c.id))
+        )
+
+    @staticmethod
+    def _substring_search(query: str) -> Select:
+        """Case-insensitive substring search, for databases without pg_trgm"""
+        pattern = f"%{query}%"
+        full_name = Employee.first_name + " " + Employee.last_name
+        score = case(
+            (func.lower(Employee.employee_code) == query.lower(), 1.0),
+            (func.lower(Employee.email) == query.lower(), 1.0),
+            (full_name.ilike(f"{query}%"), 0.8),
+            (full_name.ilike(pattern), 0.6),
+            (
+                or_(Employee.email.ilike(pattern), Employee.employee_code.ilike(pattern)),
+                0.5,
+            ),
+            else_=settings.EMPLOYEE_SEARCH_RELATED_WEIGHT * 0.5,
+        )
+        return EmployeeSearchService._columns(score).where(
+            or_(
+                full_name.ilike(pattern),
+                Employee.email.ilike(pattern),
+                Employee.employee_code.ilike(pattern),
+                Department.name.ilike(pattern),
+                Position.title.ilike(pattern),
+            )
+        )
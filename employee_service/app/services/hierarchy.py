@@ -0,0 +1,234 @@
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.utils import cache
+from app.models.employment import Department, Employee, EmploymentStatus
+from app.schemas.employment import DepartmentTreeNode, OrgChartEmployee
+from fastapi import HTTPException, status
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Bumped on every change to reporting lines or departments, shared by all instances
+ORG_CHART_VERSION_KEY = "org_chart:version"
+
+
+class OrgChart:
+    """
+    Reporting lines and department tree of the active employees, held in memory
+
+    Built with two flat queries, after which chains, reports and subtree headcounts
+    are dictionary walks. Walks stop at a node already visited, so a cycle in the
+    data cannot hang a request.
+    """
+
+    def __init__(
+        self,
+        employees: List[OrgChartEmployee],
+        departments: List[Tuple[str, str, Optional[str]]],
+    ):
+        self.employees = {employee.id: employee for employee in employees}
+        self.reports: Dict[str, List[str]] = {}
+        for employee in employees:
+            if employee.manager_id:
+                self.reports.setdefault(employee.manager_id, []).append(employee.id)
+
+        self.departments = {
+            id: DepartmentTreeNode(id=id, name=name, parent_department_id=parent_id)
+            for id, name, parent_id in departments
+        }
+        self.sub_departments: Dict[str, List[str]] = {}
+        for department in self.departments.values():
+            if department.parent_department_id:
+                self.sub_departments.setdefault(
+                    department.parent_department_id, []
+                ).append(department.id)
+        for employee in employees:
+            if employee.department_id in self.departments:
+                self.departments[employee.department_id].headcount += 1
+        self._built: set = set()
+        for department_id in self.departments:
+            self._subtree(department_id)
+
+    def _employee(self, employee_id: str) -> OrgChartEmployee:
+        employee = self.employees.get(employee_id)
+        if employee is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Employee not found"
+            )
+        return employee
+
+    def reporting_chain(self, employee_id: str) -> List[OrgChartEmployee]:
+        """Managers of an employee, from the direct manager up to the top"""
+        chain: List[OrgChartEmployee] = []
+        seen = {employee_id}
+        manager_id = self._employee(employee_id).manager_id
+        while manager_id in self.employees and manager_id not in seen:
+            seen.add(manager_id)
+            manager = self.employees[manager_id]
+            chain.append(manager.model_copy(update={"depth": len(chain) + 1}))
+            manager_id = manager.manager_id
+        return chain
+
+    def all_reports(
+        self, manager_id: str, max_depth: Optional[int] = None
+    ) -> List[OrgChartEmployee]:
+        """Direct and indirect reports of a manager, breadth first"""
+        self._employee(manager_id)
+        reports: List[OrgChartEmployee] = []
+        seen = {manager_id}
+        queue = deque([(manager_id, 0)])
+        while queue:
+            employee_id, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for report_id in self.reports.get(employee_id, []):
+                if report_id not in seen:
+                    seen.add(report_id)
+                    reports.append(
+                        self.employees[report_id].model_copy(
+                            update={"depth": depth + 1}
+                        )
+                    )
+                    queue.append((report_id, depth + 1))
+        return reports
+
+    def _subtree(
+        self, department_id: str, seen: Optional[set] = None
+    ) -> DepartmentTreeNode:
+        """Build the children and total headcount of a department, once"""
+        department = self.departments[department_id]
+        if department_id in self._built:
+            return department
+        self._built.add(department_id)
+        seen = (seen or set()) | {department_id}
+        department.total_headcount = department.headcount
+        for child_id in self.sub_departments.get(department_id, []):
+            if child_id not in seen:
+                child = self._subtree(child_id, seen)
+                department.children.append(child)
+                department.total_headcount += child.total_headcount
+        return department
+
+    def department_tree(self, department_id: str) -> DepartmentTreeNode:
+        department = self.departments.get(department_id)
+        if department is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Department not found"
+            )
+        return department
+
+    def subtree_totals(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """Sum per-department counts over each department and its sub-departments"""
+        totals: Dict[str, int] = {}
+
+        def total(department_id: str, seen: frozenset) -> int:
+            if department_id not in totals:
+                seen = seen | {department_id}
+                totals[department_id] = counts.get(department_id, 0) + sum(
+                    total(child_id, seen)
+                    for child_id in self.sub_departments.get(department_id, [])
+                    if child_id not in seen
+                )
+            return totals[department_id]
+
+        for department_id in self.departments:
+            total(department_id, frozenset())
+        return totals
+
+    def headcounts(self) -> List[DepartmentTreeNode]:
+        """Every department with its headcounts, without the nested children"""
+        return [
+            department.model_copy(update={"children": []})
+            for department in self.departments.values()
+        ]
+
+
+class HierarchyService:
+    # Process-wide copy of the chart, the Redis version it was built at and when
+    _chart: Optional[OrgChart] = None
+    _chart_version: Optional[int] = None
+    _chart_loaded_at: float = 0.0
+    # Counts local changes, so a single instance without Redis still refreshes
+    _local_version: int = 0
+
+    @staticmethod
+    async def _version() -> Tuple[int, int]:
+        shared_version = 0
+        if cache.client is not None:
+            shared_version = int(await cache.client.get(ORG_CHART_VERSION_KEY) or 0)
+        return shared_version, HierarchyService._local_version
+
+    @staticmethod
+    async def invalidate_chart() -> None:
+        """Signal every instance that reporting lines or departments changed"""
+        HierarchyService._local_version += 1
+        if cache.client is not None:
+            await cache.client.incr(ORG_CHART_VERSION_KEY)
+
+    @staticmethod
+    async def get_chart(db: AsyncSession) -> OrgChart:
+        """
+        The in-memory org chart, rebuilt when another change was signalled
+
+        Costs one Redis GET while the chart is current. The version is read before
+        the chart is built, so a change committed during a build triggers the next one.
+        """
+        version = await HierarchyService._version()
+        expired = (
+            time.monotonic() - HierarchyService._chart_loaded_at
+            > settings.ORG_CHART_MAX_AGE
+        )
+        if (
+            HierarchyService._chart is None
+            or HierarchyService._chart_version != version
+            or expired
+        ):
+            HierarchyService._chart = await HierarchyService._load_chart(db)
+            HierarchyService._chart_version = version
+            HierarchyService._chart_loaded_at = time.monotonic()
+        return HierarchyService._chart
+
+    @staticmethod
+    async def _load_chart(db: AsyncSession) -> OrgChart:
+        result = await db.execute(
+            select(
+                Employee.id,
+                Employee.employee_code,
+                Employee.first_name,
+                Employee.last_name,
+                Employee.manager_id,
+                Employee.department_id,
+                Employee.position_id,
+            ).where(
+                Employee.is_deleted == False,
+                Employee.employment_status != EmploymentStatus.TERMINATED,
+            )
+        )
+        employees = [OrgChartEmployee(**row._mapping) for row in result]
+        result = await db.execute(
+            select(
+                Department.id, Department.name, Department.parent_department_id
+            ).where(Department.is_deleted == False)
+        )
+        return OrgChart(employees, [tuple(row) for row in result])
+
+    @staticmethod
+    def report_ids_query(manager_id: str) -> Select:
+        """
+        Ids of the direct and indirect reports of a manager, as a recursive CTE
+
+        For filtering other queries in the database, e.g. listings of a manager's
+        whole team. UNION rather than UNION ALL stops at rows already found, so
+        cycles terminate.
+        """
+        reports = (
+            select(Employee.id)
+            .where(Employee.manager_id == manager_id)
+            .cte("reports", recursive=True)
+        )
+        reports = reports.union(
+            select(Employee.id).join(reports, Employee.manager_id == reports.c.id)
+        )
+        return select(reports.c.id)
@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from fastapi import HTTPException, status
 from app.schemas.employment import PositionCreate, PositionUpdate
+from shared.db.pagination import paginate
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -48,13 +49,14 @@ class PositionService:
         department_id: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Position]:
-        """Get positions with optional department filter"""
+        """Get positions with optional department filter, after `cursor` if given"""
         stmt = select(Position)
 
         if department_id:
             stmt = stmt.where(Position.department_id == department_id)
 
-        stmt = stmt.offset(skip).limit(limit)
+        stmt = paginate(stmt, Position.created_at, Position.id, limit, cursor, skip)
         result = await db.execute(stmt)
         return result.scalars().all()
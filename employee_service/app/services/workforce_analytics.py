@@ -0,0 +1,265 @@
+from collections import Counter
+from datetime import UTC, date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.models.workforce import (
+    NO_VALUE,
+    HeadcountRollup,
+    WorkforceEmployee,
+    WorkforceTrend,
+)
+from app.schemas.employment import (
+    DepartmentHeadcount,
+    HeadcountBucket,
+    WorkforceAnalytics,
+    WorkforceTrendPoint,
+)
+from app.services.hierarchy import HierarchyService
+from sqlalchemy import Table, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Employee events that carry the analytics dimensions
+WORKFORCE_EVENTS = (
+    "employee.created",
+    "employee.updated",
+    "employee.terminated",
+    "employee.snapshot",
+)
+
+# Columns of a headcount rollup row, in key order
+HEADCOUNT_DIMENSIONS = (
+    "department_id",
+    "position_id",
+    "employment_type",
+    "employment_status",
+)
+
+# Status implied by the event type, for events published before they carried one
+IMPLIED_STATUS = {"employee.created": "active", "employee.terminated": "terminated"}
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands timestamps back without their timezone
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+def _month(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.strftime("%Y-%m")
+
+
+def _months(count: int) -> List[str]:
+    """The last `count` months, oldest first and ending with the current one"""
+    today = datetime.now(UTC).date()
+    index = today.year * 12 + today.month - 1
+    return [
+        f"{month // 12:04d}-{month % 12 + 1:02d}"
+        for month in range(index - count + 1, index + 1)
+    ]
+
+
+class WorkforceAnalyticsService:
+
+    @staticmethod
+    def row_from_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an employee event, which carries the employee's whole state, to a row"""
+        timestamp = event_data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return {
+            "employee_id": event_data["employee_id"],
+            "department_id": event_data.get("department_id") or NO_VALUE,
+            "position_id": event_data.get("position_id") or NO_VALUE,
+            "employment_type": event_data.get("employment_type") or NO_VALUE,
+            "employment_status": event_data.get("employment_status")
+            or IMPLIED_STATUS.get(event_data["event_type"], NO_VALUE),
+            "hire_month": _month(event_data.get("hire_date")),
+            "termination_month": _month(event_data.get("termination_date")),
+            "last_event_at": _aware(timestamp),
+        }
+
+    @staticmethod
+    async def apply_events(db: AsyncSession, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Move the employees of a batch of events between rollup buckets
+
+        Each employee's last applied state is kept, so an event decrements the
+        buckets that state counted in and increments its own. Events older than the
+        state are ignored, so batches can arrive out of order and be replayed. The
+        counter deltas of the whole batch are added with one upsert per table.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for event_data in events:
+            row = WorkforceAnalyticsService.row_from_event(event_data)
+            current = rows.get(row["employee_id"])
+            if current is None or row["last_event_at"] >= current["last_event_at"]:
+                rows[row["employee_id"]] = row
+        if not rows:
+            return 0
+
+        result = await db.scalars(
+            select(WorkforceEmployee)
+            .where(WorkforceEmployee.employee_id.in_(list(rows)))
+            .with_for_update()
+        )
+        states = {state.employee_id: state for state in result}
+
+        headcounts: Counter = Counter()
+        trends: Counter = Counter()
+        applied = 0
+        for employee_id, row in rows.items():
+            state = states.get(employee_id)
+            if state is not None:
+                if _aware(state.last_event_at) > row["last_event_at"]:
+                    continue
+                key = tuple(getattr(state, d) for d in HEADCOUNT_DIMENSIONS)
+                headcounts[key] -= 1
+                trends[(state.hire_month, "hires")] -= 1
+                trends[(state.termination_month, "terminations")] -= 1
+                for column, value in row.items():
+                    setattr(state, column, value)
+            else:
+                db.add(WorkforceEmployee(**row))
+            headcounts[tuple(row[d] for d in HEADCOUNT_DIMENSIONS)] += 1
+            trends[(row["hire_month"], "hires")] += 1
+            trends[(row["termination_month"], "terminations")] += 1
+            applied += 1
+
+        await WorkforceAnalyticsService._add_counts(
+            db,
+            HeadcountRollup.__table__,
+            [
+                {**dict(zip(HEADCOUNT_DIMENSIONS, key)), "headcount": delta}
+                for key, delta in headcounts.items()
+                if delta
+            ],
+            ["headcount"],
+        )
+        await WorkforceAnalyticsService._add_counts(
+            db,
+            WorkforceTrend.__table__,
+            [
+                {
+                    "month": month,
+                    "hires": delta if column == "hires" else 0,
+                    "terminations": delta if column == "terminations" else 0,
+                }
+                for (month, column), delta in trends.items()
+                if delta and month
+            ],
+            ["hires", "terminations"],
+        )
+        await db.commit()
+        return applied
+
+    @staticmethod
+    async def _add_counts(
+        db: AsyncSession, table: Table, rows: List[Dict[str, Any]], counters: List[str]
+    ) -> None:
+        """Insert counter rows, adding them to the existing ones on conflict"""
+        if not rows:
+            return
+        insert = (
+            postgresql.insert
+            if db.bind.dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(table.primary_key.columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in counters},
+        )
+        await db.execute(stmt, rows)
+
+    @staticmethod
+    async def get_workforce(db: AsyncSession, months: int = 12) -> WorkforceAnalytics:
+        """
+        Headcounts and monthly trends, read from the rollups alone
+
+        Department subtree totals roll the department headcounts up the org chart's
+        department tree.
+        """
+        rollups = (
+            await db.execute(
+                select(HeadcountRollup).where(HeadcountRollup.headcount > 0)
+            )
+        ).scalars()
+
+        by: Dict[str, Counter] = {
+            dimension: Counter() for dimension in HEADCOUNT_DIMENSIONS
+        }
+        for rollup in rollups:
+            by["employment_status"][rollup.employment_status] += rollup.headcount
+            if rollup.employment_status == "terminated":
+                continue
+            for dimension in HEADCOUNT_DIMENSIONS[:-1]:
+                by[dimension][getattr(rollup, dimension)] += rollup.headcount
+
+        period = _months(months)
+        trends = {
+            trend.month: trend
+            for trend in (
+                await db.execute(
+                    select(WorkforceTrend).where(WorkforceTrend.month >= period[0])
+                )
+            ).scalars()
+        }
+
+        return WorkforceAnalytics(
+            headcount=sum(by["department_id"].values()),
+            by_department=await WorkforceAnalyticsService._department_headcounts(
+                db, by["department_id"]
+            ),
+            by_position=WorkforceAnalyticsService._buckets(by["position_id"]),
+            by_employment_type=WorkforceAnalyticsService._buckets(
+                by["employment_type"]
+            ),
+            by_status=WorkforceAnalyticsService._buckets(by["employment_status"]),
+            trends=[
+                WorkforceTrendPoint(
+                    month=month,
+                    hires=trends[month].hires if month in trends else 0,
+                    terminations=trends[month].terminations if month in trends else 0,
+                )
+                for month in period
+            ],
+        )
+
+    @staticmethod
+    def _buckets(counts: Counter) -> List[HeadcountBucket]:
+        return [
+            HeadcountBucket(key=key or None, headcount=headcount)
+            for key, headcount in counts.most_common()
+        ]
+
+    @staticmethod
+    async def _department_headcounts(
+        db: AsyncSession, counts: Counter
+    ) -> List[DepartmentHeadcount]:
+        chart = await HierarchyService.get_chart(db)
+        totals = chart.subtree_totals(counts)
+        departments = [
+            DepartmentHeadcount(
+                department_id=department.id,
+                name=department.name,
+                parent_department_id=department.parent_department_id,
+                headcount=counts.get(department.id, 0),
+                total_headcount=totals[department.id],
+            )
+            for department in chart.departments.values()
+        ]
+        # Employees without a department, or in one no longer in the chart
+        for department_id, headcount in counts.items():
+            if department_id not in chart.departments and headcount:
+                departments.append(
+                    DepartmentHeadcount(
+                        department_id=department_id or None,
+                        headcount=headcount,
+                        total_headcount=headcount,
+                    )
+                )
+        return departments
@@ -1,9 +1,11 @@
 import json
 from datetime import timedelta
-from typing import List, Optional
+from typing import Collection, Dict, List, Optional
 
 import redis.asyncio as redis
 
+from .metrics import cache_metrics
+
 
 class PermissionCache:
     """
@@ -28,9 +30,9 @@ class PermissionCache:
     ):
         """Store user permissions in cache"""
         key = self._user_permission_key(user_id)
-        await self.redis_client.setex(
-            key, ttl or self.default_ttl, json.dumps(permissions)
-        )
+        data = json.dumps(permissions)
+        await self.redis_client.setex(key, ttl or self.default_ttl, data)
+        cache_metrics.observe_payload(key, len(data))
 
     async def get_user_permissions(self, user_id: str) -> Optional[List[str]]:
         """Get user permissions from cache"""
@@ -38,31 +40,74 @@ class PermissionCache:
         data = await self.redis_client.get(key)
 
         if data:
+            cache_metrics.record_lookup(key, "hit")
             return json.loads(data)
+        cache_metrics.record_lookup(key, "miss")
         return None
 
     async def invalidate_user_permissions(self, user_id: str):
         """Remove user permissions from cache"""
         key = self._user_permission_key(user_id)
-        await self.redis_client.delete(key)
+        cache_metrics.record_eviction(key, await self.redis_client.delete(key))
 
     async def set_user_roles(
         self, user_id: str, roles: List[str], ttl: Optional[timedelta] = None
     ):
         """Store user roles in cache"""
         key = self._user_roles_key(user_id)
-        await self.redis_client.setex(key, ttl or self.default_ttl, json.dumps(roles))
+        data = json.dumps(roles)
+        await self.redis_client.setex(key, ttl or self.default_ttl, data)
+        cache_metrics.observe_payload(key, len(data))
+
+    async def set_many_user_access(
+        self,
+        permissions: Dict[str, List[str]],
+        roles: Dict[str, List[str]],
+        ttl: Optional[timedelta] = None,
+    ):
+        """Store permissions and roles of many users in a single round trip"""
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for user_id, user_permissions in permissions.items():
+                pipe.setex(
+                    self._user_permission_key(user_id),
+                    ttl or self.default_ttl,
+                    json.dumps(user_permissions),
+                )
+            for user_id, user_roles in roles.items():
+                pipe.setex(
+                    self._user_roles_key(user_id),
+                    ttl or self.default_ttl,
+                    json.dumps(user_roles),
+                )
+            await pipe.execute()
 
     async def invalidate_user_roles(self, user_id: str):
         """Remove user roles from cache"""
         key = self._user_roles_key(user_id)
-        await self.redis_client.delete(key)
+        cache_metrics.record_eviction(key, await self.redis_client.delete(key))
 
     async def invalidate_all_for_user(self, user_id: str):
         """Invalidate all cached data for a user"""
         await self.invalidate_user_permissions(user_id)
         await self.invalidate_user_roles(user_id)
 
+    async def invalidate_all_for_users(
+        self, user_ids: Collection[str], chunk_size: int = 1000
+    ):
+        """Invalidate all cached data for many users in a single round trip"""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            # Chunked so no single DEL blocks Redis for long
+            for start in range(0, len(user_ids), chunk_size):
+                chunk = user_ids[start : start + chunk_size]
+                pipe.delete(*(self._user_permission_key(user_id) for user_id in chunk))
+                pipe.delete(*(self._user_roles_key(user_id) for user_id in chunk))
+            deleted = await pipe.execute()
+        cache_metrics.record_eviction("user_permissions", sum(deleted[0::2]))
+        cache_metrics.record_eviction("user_roles", sum(deleted[1::2]))
+
     async def close(self):
         """Close Redis connection"""
         await self.redis_client.close()
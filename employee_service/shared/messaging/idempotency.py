@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+import redis.asyncio as redis
+
+# Returned by claim when the event was free and is now claimed by the caller
+CLAIMED = "claimed"
+PROCESSING = "processing"
+DONE = "done"
+
+
+class IdempotencyStore:
+    """
+    Records the events a consumer has handled, keyed on event_id
+
+    An event is claimed before its handler runs and marked done once the handler
+    succeeds. A failed handler releases its claim, and a claim left by a worker that
+    died mid-handler expires after `lock_ttl`, so redeliveries of those are handled again.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        namespace: str,
+        ttl: timedelta = timedelta(days=7),
+        lock_ttl: timedelta = timedelta(minutes=5),
+    ):
+        self.redis_client = redis_client
+        self.namespace = namespace
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+
+    def _key(self, event_id: str) -> str:
+        return f"processed_event:{self.namespace}:{event_id}"
+
+    async def claim(self, event_id: str) -> str:
+        """
+        Claim an event, returning CLAIMED, or the state of the event if it is already
+        claimed: DONE once handled, PROCESSING while a handler is running elsewhere
+        """
+        key = self._key(event_id)
+        # A claim can expire between the two commands, hence the second try
+        for _ in range(2):
+            if await self.redis_client.set(key, PROCESSING, nx=True, ex=self.lock_ttl):
+                return CLAIMED
+            state = await self.redis_client.get(key)
+            if state is not None:
+                return state.decode() if isinstance(state, bytes) else state
+        return PROCESSING
+
+    async def complete(self, event_id: str):
+        """Mark an event handled, so later deliveries of it are skipped"""
+        await self.redis_client.set(self._key(event_id), DONE, ex=self.ttl)
+
+    async def release(self, event_id: str):
+        """Drop the claim on an event whose handler failed"""
+        await self.redis_client.delete(self._key(event_id))
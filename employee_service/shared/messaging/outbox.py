@@ -0,0 +1,339 @@
+"""
+Transactional outbox and event log
+
+Services stage events in an outbox table in the same transaction as the change
+they describe, and a relay publishes them. Published events are appended to an
+append-only event log, kept after the outbox is purged so consumers can be
+rebuilt by replaying it.
+
+The tables live in each service's database, so services declare the models on
+their own declarative base with the mixins below and bind them to an `Outbox`:
+
+    class OutboxEvent(OutboxEventMixin, BaseModel):
+        pass
+
+    class EventLogEntry(EventLogEntryMixin, Base):
+        pass
+
+    outbox = Outbox(OutboxEvent, EventLogEntry, max_attempts=10)
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    delete,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, MappedAsDataclass, declared_attr, mapped_column
+
+from .events import BaseEvent, parse_event
+from .rabbitmq import Event, RabbitMQClient
+
+logger = logging.getLogger(__name__)
+
+# Receives each page of replayed events, raising if any could not be delivered
+ReplaySink = Callable[[List[Event]], Awaitable[None]]
+
+
+# OUTBOX EVENT
+class OutboxEventMixin(MappedAsDataclass):
+    """Domain event written in the same transaction as the change it describes"""
+
+    __tablename__ = "outbox_events"
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        return (
+            # Partial index, so finding the oldest unpublished events stays cheap however many
+            # published rows the table holds
+            Index(
+                "ix_outbox_events_unpublished",
+                "created_at",
+                postgresql_where=text("published_at IS NULL"),
+            ),
+        )
+
+    routing_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    published_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=None
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
+
+
+# EVENT LOG
+class EventLogEntryMixin(MappedAsDataclass):
+    """
+    Append-only record of every event this service published
+    Kept after the outbox is purged, so consumers can be rebuilt by replaying it
+    """
+
+    __tablename__ = "event_log"
+
+    @declared_attr.directive
+    def __table_args__(cls):
+        return (
+            # Replays filter by type and time range, then page by sequence
+            Index("ix_event_log_type_occurred_at", "event_type", "occurred_at"),
+        )
+
+    event_id: Mapped[str] = mapped_column(String(36), unique=True)
+    event_type: Mapped[str] = mapped_column(String(100))
+    routing_key: Mapped[str] = mapped_column(String(255))
+    payload: Mapped[dict] = mapped_column(JSON)
+    # Timestamp of the event itself, as opposed to when it reached the broker
+    occurred_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    published_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # Order events were published in, which is the order replays deliver them in
+    sequence: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        init=False,
+    )
+
+
+class Outbox:
+    """
+    Stages, relays, logs and replays the events of one service's outbox tables
+
+    An event whose publish failed `max_attempts` times is parked: the relay skips
+    it, so it no longer takes a slot of every batch ahead of newer events. Parked
+    events stay unpublished in the outbox, and setting their attempts back to 0
+    makes the relay try them again.
+    """
+
+    def __init__(self, event_model: type, log_model: type, max_attempts: int = 10):
+        self.event_model = event_model
+        self.log_model = log_model
+        self.max_attempts = max_attempts
+
+    def stage_event(
+        self,
+        db: AsyncSession,
+        routing_key: str,
+        event_data: Dict[str, Any] | BaseEvent,
+    ):
+        """Validate an event and add it to the outbox, committed together with the caller's changes"""
+        payload = parse_event(event_data).model_dump(mode="json")
+        event = self.event_model(routing_key=routing_key, payload=payload)
+        db.add(event)
+        return event
+
+    async def relay_outbox_batch(
+        self, db: AsyncSession, rabbitmq: RabbitMQClient, batch_size: int
+    ) -> int:
+        """
+        Publish the oldest unpublished events and mark them sent
+
+        Rows are locked with SKIP LOCKED, so relays running in several instances never
+        publish the same event concurrently. If the process dies between the broker
+        confirms and the commit, the batch is published again: delivery is at-least-once
+        and consumers deduplicate on event_id.
+        """
+        OutboxEvent = self.event_model
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.published_at.is_(None),
+                OutboxEvent.attempts < self.max_attempts,
+            )
+            .order_by(OutboxEvent.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(stmt)
+        events = result.scalars().all()
+        if not events:
+            return 0
+
+        errors = await rabbitmq.publish_many(
+            (event.routing_key, event.payload) for event in events
+        )
+
+        published_at = datetime.now(UTC)
+        published = []
+        for event, error in zip(events, errors):
+            if error is not None:
+                event.attempts += 1
+                event.last_error = str(error)
+                if event.attempts >= self.max_attempts:
+                    logger.error(
+                        f"Parked outbox event {event.id} ({event.routing_key}) "
+                        f"after {event.attempts} failed publishes: {error}"
+                    )
+            else:
+                event.published_at = published_at
+                published.append(event)
+
+        # Logged in the same commit, so the log holds exactly the events marked published
+        await self.log_published_events(db, published, published_at)
+        await db.commit()
+        return len(published)
+
+    async def run_outbox_relay(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        get_rabbitmq_client: Callable[[], Awaitable[RabbitMQClient]],
+        batch_size: int,
+        poll_interval: float,
+        stopping: asyncio.Event | None = None,
+    ):
+        """
+        Relay outbox events until `stopping` is set or the task is cancelled, polling only
+        once the outbox is drained. Setting `stopping` lets the current batch commit first.
+        """
+        stopping = stopping or asyncio.Event()
+        while not stopping.is_set():
+            try:
+                rabbitmq = await get_rabbitmq_client()
+                async with session_factory() as db:
+                    published = await self.relay_outbox_batch(db, rabbitmq, batch_size)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Outbox relay failed: {e}")
+                published = 0
+
+            if published < batch_size:
+                try:
+                    await asyncio.wait_for(stopping.wait(), poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def purge_published_events(
+        self, db: AsyncSession, retention_days: int
+    ) -> int:
+        """Delete events published more than `retention_days` ago, the event log keeps them"""
+        OutboxEvent = self.event_model
+        cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+        result = await db.execute(
+            delete(OutboxEvent).where(OutboxEvent.published_at < cutoff)
+        )
+        await db.commit()
+        return result.rowcount
+
+    async def log_published_events(
+        self, db: AsyncSession, events: Sequence[Any], published_at: datetime
+    ):
+        """Append published outbox events to the event log, committed with the caller"""
+        if not events:
+            return
+        await db.execute(
+            insert(self.log_model),
+            [
+                {
+                    "event_id": event.payload["event_id"],
+                    "event_type": event.payload["event_type"],
+                    "routing_key": event.routing_key,
+                    "payload": event.payload,
+                    "occurred_at": datetime.fromisoformat(event.payload["timestamp"]),
+                    "published_at": published_at,
+                }
+                for event in events
+            ],
+        )
+
+    async def read_event_log(
+        self,
+        db: AsyncSession,
+        event_types: Optional[Collection[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_sequence: int = 0,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Yield logged events in publish order, a page at a time
+
+        Pages by sequence rather than offset, so each page costs the same however far
+        into the log it is. `since` is inclusive and `until` exclusive.
+        """
+        EventLogEntry = self.log_model
+        while True:
+            stmt = (
+                select(EventLogEntry)
+                .where(EventLogEntry.sequence > after_sequence)
+                .order_by(EventLogEntry.sequence)
+                .limit(batch_size)
+            )
+            if event_types:
+                stmt = stmt.where(EventLogEntry.event_type.in_(event_types))
+            if since is not None:
+                stmt = stmt.where(EventLogEntry.occurred_at >= since)
+            if until is not None:
+                stmt = stmt.where(EventLogEntry.occurred_at < until)
+
+            result = await db.execute(stmt)
+            entries = list(result.scalars())
+            if not entries:
+                return
+            yield entries
+            if len(entries) < batch_size:
+                return
+            after_sequence = entries[-1].sequence
+
+    async def replay_event_log(
+        self,
+        db: AsyncSession,
+        sink: ReplaySink,
+        event_types: Optional[Collection[str]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        after_sequence: int = 0,
+        batch_size: int = 1000,
+    ) -> Tuple[int, int]:
+        """
+        Deliver logged events to `sink` in publish order
+
+        Returns how many events were replayed and the sequence of the last one. If the
+        sink fails, replaying again from that sequence resumes where it stopped.
+        """
+        replayed, last_sequence = 0, after_sequence
+        async for entries in self.read_event_log(
+            db, event_types, since, until, after_sequence, batch_size
+        ):
+            await sink([(entry.routing_key, entry.payload) for entry in entries])
+            replayed += len(entries)
+            last_sequence = entries[-1].sequence
+            logger.info(f"Replayed {replayed} events, up to sequence {last_sequence}")
+            # Entries are only read, dropping them keeps a long replay's memory flat
+            db.expunge_all()
+        return replayed, last_sequence
+
+
+def rabbitmq_sink(rabbitmq: RabbitMQClient, queue: Optional[str] = None) -> ReplaySink:
+    """
+    Sink publishing replayed events to RabbitMQ
+
+    With a `queue`, events go straight into that queue through the default exchange,
+    so only its consumer sees them. Otherwise they are published again with their
+    routing keys, to every queue bound to them.
+    """
+
+    async def publish(events: List[Event]):
+        if queue is not None:
+            events = [(queue, event_data) for _, event_data in events]
+            errors = await rabbitmq.publish_many(events, exchange_name="")
+        else:
+            errors = await rabbitmq.publish_many(events)
+        for error in errors:
+            if error is not None:
+                raise error
+
+    return publish
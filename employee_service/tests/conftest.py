@@ -1,9 +1,15 @@
+from datetime import date
 from typing import AsyncGenerator
+import pytest
 import pytest_asyncio
 from app.core.config import settings
 from app.core.db import Base, async_get_db
 from app.main import app
+from app.models.employee_change import EmployeeChange
+from app.models.employment import Department, Employee, EmploymentType
+from app.models.outbox import OutboxEvent
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
@@ -38,6 +44,51 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+# EMPLOYEE FACTORY
+@pytest.fixture
+def employee():
+    """Build an unsaved employee numbered `n`, any other column given by keyword"""
+
+    def build(n, manager=None, department=None, **fields) -> Employee:
+        return Employee(
+            **{
+                "user_id": f"u{n}",
+                "employee_code": f"EMP{n:05}",
+                "first_name": "Jane",
+                "last_name": f"Doe{n}",
+                "middle_name": None,
+                "email": f"jane{n}@example.com",
+                "phone_number": None,
+                "date_of_birth": None,
+                "gender": None,
+                "address": None,
+                "hire_date": date(2026, 1, 20),
+                "termination_date": None,
+                "employment_type": EmploymentType.FULL_TIME,
+                "department_id": department.id if department else None,
+                "position_id": None,
+                "manager_id": manager.id if manager else None,
+                **fields,
+            }
+        )
+
+    return build
+
+
+# EMPTY EMPLOYEE TABLES (BEFORE AND AFTER THE TEST)
+@pytest_asyncio.fixture
+async def clean_employees(db_session: AsyncSession):
+    async def clean():
+        await db_session.rollback()
+        for model in (EmployeeChange, OutboxEvent, Employee, Department):
+            await db_session.execute(delete(model))
+        await db_session.commit()
+
+    await clean()
+    yield
+    await clean()
+
+
 # HTTP CLIENT WITH DB OVERRIDE
 @pytest_asyncio.fixture
 async def client(db_session: AsyncSession):
@@ -0,0 +1,30 @@
+import pytest
+from app.core.utils import cache
+from app.core.utils.bloom import BloomFilter
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(cache, "client", client)
+    return client
+
+
+async def test_values_added_during_a_rebuild_survive_the_swap(redis_client):
+    bloom = BloomFilter("bloom:test", capacity=1000, error_rate=0.01)
+
+    async def values():
+        yield "id:1"
+        # Created while the rebuild reads the source, after it passed this row
+        await bloom.add_many(["id:2"])
+        yield "id:3"
+
+    assert await bloom.rebuild(values(), batch_size=1) == 2
+
+    assert await bloom.might_contain("id:1")
+    assert await bloom.might_contain("id:2")
+    assert await bloom.might_contain("id:3")
+    assert not await bloom.might_contain("id:4")
+    assert not await redis_client.exists("bloom:test:rebuilding")
@@ -0,0 +1,103 @@
+import pytest
+from app.core.utils import cache
+from app.core.utils.cache import _caller_scope, _format_tags, build_query_cache_key
+from app.schemas.employment import EmploymentStatusEnum
+from shared.auth.jwt_utils import TokenData
+from shared.cache.metrics import CacheMetrics
+from starlette.requests import Request
+
+
+def test_query_cache_key_ignores_parameter_order_and_unset_values():
+    first = build_query_cache_key(
+        "employees", {"skip": 0, "limit": 100, "department_id": None}
+    )
+    second = build_query_cache_key("employees", {"limit": 100, "skip": 0})
+
+    assert first == second
+    assert first.startswith("employees:q:")
+
+
+def test_query_cache_key_depends_on_values_and_scope():
+    base = build_query_cache_key("employees", {"skip": 0, "limit": 100})
+
+    assert base != build_query_cache_key("employees", {"skip": 100, "limit": 100})
+    assert base != build_query_cache_key(
+        "employees", {"skip": 0, "limit": 100}, "user:1"
+    )
+
+
+def test_query_cache_key_normalizes_enums():
+    by_enum = build_query_cache_key(
+        "employees", {"employment_status": EmploymentStatusEnum.ACTIVE}
+    )
+    by_value = build_query_cache_key("employees", {"employment_status": "active"})
+
+    assert by_enum == by_value
+
+
+def test_permission_scope_is_shared_by_callers_with_same_permissions():
+    alice = TokenData(
+        user_id="1", is_superuser=False, permissions=["employee:read", "user:read"]
+    )
+    bob = TokenData(
+        user_id="2", is_superuser=False, permissions=["user:read", "employee:read"]
+    )
+
+    assert _caller_scope(
+        {"current_user": alice}, "permissions", "current_user"
+    ) == _caller_scope({"current_user": bob}, "permissions", "current_user")
+    assert _caller_scope({"current_user": alice}, "user", "current_user") != (
+        _caller_scope({"current_user": bob}, "user", "current_user")
+    )
+
+
+def test_tags_can_reference_attributes_of_arguments():
+    alice = TokenData(user_id="1", is_superuser=False, permissions=[])
+
+    assert _format_tags(
+        ["my_payroll:{current_user.user_id}", "payroll_records:{employee_id}"],
+        {"current_user": alice, "employee_id": "e1"},
+    ) == ["my_payroll:1", "payroll_records:e1"]
+
+
+def test_metrics_are_labelled_by_first_prefix_segment():
+    metrics = CacheMetrics()
+    metrics.record_lookup("payroll_records:{employee_id}", "hit")
+    metrics.record_lookup("payroll_records:42", "hit")
+    metrics.observe_payload("employee", 300)
+
+    rendered = metrics.render()
+
+    assert 'cache_lookups_total{prefix="payroll_records",result="hit"} 2' in rendered
+    assert 'cache_payload_bytes_bucket{prefix="employee",le="128"} 0' in rendered
+    assert 'cache_payload_bytes_bucket{prefix="employee",le="512"} 1' in rendered
+    assert 'cache_payload_bytes_count{prefix="employee"} 1' in rendered
+
+
+def request(method):
+    return Request({"type": "http", "method": method, "headers": []})
+
+
+async def test_pattern_without_glob_invalidates_nested_prefixes(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis_client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(cache, "client", redis_client)
+
+    @cache.cache(key_prefix="payroll_records:{employee_id}", resource_id_name="record_id")
+    async def read_record(request, employee_id: str, record_id: int):
+        return {"id": record_id}
+
+    @cache.cache(
+        key_prefix="payroll_run",
+        resource_id_name="run_id",
+        pattern_to_invalidate_extra=["payroll_records"],
+    )
+    async def update_run(request, run_id: int):
+        return {"id": run_id}
+
+    await read_record(request("GET"), employee_id="42", record_id=1)
+    assert await redis_client.exists("payroll_records:42:1")
+
+    await update_run(request("POST"), run_id=7)
+
+    assert not await redis_client.exists("payroll_records:42:1")
@@ -0,0 +1,308 @@
+import asyncio
+import json
+
+from shared.messaging.batching import MicroBatcher
+from shared.messaging.codec import decode, encode, supported_content_types
+from shared.messaging.connection import ConnectionMonitor
+from shared.messaging.consumer import ATTEMPT_HEADER, EventConsumer
+from shared.messaging.idempotency import CLAIMED, DONE, PROCESSING
+
+
+class FakeMessage:
+    def __init__(self, event_data, headers=None):
+        self.body = json.dumps(event_data).encode()
+        self.headers = headers or {}
+        self.content_type = "application/json"
+        self.message_id = None
+        self.acked = False
+        self.requeued = False
+
+    async def ack(self):
+        self.acked = True
+
+    async def nack(self, requeue=True):
+        self.requeued = requeue
+
+
+class RecordingExchange:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, message, routing_key):
+        self.published.append((routing_key, message))
+
+
+class FakeChannel:
+    def __init__(self):
+        self.default_exchange = RecordingExchange()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class MemoryIdempotencyStore:
+    def __init__(self):
+        self.states = {}
+
+    async def claim(self, event_id):
+        if event_id in self.states:
+            return self.states[event_id]
+        self.states[event_id] = PROCESSING
+        return CLAIMED
+
+    async def complete(self, event_id):
+        self.states[event_id] = DONE
+
+    async def release(self, event_id):
+        self.states.pop(event_id, None)
+
+
+def make_consumer(handler, idempotency, **kwargs):
+    consumer = EventConsumer(
+        "amqp://localhost",
+        exchange_name="auth_events",
+        queue_name="test_auth_events",
+        routing_keys=["user.#"],
+        handlers={"user.deactivated": handler},
+        idempotency=idempotency,
+        max_attempts=3,
+        **kwargs,
+    )
+    consumer.channel = FakeChannel()
+    consumer.dead_letter_exchange = RecordingExchange()
+    return consumer
+
+
+async def test_redelivered_event_is_handled_once():
+    handled = []
+
+    async def handler(event_data):
+        handled.append(event_data["user_id"])
+
+    consumer = make_consumer(handler, MemoryIdempotencyStore())
+    event = {"event_id": "1", "event_type": "user.deactivated", "user_id": "u1"}
+    first, redelivery = FakeMessage(event), FakeMessage(event)
+
+    await consumer.process_message(first)
+    await consumer.process_message(redelivery)
+
+    assert handled == ["u1"]
+    assert first.acked and redelivery.acked
+
+
+async def test_redelivery_while_the_claim_is_in_flight_is_deferred_not_dropped():
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(event_data):
+        await release.wait()
+        handled.append(event_data["user_id"])
+
+    idempotency = MemoryIdempotencyStore()
+    consumer = make_consumer(handler, idempotency)
+    event = {"event_id": "1", "event_type": "user.deactivated", "user_id": "u1"}
+    first, redelivery = FakeMessage(event), FakeMessage(event)
+
+    running = asyncio.create_task(consumer.process_message(first))
+    await asyncio.sleep(0)
+    assert idempotency.states["1"] == PROCESSING
+    await consumer.process_message(redelivery)
+
+    # Parked in a delay queue with its attempt unspent, not acked as handled
+    [(routing_key, deferred)] = consumer.channel.default_exchange.published
+    assert routing_key == "test_auth_events.retry.1000ms"
+    assert ATTEMPT_HEADER not in deferred.headers
+    assert handled == []
+
+    release.set()
+    await running
+    assert handled == ["u1"] and idempotency.states["1"] == DONE
+
+
+def deactivated(event_id):
+    return FakeMessage(
+        {"event_id": event_id, "event_type": "user.deactivated", "user_id": event_id}
+    )
+
+
+async def test_stop_drains_running_handlers_and_requeues_waiting_messages():
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(event_data):
+        await release.wait()
+        handled.append(event_data["user_id"])
+
+    consumer = make_consumer(handler, MemoryIdempotencyStore(), concurrency=1)
+    running, waiting = deactivated("u1"), deactivated("u2")
+    deliveries = [
+        asyncio.create_task(consumer._on_message(message))
+        for message in (running, waiting)
+    ]
+    await asyncio.sleep(0)
+    assert consumer.in_flight == 1
+
+    stopping = asyncio.create_task(consumer.stop())
+    await asyncio.sleep(0)
+    assert not stopping.done()
+
+    release.set()
+    await asyncio.gather(stopping, *deliveries)
+
+    assert handled == ["u1"]
+    assert running.acked
+    assert waiting.requeued and not waiting.acked
+    assert consumer.channel.closed and not consumer.ready
+
+
+async def test_stop_gives_up_on_handlers_after_the_drain_timeout():
+    async def handler(event_data):
+        await asyncio.Event().wait()
+
+    idempotency = MemoryIdempotencyStore()
+    consumer = make_consumer(handler, idempotency, drain_timeout=0.01)
+    delivery = asyncio.create_task(consumer._on_message(deactivated("u1")))
+    await asyncio.sleep(0)
+    assert idempotency.states == {"u1": PROCESSING}
+
+    await consumer.stop()
+
+    assert consumer.in_flight == 1
+    # Released, so the broker's redelivery is handled rather than deferred
+    assert idempotency.states == {}
+    assert consumer.channel.closed
+    delivery.cancel()
+
+
+def test_connection_monitor_tracks_disconnects_and_reconnects():
+    monitor = ConnectionMonitor("test_connection")
+    monitor._set_connected(True)
+
+    monitor._on_close(None, ConnectionError("connection reset"))
+    assert not monitor.connected
+    assert monitor.last_error == "connection reset"
+
+    monitor._on_reconnect(None)
+    assert monitor.connected
+    assert (monitor.disconnects, monitor.reconnects) == (1, 1)
+    assert 'rabbitmq_reconnects_total{connection="test_connection"} 1' in (
+        ConnectionMonitor.render()
+    )
+
+
+async def test_failed_handler_releases_its_claim_and_schedules_a_retry():
+    async def handler(event_data):
+        raise ConnectionError("redis unavailable")
+
+    idempotency = MemoryIdempotencyStore()
+    consumer = make_consumer(handler, idempotency)
+    message = FakeMessage(
+        {"event_id": "1", "event_type": "user.deactivated", "user_id": "u1"}
+    )
+
+    await consumer.process_message(message)
+
+    assert message.acked
+    assert "1" not in idempotency.states
+    [(routing_key, retry)] = consumer.channel.default_exchange.published
+    assert routing_key == "test_auth_events.retry.1000ms"
+    assert retry.headers[ATTEMPT_HEADER] == 2
+    assert consumer.retry_queue_name(2) == "test_auth_events.retry.2000ms"
+
+
+async def test_message_is_dead_lettered_after_its_last_attempt():
+    async def handler(event_data):
+        raise ConnectionError("redis unavailable")
+
+    consumer = make_consumer(handler, MemoryIdempotencyStore())
+    message = FakeMessage(
+        {"event_id": "1", "event_type": "user.deactivated", "user_id": "u1"},
+        headers={ATTEMPT_HEADER: 3},
+    )
+
+    await consumer.process_message(message)
+
+    assert message.acked
+    assert consumer.channel.default_exchange.published == []
+    [(routing_key, dead_letter)] = consumer.dead_letter_exchange.published
+    assert routing_key == "test_auth_events"
+    assert dead_letter.headers["x-last-error"] == "redis unavailable"
+
+
+async def test_concurrent_submits_are_processed_as_one_batch():
+    batches = []
+
+    async def process_batch(items):
+        batches.append(sorted(items))
+
+    batcher = MicroBatcher(process_batch, max_size=10, max_wait=0.01)
+    await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+
+    assert batches == [[0, 1, 2]]
+
+
+async def test_failed_batch_is_retried_item_by_item():
+    async def process_batch(items):
+        if "bad" in items:
+            raise ValueError("duplicate email")
+
+    batcher = MicroBatcher(process_batch, max_size=3)
+    results = await asyncio.gather(
+        batcher.submit("a"),
+        batcher.submit("bad"),
+        batcher.submit("b"),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+
+
+def test_events_round_trip_through_every_supported_encoding():
+    event = {"event_id": "1", "event_type": "user.deactivated", "user_id": "u1"}
+    for content_type in supported_content_types():
+        body, used = encode(event, content_type)
+        assert used == content_type
+        assert decode(body, used) == event
+
+
+async def test_event_failing_its_schema_is_dead_lettered_without_retry():
+    handled = []
+
+    async def handler(event_data):
+        handled.append(event_data)
+
+    consumer = make_consumer(handler, MemoryIdempotencyStore())
+    message = FakeMessage({"event_id": "1", "event_type": "user.deactivated"})
+
+    await consumer.process_message(message)
+
+    assert handled == []
+    assert consumer.channel.default_exchange.published == []
+    assert len(consumer.dead_letter_exchange.published) == 1
+
+
+async def test_auth_consumer_coalesces_invalidations_per_user(monkeypatch):
+    from app.messaging import auth_event_consumer
+
+    invalidated = []
+
+    class RecordingPermissionCache:
+        async def invalidate_all_for_users(self, user_ids):
+            invalidated.append(set(user_ids))
+
+    async def get_permission_cache():
+        return RecordingPermissionCache()
+
+    monkeypatch.setattr(auth_event_consumer, "get_permission_cache", get_permission_cache)
+    consumer = auth_event_consumer.AuthEventConsumer("amqp://localhost")
+
+    await asyncio.gather(
+        consumer.handle_role_changed({"user_id": "u1", "role_name": "hr"}),
+        consumer.handle_role_changed({"user_id": "u2", "role_name": "hr"}),
+        consumer.handle_permissions_changed({"user_id": "u1"}),
+        consumer.handle_user_deactivated({"user_id": "u2"}),
+    )
+
+    assert invalidated == [{"u1", "u2"}]
@@ -0,0 +1,36 @@
+import json
+
+from app.schemas.employment import EMPLOYEE_BATCH_DEFAULT_FIELDS
+from app.services.employee import EmployeeService
+
+
+async def test_batch_lookup_streams_found_and_missing_keys(
+    db_session, monkeypatch, employee, clean_employees
+):
+    employees = [employee(n, address={"city": "Lagos"}) for n in range(5)]
+    db_session.add_all(employees)
+    await db_session.commit()
+    monkeypatch.setattr(
+        "app.services.employee.settings.EMPLOYEE_BATCH_FETCH_SIZE", 2
+    )
+
+    chunks = [
+        chunk
+        async for chunk in EmployeeService.stream_employees_batch_json(
+            db_session,
+            [employees[0].id, employees[1].id, "missing-id"],
+            ["EMP00003", "EMP00004", "EMP00001", "EMP99999"],
+            EMPLOYEE_BATCH_DEFAULT_FIELDS,
+        )
+    ]
+    assert len(chunks) > 1
+    body = json.loads(b"".join(chunks))
+
+    assert sorted(row["employee_code"] for row in body["employees"]) == [
+        "EMP00000",
+        "EMP00001",
+        "EMP00003",
+        "EMP00004",
+    ]
+    assert set(body["employees"][0]) == set(EMPLOYEE_BATCH_DEFAULT_FIELDS)
+    assert body["missing"] == {"ids": ["missing-id"], "codes": ["EMP99999"]}
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+from app.core.config import settings
+from app.models.employment import Employee, EmploymentStatus
+from app.models.outbox import OutboxEvent
+from app.schemas.employment import EmployeeBulkTransition
+from app.services.employee_bulk import EmployeeBulkService
+from app.services.hierarchy import HierarchyService
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+
+
+async def test_transitions_update_in_chunks_and_skip_unchanged(
+    db_session, monkeypatch, employee, clean_employees
+):
+    lead = employee(1)
+    db_session.add(lead)
+    await db_session.flush()
+    team = [employee(n, manager=lead) for n in range(2, 7)]
+    db_session.add_all(team)
+    await db_session.commit()
+    await HierarchyService.invalidate_chart()
+    monkeypatch.setattr(settings, "EMPLOYEE_BULK_CHUNK_SIZE", 2)
+
+    ids = [e.id for e in team]
+    transition = EmployeeBulkTransition(
+        action="terminate",
+        employee_ids=ids[:3] + ["missing", ids[0]],
+        termination_date=date(2026, 10, 1),
+        reason="restructuring",
+    )
+    await EmployeeBulkService.validate(db_session, transition)
+    report = await EmployeeBulkService.apply(db_session, transition)
+    assert (report.status, report.total, report.updated, report.skipped) == (
+        "completed",
+        4,
+        3,
+        1,
+    )
+
+    # Terminated employees are not touched again
+    transition = EmployeeBulkTransition(action="suspend", employee_ids=ids)
+    report = await EmployeeBulkService.apply(db_session, transition)
+    assert (report.updated, report.skipped) == (2, 3)
+
+    db_session.expunge_all()
+    statuses = {
+        e.id: e.employment_status
+        for e in await db_session.scalars(select(Employee).where(Employee.id.in_(ids)))
+    }
+    assert [statuses[i] for i in ids] == [EmploymentStatus.TERMINATED] * 3 + [
+        EmploymentStatus.SUSPENDED
+    ] * 2
+    routing_keys = (await db_session.scalars(select(OutboxEvent.routing_key))).all()
+    assert len(routing_keys) == 5
+
+
+async def test_references_are_checked_once_up_front(
+    db_session, employee, clean_employees
+):
+    lead = employee(1)
+    db_session.add(lead)
+    await db_session.flush()
+    report = employee(2, manager=lead)
+    db_session.add(report)
+    await db_session.commit()
+    await HierarchyService.invalidate_chart()
+
+    with pytest.raises(ValidationError):
+        EmployeeBulkTransition(action="reassign_manager", employee_ids=[report.id])
+
+    # The lead cannot report to their own report
+    transition = EmployeeBulkTransition(
+        action="reassign_manager", employee_ids=[lead.id], manager_id=report.id
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await EmployeeBulkService.validate(db_session, transition)
+    assert exc_info.value.status_code == 400
+
+    transition = EmployeeBulkTransition(
+        action="move_department", employee_ids=[lead.id], department_id="missing"
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        await EmployeeBulkService.validate(db_session, transition)
+    assert exc_info.value.status_code == 404
@@ -0,0 +1,42 @@
+import pytest
+from app.models.employment import Department
+from app.schemas.employment import employee_projection_model
+from app.services.employee import (
+    EMPLOYEE_FIELDS,
+    EMPLOYEE_RELATIONS,
+    EmployeeService,
+    parse_fieldset,
+)
+from fastapi import HTTPException
+from sqlalchemy import inspect
+
+
+async def test_fieldsets_load_and_return_only_the_requested_columns(
+    db_session, employee, clean_employees
+):
+    department = Department(name="Sales", description=None, parent_department_id=None)
+    db_session.add(department)
+    await db_session.flush()
+    db_session.add(employee(1, department=department, address={"city": "Lagos"}))
+    await db_session.commit()
+    db_session.expunge_all()
+
+    fields = parse_fieldset("first_name, last_name,email", EMPLOYEE_FIELDS, ("id",))
+    [loaded] = await EmployeeService.get_employees(db_session, fields=fields)
+    assert {"address", "department_id", "phone_number"} <= inspect(loaded).unloaded
+
+    data = employee_projection_model(fields, frozenset()).model_validate(loaded)
+    assert set(data.model_dump()) == {"id", "first_name", "last_name", "email"}
+    db_session.expunge_all()
+
+    include = parse_fieldset("department", EMPLOYEE_RELATIONS)
+    loaded = await EmployeeService.get_employee(
+        db_session, loaded.id, fields=fields, include=include
+    )
+    data = employee_projection_model(fields, include).model_validate(loaded)
+    assert data.model_dump()["department"]["name"] == "Sales"
+    assert "manager" not in data.model_dump()
+
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fieldset("first_name,salary", EMPLOYEE_FIELDS)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,80 @@
+from datetime import UTC, date, datetime, timedelta
+
+from app.models.employment import Department
+from app.schemas.employment import EmployeeBulkTransition, EmployeeUpdate
+from app.services.employee import EmployeeService
+from app.services.employee_bulk import EmployeeBulkService
+from app.services.employee_history import EmployeeHistoryService
+
+
+async def test_state_is_reconstructed_as_of_any_time(
+    db_session, employee, clean_employees
+):
+    sales = Department(name="Sales", description=None, parent_department_id=None)
+    finance = Department(name="Finance", description=None, parent_department_id=None)
+    db_session.add_all([sales, finance])
+    await db_session.flush()
+    jane, john = employee(1, department=sales), employee(2, department=sales)
+    db_session.add_all([jane, john])
+    await db_session.commit()
+    before_move = datetime.now(UTC)
+
+    await EmployeeService.update_employee(
+        db_session, jane.id, EmployeeUpdate(department_id=finance.id, last_name="Roe")
+    )
+    before_termination = datetime.now(UTC)
+
+    await EmployeeBulkService.apply(
+        db_session,
+        EmployeeBulkTransition(
+            action="terminate",
+            employee_ids=[jane.id, john.id],
+            termination_date=date(2026, 10, 1),
+        ),
+    )
+
+    result = await EmployeeHistoryService.get_employees_as_of(
+        db_session, [jane.id, john.id, "missing"], before_move
+    )
+    assert [
+        (e.id, e.department_id, e.last_name, e.employment_status.value)
+        for e in result.employees
+    ] == [(jane.id, sales.id, "Doe1", "active"), (john.id, sales.id, "Doe2", "active")]
+    assert result.missing == ["missing"]
+
+    result = await EmployeeHistoryService.get_employees_as_of(
+        db_session, [jane.id], before_termination
+    )
+    [state] = result.employees
+    assert (state.department_id, state.last_name, state.termination_date) == (
+        finance.id,
+        "Roe",
+        None,
+    )
+
+    result = await EmployeeHistoryService.get_employees_as_of(
+        db_session, [jane.id], datetime.now(UTC)
+    )
+    [state] = result.employees
+    assert (state.employment_status.value, state.termination_date) == (
+        "terminated",
+        date(2026, 10, 1),
+    )
+
+    # Employees created after the time did not exist yet
+    result = await EmployeeHistoryService.get_employees_as_of(
+        db_session, [jane.id], before_move - timedelta(days=1)
+    )
+    assert (result.employees, result.missing) == ([], [jane.id])
+
+    history = await EmployeeHistoryService.get_history(db_session, jane.id)
+    assert [
+        {field: (change.old, change.new) for field, change in entry.changes.items()}
+        for entry in history
+    ] == [
+        {
+            "employment_status": ("active", "terminated"),
+            "termination_date": (None, "2026-10-01"),
+        },
+        {"department_id": (sales.id, finance.id), "last_name": ("Doe1", "Roe")},
+    ]
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+
+import pytest
+from app.models.code_sequence import CodeSequence
+from app.models.employment import Department, Employee
+from app.models.outbox import OutboxEvent
+from app.schemas.employment import EmployeeCreate
+from app.services.code_sequence import CodeSequenceService
+from app.services.employee import EmployeeService
+from app.services.employee_import import EmployeeImportService, iter_import_rows
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+CSV_HEADER = (
+    "user_id,first_name,last_name,email,hire_date,employment_type,department_id,"
+    "address\n"
+)
+
+
+def csv_row(n, email=None, department_id="", address=""):
+    return (
+        f"u{n},Jane,Doe{n},{email or f'jane{n}@example.com'},2026-01-20,"
+        f"full_time,{department_id},{address}\n"
+    )
+
+
+async def clean(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(Employee))
+    await db_session.execute(delete(Department))
+    await db_session.execute(delete(CodeSequence))
+    await db_session.commit()
+
+
+async def test_import_creates_valid_rows_and_reports_the_others(db_session):
+    await clean(db_session)
+    department = Department(
+        name="Engineering",
+        description=None,
+        parent_department_id=None,
+        code_prefix="ENG",
+    )
+    db_session.add(department)
+    await db_session.commit()
+
+    address = json.dumps({"city": "Lagos"}).replace('"', '""')
+    lines = io.StringIO(
+        CSV_HEADER
+        + csv_row(1, department_id=department.id, address=f'"{address}"')
+        + csv_row(2, email="jane1@example.com")
+        + csv_row(3, department_id="missing")
+        + csv_row(4, email="not-an-email")
+        + csv_row(5)
+    )
+
+    report = await EmployeeImportService.import_employees(
+        db_session, iter_import_rows(lines, "csv"), batch_size=2
+    )
+
+    assert (report.total, report.created, report.failed) == (5, 2, 3)
+    assert {error.row: error.errors for error in report.errors} == {
+        2: ["email: duplicated in the file"],
+        3: ["department_id: Department not found"],
+        4: [
+            "email: value is not a valid email address: An email address must "
+            "have an @-sign."
+        ],
+    }
+
+    result = await db_session.execute(select(Employee).order_by(Employee.employee_code))
+    employees = result.scalars().all()
+    assert [employee.user_id for employee in employees] == ["u5", "u1"]
+    assert [employee.employee_code for employee in employees] == [
+        "EMP00000",
+        "ENG00000",
+    ]
+    assert employees[1].address == {"city": "Lagos"}
+
+    result = await db_session.execute(select(OutboxEvent))
+    events = result.scalars().all()
+    assert {event.payload["employee_id"] for event in events} == {
+        employee.id for employee in employees
+    }
+    assert {event.routing_key for event in events} == {"employee.created"}
+
+    # A second import of the same people only reports them as existing
+    rehire = {
+        "user_id": "u5",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "email": "new@example.com",
+        "hire_date": "2026-01-20",
+        "employment_type": "full_time",
+    }
+    lines = io.StringIO(json.dumps(rehire) + "\n\n{not json\n")
+    report = await EmployeeImportService.import_employees(
+        db_session, iter_import_rows(lines, "jsonl")
+    )
+    assert (report.total, report.created, report.failed) == (2, 0, 2)
+    assert [error.errors for error in report.errors] == [
+        ["user_id: an employee with this value already exists"],
+        ["Input should be a valid dictionary or object to extract fields from"],
+    ]
+
+    await clean(db_session)
+
+
+async def test_create_ignores_the_code_it_replaces(db_session):
+    await clean(db_session)
+
+    def new_employee(n):
+        return EmployeeCreate(
+            user_id=f"u{n}",
+            employee_code="EMP00000",
+            first_name="Jane",
+            last_name="Doe",
+            email=f"jane{n}@example.com",
+            hire_date="2026-01-20",
+            employment_type="full_time",
+        )
+
+    first = await EmployeeService.create_employee(db_session, new_employee(1))
+    # The code given collides with the first employee's, but is never used
+    second = await EmployeeService.create_employee(db_session, new_employee(2))
+    assert (first.employee_code, second.employee_code) == ("EMP00000", "EMP00001")
+
+    await clean(db_session)
+
+
+async def test_code_blocks_are_contiguous_per_prefix(db_session):
+    await clean(db_session)
+
+    assert await CodeSequenceService.next_codes(db_session, "EMP", 3) == [
+        "EMP00000",
+        "EMP00001",
+        "EMP00002",
+    ]
+    assert await CodeSequenceService.next_codes(db_session, "ENG") == ["ENG00000"]
+    assert await CodeSequenceService.next_codes(db_session, "EMP", 2) == [
+        "EMP00003",
+        "EMP00004",
+    ]
+    await db_session.commit()
+
+    # Numbers handed out in a rolled back transaction are handed out again
+    assert await CodeSequenceService.allocate(db_session, "EMP", 10) == 5
+    await db_session.rollback()
+    assert await CodeSequenceService.allocate(db_session, "EMP") == 5
+
+    await clean(db_session)
+
+
+def json_row(n, **fields):
+    return json.dumps(
+        {
+            "user_id": f"u{n}",
+            "first_name": "Jane",
+            "last_name": f"Doe{n}",
+            "email": f"jane{n}@example.com",
+            "hire_date": "2026-01-20",
+            "employment_type": "full_time",
+            **fields,
+        }
+    )
+
+
+async def test_import_checks_codes_and_resolves_managers_in_the_file(db_session):
+    await clean(db_session)
+    lines = io.StringIO(
+        "\n".join(
+            [
+                json_row(1, employee_code="EMP00003"),
+                json_row(2, manager_id="u1"),
+                json_row(3, employee_code="EMP00003"),
+                json_row(4, manager_id="u9"),
+                json_row(5),
+            ]
+        )
+    )
+    report = await EmployeeImportService.import_employees(
+        db_session, iter_import_rows(lines, "jsonl"), batch_size=3
+    )
+
+    assert (report.total, report.created, report.failed) == (5, 3, 2)
+    assert {error.row: error.errors for error in report.errors} == {
+        3: ["employee_code: duplicated in the file"],
+        4: ["manager_id: Manager not found"],
+    }
+    result = await db_session.execute(select(Employee))
+    employees = {employee.user_id: employee for employee in result.scalars()}
+    assert employees["u2"].manager_id == employees["u1"].id
+    # Generated codes start after the code given in the generated format
+    assert [employees[user_id].employee_code for user_id in ("u1", "u2", "u5")] == [
+        "EMP00003",
+        "EMP00004",
+        "EMP00005",
+    ]
+
+    lines = io.StringIO(json_row(6, employee_code="EMP00004"))
+    report = await EmployeeImportService.import_employees(
+        db_session, iter_import_rows(lines, "jsonl")
+    )
+    assert [error.errors for error in report.errors] == [
+        ["employee_code: an employee with this value already exists"]
+    ]
+
+    await clean(db_session)
+
+
+async def test_unparsable_csv_is_rejected_until_a_batch_is_committed(db_session):
+    await clean(db_session)
+    too_large = "x" * (csv.field_size_limit() + 1)
+
+    lines = io.StringIO(CSV_HEADER + csv_row(1, address=too_large))
+    with pytest.raises(HTTPException) as e:
+        await EmployeeImportService.import_employees(
+            db_session, iter_import_rows(lines, "csv"), batch_size=1
+        )
+    assert e.value.status_code == 400
+
+    lines = io.StringIO(CSV_HEADER + csv_row(1) + csv_row(2, address=too_large))
+    report = await EmployeeImportService.import_employees(
+        db_session, iter_import_rows(lines, "csv"), batch_size=1
+    )
+    assert (report.total, report.created, report.failed) == (2, 1, 1)
+    assert report.errors[0].row == 2
+    assert report.errors[0].errors[0].startswith("Could not parse the import file")
+
+    await clean(db_session)
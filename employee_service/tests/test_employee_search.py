@@ -0,0 +1,35 @@
+from app.models.employment import Department
+from app.services.employee_search import EmployeeSearchService
+
+
+async def test_search_matches_every_field_and_ranks_names_first(
+    db_session, employee, clean_employees
+):
+    marketing = Department(
+        name="Marketing", description=None, parent_department_id=None
+    )
+    db_session.add(marketing)
+    await db_session.flush()
+    db_session.add_all(
+        [
+            employee(1, first_name="Ada", last_name="Lovelace"),
+            employee(
+                2, first_name="Grace", last_name="Hopper", department=marketing
+            ),
+            employee(3, first_name="Alan", last_name="Turing"),
+        ]
+    )
+    await db_session.commit()
+
+    results = await EmployeeSearchService.search_employees(db_session, "ada")
+    assert [result.employee_code for result in results] == ["EMP00001"]
+
+    results = await EmployeeSearchService.search_employees(db_session, "EMP00003")
+    assert [(result.last_name, result.score) for result in results] == [
+        ("Turing", 1.0)
+    ]
+
+    # A department match ranks below a name match
+    results = await EmployeeSearchService.search_employees(db_session, "ing")
+    assert [result.last_name for result in results] == ["Turing", "Hopper"]
+    assert results[1].department_name == "Marketing"
@@ -0,0 +1,92 @@
+import pytest
+from app.models.employment import Department
+from app.services.employee import EmployeeService
+from app.services.hierarchy import HierarchyService, OrgChart
+from fastapi import HTTPException
+
+
+async def build_org(db_session, employee):
+    """ceo <- cto <- dev1, dev2 ; ceo <- cfo ; engineering > platform"""
+    engineering = Department(
+        name="Engineering", description=None, parent_department_id=None
+    )
+    db_session.add(engineering)
+    await db_session.flush()
+    platform = Department(
+        name="Platform", description=None, parent_department_id=engineering.id
+    )
+    db_session.add(platform)
+    await db_session.flush()
+
+    ceo = employee(1)
+    db_session.add(ceo)
+    await db_session.flush()
+    cto = employee(2, manager=ceo, department=engineering)
+    cfo = employee(3, manager=ceo)
+    db_session.add_all([cto, cfo])
+    await db_session.flush()
+    dev1 = employee(4, manager=cto, department=platform)
+    dev2 = employee(5, manager=cto, department=platform)
+    db_session.add_all([dev1, dev2])
+    await db_session.commit()
+    await HierarchyService.invalidate_chart()
+    return ceo, cto, cfo, dev1, dev2, engineering, platform
+
+
+async def test_chains_reports_and_subtree_headcounts(
+    db_session, employee, clean_employees
+):
+    ceo, cto, cfo, dev1, dev2, engineering, platform = await build_org(db_session, employee)
+    chart = await HierarchyService.get_chart(db_session)
+
+    assert [(e.id, e.depth) for e in chart.reporting_chain(dev1.id)] == [
+        (cto.id, 1),
+        (ceo.id, 2),
+    ]
+    assert chart.reporting_chain(ceo.id) == []
+
+    reports = chart.all_reports(ceo.id)
+    assert {(e.id, e.depth) for e in reports} == {
+        (cto.id, 1),
+        (cfo.id, 1),
+        (dev1.id, 2),
+        (dev2.id, 2),
+    }
+    assert {e.id for e in chart.all_reports(ceo.id, max_depth=1)} == {cto.id, cfo.id}
+
+    tree = chart.department_tree(engineering.id)
+    assert (tree.headcount, tree.total_headcount) == (1, 3)
+    assert [(child.id, child.total_headcount) for child in tree.children] == [
+        (platform.id, 2)
+    ]
+
+    with pytest.raises(HTTPException):
+        chart.reporting_chain("missing")
+
+    # The recursive CTE agrees with the in-memory walk
+    team = await EmployeeService.get_employees(db_session, reports_to=cto.id)
+    assert {e.id for e in team} == {dev1.id, dev2.id}
+
+
+async def test_chart_is_rebuilt_after_a_change_is_signalled(
+    db_session, employee, clean_employees
+):
+    ceo, cto, cfo, dev1, dev2, *_ = await build_org(db_session, employee)
+    chart = await HierarchyService.get_chart(db_session)
+    assert await HierarchyService.get_chart(db_session) is chart
+
+    dev1.manager_id = cfo.id
+    await db_session.commit()
+    await HierarchyService.invalidate_chart()
+
+    chart = await HierarchyService.get_chart(db_session)
+    assert [e.id for e in chart.reporting_chain(dev1.id)] == [cfo.id, ceo.id]
+
+
+def test_department_cycle_without_employees_still_serializes():
+    chart = OrgChart([], [("a", "A", "b"), ("b", "B", "a")])
+    for department_id in ("a", "b"):
+        tree = chart.department_tree(department_id)
+        # A node inside its own subtree could not be dumped
+        tree.model_dump_json()
+        assert tree.total_headcount == 0
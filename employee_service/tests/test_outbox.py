@@ -0,0 +1,263 @@
+from datetime import date
+
+import pytest
+from app.api.v1.employee import router
+from app.messaging.event_publisher import EventPublisher
+from app.messaging.outbox import relay_outbox_batch, replay_event_log, stage_event
+from app.models.code_sequence import CodeSequence
+from app.models.employee_change import EmployeeChange
+from app.models.employment import Employee, EmploymentType
+from app.models.event_log import EventLogEntry
+from app.models.outbox import OutboxEvent
+from app.schemas.employment import EmployeeCreate
+from app.services.employee import EmployeeService
+from shared.messaging.events import (
+    EmployeeTerminatedEvent,
+    EmployeeUpdatedEvent,
+    UnknownEventError,
+)
+from shared.auth.jwt_utils import TokenData
+from shared.messaging.outbox import Outbox
+from sqlalchemy import delete, select
+
+
+class RecordingPublisher:
+    def __init__(self, failing_routing_keys=()):
+        self.failing_routing_keys = set(failing_routing_keys)
+        self.published = []
+
+    async def publish_many(self, events):
+        errors = []
+        for routing_key, event_data in events:
+            if routing_key in self.failing_routing_keys:
+                errors.append(ConnectionError("broker unavailable"))
+            else:
+                self.published.append((routing_key, event_data))
+                errors.append(None)
+        return errors
+
+
+def employee_event(event_class, event_id, **fields):
+    return event_class(
+        event_id=event_id,
+        employee_id="e1",
+        employee_code="EMP001",
+        employee_email="jane@example.com",
+        **fields,
+    )
+
+
+async def test_relay_marks_published_events_and_keeps_failed_ones(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(EventLogEntry))
+    stage_event(
+        db_session,
+        "employee.updated",
+        employee_event(EmployeeUpdatedEvent, "1", updated_fields={"phone": "555"}),
+    )
+    stage_event(
+        db_session,
+        "employee.terminated",
+        employee_event(
+            EmployeeTerminatedEvent, "2", termination_date=date(2025, 1, 31)
+        ),
+    )
+    await db_session.commit()
+
+    publisher = RecordingPublisher(failing_routing_keys={"employee.terminated"})
+    published = await relay_outbox_batch(db_session, publisher, batch_size=10)
+
+    assert published == 1
+    [(routing_key, payload)] = publisher.published
+    assert routing_key == "employee.updated"
+    assert payload["event_id"] == "1"
+    assert payload["schema_version"] == 1
+
+    result = await db_session.execute(
+        select(OutboxEvent).where(OutboxEvent.published_at.is_(None))
+    )
+    pending = result.scalars().all()
+    assert [event.routing_key for event in pending] == ["employee.terminated"]
+    assert pending[0].payload["termination_date"] == "2025-01-31"
+    assert pending[0].attempts == 1
+    assert pending[0].last_error == "broker unavailable"
+
+    result = await db_session.execute(select(EventLogEntry))
+    [logged] = result.scalars().all()
+    assert (logged.event_id, logged.event_type) == ("1", "employee.updated")
+    assert logged.payload == payload
+
+
+async def test_events_failing_too_often_are_parked(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(EventLogEntry))
+    outbox = Outbox(OutboxEvent, EventLogEntry, max_attempts=2)
+    outbox.stage_event(
+        db_session,
+        "employee.terminated",
+        employee_event(
+            EmployeeTerminatedEvent, "1", termination_date=date(2025, 1, 31)
+        ),
+    )
+    await db_session.commit()
+    outbox.stage_event(
+        db_session,
+        "employee.updated",
+        employee_event(EmployeeUpdatedEvent, "2", updated_fields={"phone": "555"}),
+    )
+    await db_session.commit()
+
+    publisher = RecordingPublisher(failing_routing_keys={"employee.terminated"})
+    for _ in range(2):
+        assert await outbox.relay_outbox_batch(db_session, publisher, 1) == 0
+
+    # The oldest event is parked, so the batch of one reaches the next event
+    assert await outbox.relay_outbox_batch(db_session, publisher, 1) == 1
+    assert [payload["event_id"] for _, payload in publisher.published] == ["2"]
+    parked = await db_session.scalar(
+        select(OutboxEvent).where(OutboxEvent.published_at.is_(None))
+    )
+    assert (parked.payload["event_id"], parked.attempts) == ("1", 2)
+
+
+async def created_employee(db_session, n):
+    employee = Employee(
+        user_id=f"u{n}",
+        employee_code=f"EMP{n:05}",
+        first_name="Jane",
+        last_name="Doe",
+        middle_name=None,
+        email=f"jane{n}@example.com",
+        phone_number=None,
+        date_of_birth=None,
+        gender=None,
+        address=None,
+        hire_date=date(2026, 1, 20),
+        termination_date=None,
+        employment_type=EmploymentType.FULL_TIME,
+        department_id=None,
+        position_id=None,
+        manager_id=None,
+    )
+    db_session.add(employee)
+    await db_session.flush()
+    await EventPublisher.publish_employee_created(db_session, employee)
+    await db_session.commit()
+    return employee
+
+
+async def test_discarded_employee_is_deleted_or_terminated_once_published(
+    db_session,
+):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(EventLogEntry))
+    await db_session.execute(delete(EmployeeChange))
+    await db_session.execute(delete(Employee))
+    await db_session.commit()
+
+    # Not published yet, the employee and its event go together
+    employee = await created_employee(db_session, 1)
+    await EmployeeService.discard_created_employee(db_session, employee, "failed")
+    assert await db_session.get(Employee, employee.id) is None
+    assert (await db_session.scalars(select(OutboxEvent))).all() == []
+
+    # Already published, the other services learn of the undo through an event
+    employee = await created_employee(db_session, 2)
+    await relay_outbox_batch(db_session, RecordingPublisher(), batch_size=10)
+    await EmployeeService.discard_created_employee(db_session, employee, "failed")
+    employee = await db_session.get(Employee, employee.id)
+    assert employee.employment_status.value == "terminated"
+    pending = await db_session.scalar(
+        select(OutboxEvent).where(OutboxEvent.published_at.is_(None))
+    )
+    assert pending.routing_key == "employee.terminated"
+    assert pending.payload["reason"] == "failed"
+
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(EventLogEntry))
+    await db_session.execute(delete(EmployeeChange))
+    await db_session.execute(delete(Employee))
+    await db_session.commit()
+
+
+async def test_create_endpoints_stage_employee_created(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(Employee))
+    await db_session.execute(delete(CodeSequence))
+    await db_session.commit()
+
+    endpoints = {
+        route.path: route.endpoint for route in router.routes if "POST" in route.methods
+    }
+    for n, path in enumerate(["/", "/sign-up"], start=1):
+        employee_data = EmployeeCreate(
+            user_id=f"u{n}",
+            employee_code="EMP001",
+            first_name="Jane",
+            last_name="Doe",
+            email=f"jane{n}@example.com",
+            hire_date=date(2026, 1, 20),
+            employment_type="full_time",
+        )
+        current_user = TokenData(user_id=f"u{n}", is_superuser=False)
+        employee = await endpoints[path](employee_data, db_session, current_user)
+
+        event = await db_session.scalar(
+            select(OutboxEvent).where(
+                OutboxEvent.payload["employee_id"].as_string() == employee.id
+            )
+        )
+        assert event.routing_key == "employee.created"
+        assert event.payload["first_name"] == "Jane"
+
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(Employee))
+    await db_session.execute(delete(CodeSequence))
+    await db_session.commit()
+
+def test_invalid_events_are_not_staged(db_session):
+    with pytest.raises(ValueError):
+        stage_event(db_session, "employee.terminated", {"event_type": "employee.terminated"})
+    with pytest.raises(UnknownEventError):
+        stage_event(db_session, "employee.rehired", {"event_type": "employee.rehired"})
+
+
+async def test_replay_streams_logged_events_in_order_and_resumes(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(EventLogEntry))
+    for n in range(5):
+        event_class, fields = (
+            (EmployeeTerminatedEvent, {"termination_date": date(2025, 1, 31)})
+            if n == 2
+            else (EmployeeUpdatedEvent, {"updated_fields": {"phone": str(n)}})
+        )
+        event = employee_event(event_class, f"replay-{n}", **fields)
+        stage_event(db_session, event.event_type, event)
+    await db_session.commit()
+    await relay_outbox_batch(db_session, RecordingPublisher(), batch_size=10)
+
+    replayed = []
+
+    async def sink(events):
+        replayed.extend(event_data["event_id"] for _, event_data in events)
+
+    count, last_sequence = await replay_event_log(
+        db_session, sink, event_types=["employee.updated"], batch_size=2
+    )
+    assert count == 4
+    assert replayed == ["replay-0", "replay-1", "replay-3", "replay-4"]
+
+    # Resuming after an interrupted replay continues from its last sequence
+    replayed.clear()
+    result = await db_session.execute(
+        select(EventLogEntry.sequence).where(EventLogEntry.event_id == "replay-1")
+    )
+    count, _ = await replay_event_log(
+        db_session, sink, after_sequence=result.scalar_one(), batch_size=2
+    )
+    assert replayed == ["replay-2", "replay-3", "replay-4"]
+
+    count, resumed_from = await replay_event_log(
+        db_session, sink, after_sequence=last_sequence
+    )
+    assert (count, resumed_from) == (0, last_sequence)
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+from app.models.employment import Department
+from app.services.department import DepartmentService
+from fastapi import HTTPException
+from shared.db.pagination import NEXT_CURSOR_HEADER, next_cursor, with_next_cursor
+from sqlalchemy import delete
+
+
+async def add_departments(db_session, count):
+    await db_session.execute(delete(Department))
+    start = datetime(2026, 1, 1)
+    for n in range(count):
+        department = Department(
+            name=f"Department {n:02}", description=None, parent_department_id=None
+        )
+        # Pairs share a created_at, so pages must break ties on id
+        department.created_at = start + timedelta(minutes=n // 2)
+        db_session.add(department)
+    await db_session.commit()
+
+
+async def test_cursor_pages_cover_every_row_once(db_session):
+    await add_departments(db_session, 7)
+
+    seen, cursor = [], None
+    while True:
+        page = await DepartmentService.get_departments(db_session, limit=3, cursor=cursor)
+        seen.extend(department.id for department in page)
+        cursor = next_cursor(page, 3, "created_at")
+        if cursor is None:
+            break
+
+    offset_page = await DepartmentService.get_departments(db_session, limit=7)
+    assert seen == [department.id for department in offset_page]
+
+    # Rows created after the first page was read do not shift the next page
+    first = await DepartmentService.get_departments(db_session, limit=3)
+    cursor = next_cursor(first, 3, "created_at")
+    db_session.add(
+        Department(name="Newest", description=None, parent_department_id=None)
+    )
+    await db_session.commit()
+    second = await DepartmentService.get_departments(db_session, limit=3, cursor=cursor)
+    assert [department.id for department in second] == seen[3:6]
+
+    await db_session.execute(delete(Department))
+    await db_session.commit()
+
+
+async def test_invalid_cursor_is_rejected(db_session):
+    with pytest.raises(HTTPException) as exc_info:
+        await DepartmentService.get_departments(db_session, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+async def test_next_cursor_header_is_sent_for_full_pages():
+    @with_next_cursor()
+    async def endpoint(limit):
+        return [{"id": "a", "created_at": "2026-01-01T00:00:00"}][:limit]
+
+    response = await endpoint(limit=1)
+    assert response.headers[NEXT_CURSOR_HEADER] == next_cursor(
+        [{"id": "a", "created_at": "2026-01-01T00:00:00"}], 1, "created_at"
+    )
+    # A short page is the last one and is returned as is
+    assert await endpoint(limit=2) == [{"id": "a", "created_at": "2026-01-01T00:00:00"}]
@@ -0,0 +1,57 @@
+from datetime import date
+
+from app.models.employment import Employee, EmploymentType
+from app.models.outbox import OutboxEvent
+from app.services.employee import EmployeeService
+from sqlalchemy import delete, select
+
+
+def make_employee(n: int) -> Employee:
+    return Employee(
+        user_id=f"u{n}",
+        employee_code=f"EMP{n:03d}",
+        first_name="Jane",
+        last_name=f"Doe{n}",
+        email=f"jane{n}@example.com",
+        hire_date=date(2024, 1, 1),
+        employment_type=EmploymentType.FULL_TIME,
+        middle_name=None,
+        phone_number=None,
+        date_of_birth=None,
+        gender=None,
+        address=None,
+        termination_date=None,
+        department_id=None,
+        position_id=None,
+        manager_id=None,
+    )
+
+
+async def test_publish_snapshot_stages_an_event_per_live_employee(db_session):
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(Employee))
+    employees = [make_employee(n) for n in range(5)]
+    db_session.add_all(employees)
+    await db_session.flush()
+    employees[0].is_deleted = True
+    await db_session.commit()
+
+    count = await EmployeeService.publish_snapshot(db_session, batch_size=2)
+
+    assert count == 4
+    result = await db_session.execute(select(OutboxEvent))
+    payloads = [event.payload for event in result.scalars()]
+    assert {payload["event_type"] for payload in payloads} == {"employee.snapshot"}
+    assert {payload["employee_code"] for payload in payloads} == {
+        "EMP001",
+        "EMP002",
+        "EMP003",
+        "EMP004",
+    }
+    assert {payload["employment_status"] for payload in payloads} == {"active"}
+    # Every page is stamped with the time the snapshot started
+    assert len({payload["timestamp"] for payload in payloads}) == 1
+
+    await db_session.execute(delete(OutboxEvent))
+    await db_session.execute(delete(Employee))
+    await db_session.commit()
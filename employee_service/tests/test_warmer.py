@@ -0,0 +1,21 @@
+from app.core.utils.warmer import warm_caches, warm_set, warm_sets
+
+
+async def test_failing_warm_set_does_not_stop_the_others():
+    @warm_set("test_ok")
+    async def warm_ok() -> int:
+        return 3
+
+    @warm_set("test_broken")
+    async def warm_broken() -> int:
+        raise RuntimeError("boom")
+
+    try:
+        report = await warm_caches(["test_ok", "test_broken", "test_unknown"])
+    finally:
+        warm_sets.pop("test_ok")
+        warm_sets.pop("test_broken")
+
+    assert report["sets"]["test_ok"]["entries"] == 3
+    assert report["sets"]["test_broken"] == {"error": "boom"}
+    assert report["sets"]["test_unknown"] == {"error": "unknown warm set"}
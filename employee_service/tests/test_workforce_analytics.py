@@ -0,0 +1,131 @@
+from datetime import UTC, datetime, timedelta
+
+from app.core.utils.etag import with_etag
+from app.models.employment import Department, Employee
+from app.models.workforce import HeadcountRollup, WorkforceEmployee, WorkforceTrend
+from app.services.hierarchy import HierarchyService
+from app.services.workforce_analytics import WorkforceAnalyticsService
+from sqlalchemy import delete
+from starlette.requests import Request
+
+NOW = datetime.now(UTC)
+THIS_MONTH = NOW.date().isoformat()
+
+
+def employee_event(event_type, employee_id, seconds, **fields):
+    return {
+        "event_type": event_type,
+        "timestamp": (NOW + timedelta(seconds=seconds)).isoformat(),
+        "employee_id": employee_id,
+        "department_id": None,
+        "position_id": None,
+        "employment_type": "full_time",
+        "employment_status": "active",
+        "hire_date": THIS_MONTH,
+        "termination_date": None,
+        **fields,
+    }
+
+
+async def clean(db_session):
+    for model in (WorkforceEmployee, HeadcountRollup, WorkforceTrend, Employee):
+        await db_session.execute(delete(model))
+    await db_session.execute(delete(Department))
+    await db_session.commit()
+
+
+async def test_rollups_follow_events_and_roll_up_departments(db_session):
+    await clean(db_session)
+    engineering = Department(
+        name="Engineering", description=None, parent_department_id=None
+    )
+    db_session.add(engineering)
+    await db_session.flush()
+    platform = Department(
+        name="Platform", description=None, parent_department_id=engineering.id
+    )
+    db_session.add(platform)
+    await db_session.commit()
+    await HierarchyService.invalidate_chart()
+
+    await WorkforceAnalyticsService.apply_events(
+        db_session,
+        [
+            employee_event("employee.created", "e1", 0, department_id=engineering.id),
+            employee_event("employee.created", "e2", 0, department_id=engineering.id),
+            employee_event(
+                "employee.created", "e3", 0, employment_type="contract"
+            ),
+        ],
+    )
+    await WorkforceAnalyticsService.apply_events(
+        db_session,
+        [
+            employee_event("employee.updated", "e2", 10, department_id=platform.id),
+            employee_event(
+                "employee.terminated",
+                "e3",
+                10,
+                employment_type="contract",
+                employment_status="terminated",
+                termination_date=THIS_MONTH,
+            ),
+            # Older than the state already applied, ignored
+            employee_event("employee.updated", "e1", -10, department_id=platform.id),
+        ],
+    )
+
+    analytics = await WorkforceAnalyticsService.get_workforce(db_session, months=3)
+    assert analytics.headcount == 2
+    departments = {d.department_id: d for d in analytics.by_department}
+    assert [
+        (departments[id].headcount, departments[id].total_headcount)
+        for id in (engineering.id, platform.id)
+    ] == [(1, 2), (1, 1)]
+    assert [(b.key, b.headcount) for b in analytics.by_employment_type] == [
+        ("full_time", 2)
+    ]
+    assert {(b.key, b.headcount) for b in analytics.by_status} == {
+        ("active", 2),
+        ("terminated", 1),
+    }
+    assert [(t.hires, t.terminations) for t in analytics.trends] == [
+        (0, 0),
+        (0, 0),
+        (3, 1),
+    ]
+
+    # Replaying a batch changes nothing
+    await WorkforceAnalyticsService.apply_events(
+        db_session,
+        [employee_event("employee.updated", "e2", 10, department_id=platform.id)],
+    )
+    replayed = await WorkforceAnalyticsService.get_workforce(db_session, months=3)
+    assert replayed == analytics
+
+    await clean(db_session)
+
+
+def request(headers=()):
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        }
+    )
+
+
+async def test_etag_answers_not_modified_when_it_matches():
+    @with_etag
+    async def endpoint(request):
+        return {"headcount": 2}
+
+    response = await endpoint(request=request())
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = await endpoint(request=request([("If-None-Match", f'"x", W/{etag}')]))
+    assert (response.status_code, response.body) == (304, b"")
+
+    response = await endpoint(request=request([("If-None-Match", '"stale"')]))
+    assert response.status_code == 200
@@ -0,0 +1,127 @@
+"""
+Sample Redis keys and report their size and TTL per key prefix
+
+Usage:
+    python -m shared.cache.stats --url redis://localhost:6379 --sample 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import redis.asyncio as redis
+
+from .metrics import metric_prefix
+
+# Prefixes whose second segment is still low cardinality, e.g. 'tag:employees'
+NESTED_PREFIXES = {"tag", "missing", "bloom"}
+
+
+def key_prefix(key: str) -> str:
+    """Group a key by its first segment, or two for the nested prefixes"""
+    prefix = metric_prefix(key)
+    if prefix in NESTED_PREFIXES:
+        return ":".join(key.split(":", 2)[:2])
+    return prefix
+
+
+class PrefixStats:
+    def __init__(self):
+        self.sizes: List[int] = []
+        self.ttls: List[int] = []
+        self.persistent = 0
+
+    def add(self, size: Optional[int], ttl: int):
+        self.sizes.append(size or 0)
+        if ttl < 0:
+            self.persistent += 1
+        else:
+            self.ttls.append(ttl)
+
+
+async def sample_keys(
+    client: redis.Redis, sample: int, batch_size: int = 500
+) -> Dict[str, PrefixStats]:
+    """Scan up to `sample` keys, reading MEMORY USAGE and TTL in pipelined batches"""
+    stats: Dict[str, PrefixStats] = defaultdict(PrefixStats)
+    batch: List[bytes] = []
+    seen = 0
+
+    async def flush():
+        async with client.pipeline(transaction=False) as pipe:
+            for key in batch:
+                pipe.memory_usage(key)
+                pipe.ttl(key)
+            # Some managed Redis offerings disable MEMORY, so its errors are not fatal
+            results = await pipe.execute(raise_on_error=False)
+        for key, size, ttl in zip(batch, results[::2], results[1::2]):
+            # Keys can expire between SCAN and the pipeline
+            if ttl == -2:
+                continue
+            if isinstance(size, Exception):
+                size = None
+            stats[key_prefix(key.decode(errors="replace"))].add(size, ttl)
+        batch.clear()
+
+    async for key in client.scan_iter(count=batch_size):
+        batch.append(key)
+        seen += 1
+        if len(batch) >= batch_size:
+            await flush()
+        if seen >= sample:
+            break
+    if batch:
+        await flush()
+
+    return stats
+
+
+def _percentile(values: List[int], percentile: float) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+def format_report(stats: Dict[str, PrefixStats], total_keys: int) -> str:
+    """Render the sampled stats as a table, extrapolating counts and memory to the whole keyspace"""
+    sampled = sum(len(prefix_stats.sizes) for prefix_stats in stats.values())
+    scale = total_keys / sampled if sampled else 0
+
+    header = (
+        f"{'prefix':<28}{'keys':>10}{'est. keys':>11}{'avg B':>9}{'p95 B':>9}"
+        f"{'est. MB':>10}{'min TTL':>9}{'avg TTL':>9}{'max TTL':>9}{'no TTL':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    ordered = sorted(stats.items(), key=lambda item: -sum(item[1].sizes))
+    for prefix, prefix_stats in ordered:
+        sizes, ttls = prefix_stats.sizes, prefix_stats.ttls
+        lines.append(
+            f"{prefix[:27]:<28}{len(sizes):>10}{round(len(sizes) * scale):>11}"
+            f"{round(statistics.mean(sizes)):>9}{_percentile(sizes, 0.95):>9}"
+            f"{sum(sizes) * scale / 1024 / 1024:>10.2f}"
+            f"{min(ttls, default=0):>9}{round(statistics.mean(ttls)) if ttls else 0:>9}"
+            f"{max(ttls, default=0):>9}{prefix_stats.persistent:>8}"
+        )
+    lines.append(f"\nSampled {sampled} of {total_keys} keys")
+    return "\n".join(lines)
+
+
+async def main(url: str, sample: int):
+    client = redis.from_url(url)
+    try:
+        total_keys = await client.dbsize()
+        stats = await sample_keys(client, sample)
+        print(format_report(stats, total_keys))
+    finally:
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="redis://localhost:6379")
+    parser.add_argument("--sample", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.sample))
@@ -0,0 +1,183 @@
+"""
+Versioned schemas of every event published between the services
+
+Each schema is registered under its (event_type, schema_version). A breaking change
+adds a new class with the next version and registers it next to the old one, so
+consumers keep validating messages still in flight in the old shape.
+"""
+
+from datetime import UTC, date, datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type, TypeVar, Union
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+
+class UnknownEventError(ValueError):
+    """Raised for an event type and version with no registered schema"""
+
+
+class BaseEvent(BaseModel):
+    """Fields shared by every event"""
+
+    event_id: str = Field(default_factory=lambda: str(uuid4()))
+    event_type: str
+    schema_version: int = 1
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+
+EVENT_REGISTRY: Dict[Tuple[str, int], Type[BaseEvent]] = {}
+
+EventT = TypeVar("EventT", bound=Type[BaseEvent])
+
+
+def register_event(event_class: EventT) -> EventT:
+    """Register a schema under the defaults of its event_type and schema_version"""
+    event_type = event_class.model_fields["event_type"].default
+    schema_version = event_class.model_fields["schema_version"].default
+    EVENT_REGISTRY[(event_type, schema_version)] = event_class
+    return event_class
+
+
+def parse_event(event_data: Union[Dict[str, Any], BaseEvent]) -> BaseEvent:
+    """Validate event data against its registered schema"""
+    if isinstance(event_data, BaseEvent):
+        return event_data
+    key = (event_data.get("event_type"), event_data.get("schema_version", 1))
+    event_class = EVENT_REGISTRY.get(key)
+    if event_class is None:
+        raise UnknownEventError(f"No schema registered for {key[0]} v{key[1]}")
+    return event_class.model_validate(event_data)
+
+
+# -------------- employee events --------------
+class EmployeeEvent(BaseEvent):
+    """Base event schema for employee-related events"""
+
+    event_type: Literal[
+        "employee.created",
+        "employee.updated",
+        "employee.terminated",
+        "employee.department_changed",
+        "employee.snapshot",
+    ]
+    user_id: Optional[str] = None
+    employee_id: str
+    employee_code: str
+    employee_email: str
+    # Current state of the fields other services project, so that applying the
+    # latest event is enough and events can be applied out of order
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    department_id: Optional[str] = None
+    employment_status: Optional[str] = None
+    position_id: Optional[str] = None
+    employment_type: Optional[str] = None
+    hire_date: Optional[date] = None
+    termination_date: Optional[date] = None
+
+
+@register_event
+class EmployeeCreatedEvent(EmployeeEvent):
+    """Event published when employee is created"""
+
+    event_type: Literal["employee.created"] = "employee.created"
+    first_name: str
+    last_name: str
+    hire_date: date
+
+
+@register_event
+class EmployeeUpdatedEvent(EmployeeEvent):
+    """Event published when employee is updated"""
+
+    event_type: Literal["employee.updated"] = "employee.updated"
+    updated_fields: Dict[str, Any]
+
+
+@register_event
+class EmployeeTerminatedEvent(EmployeeEvent):
+    """Event published when employee is terminated"""
+
+    event_type: Literal["employee.terminated"] = "employee.terminated"
+    termination_date: date
+    reason: Optional[str] = None
+
+
+@register_event
+class EmployeeSnapshotEvent(EmployeeEvent):
+    """Current state of an employee, published to seed or rebuild projections"""
+
+    event_type: Literal["employee.snapshot"] = "employee.snapshot"
+    first_name: str
+    last_name: str
+    employment_status: str
+
+
+# -------------- auth events --------------
+@register_event
+class UserPermissionsChangedEvent(BaseEvent):
+    """Event published when a user's effective permissions change"""
+
+    event_type: Literal["user.permissions.changed"] = "user.permissions.changed"
+    user_id: str
+    old_permissions: List[str]
+    new_permissions: List[str]
+    added_permissions: List[str]
+    removed_permissions: List[str]
+
+
+@register_event
+class UserRoleAssignedEvent(BaseEvent):
+    """Event published when a role is assigned to a user"""
+
+    event_type: Literal["user.role.assigned"] = "user.role.assigned"
+    user_id: str
+    role_id: str
+    role_name: str
+
+
+@register_event
+class UserRoleRemovedEvent(BaseEvent):
+    """Event published when a role is removed from a user"""
+
+    event_type: Literal["user.role.removed"] = "user.role.removed"
+    user_id: str
+    role_id: str
+    role_name: str
+
+
+@register_event
+class UserDeactivatedEvent(BaseEvent):
+    """Event published when a user account is deactivated"""
+
+    event_type: Literal["user.deactivated"] = "user.deactivated"
+    user_id: str
+
+
+# -------------- payroll events --------------
+@register_event
+class PayrollProcessedEvent(BaseEvent):
+    """Event published when a payroll record is paid"""
+
+    event_type: Literal["payroll.processed"] = "payroll.processed"
+    employee_id: str
+    payroll_id: str
+    pay_period_start: date
+    pay_period_end: date
+    gross_salary: float
+    net_salary: float
+    payment_date: Optional[date] = None
+    payment_method: Optional[str] = None
+
+
+@register_event
+class SalaryChangedEvent(BaseEvent):
+    """Event published when an employee's salary changes"""
+
+    event_type: Literal["salary.changed"] = "salary.changed"
+    employee_id: str
+    old_salary: float
+    new_salary: float
+    effective_from: date
+    change_percentage: float
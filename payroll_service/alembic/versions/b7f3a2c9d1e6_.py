@@ -0,0 +1,88 @@
+"""add outbox, event log, employee projections and payroll records index
+
+Revision ID: b7f3a2c9d1e6
+Revises:
+Create Date: 2026-10-19 21:12:37.418205
+
+Payroll has no earlier revision: its original tables are created by create_all
+on startup. Objects that may already exist that way are created only if missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7f3a2c9d1e6'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('routing_key', sa.String(length=255), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    if_not_exists=True
+    )
+    op.create_index(op.f('ix_outbox_events_id'), 'outbox_events', ['id'], unique=True, if_not_exists=True)
+    op.create_index(op.f('ix_outbox_events_is_deleted'), 'outbox_events', ['is_deleted'], unique=False, if_not_exists=True)
+    op.create_index('ix_outbox_events_unpublished', 'outbox_events', ['created_at'], unique=False, postgresql_where=sa.text('published_at IS NULL'), if_not_exists=True)
+    op.create_table('event_log',
+    sa.Column('event_id', sa.String(length=36), nullable=False),
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('routing_key', sa.String(length=255), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('sequence', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('sequence'),
+    sa.UniqueConstraint('event_id'),
+    if_not_exists=True
+    )
+    op.create_index(op.f('ix_event_log_occurred_at'), 'event_log', ['occurred_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_event_log_type_occurred_at', 'event_log', ['event_type', 'occurred_at'], unique=False, if_not_exists=True)
+    op.create_table('employee_projections',
+    sa.Column('employee_id', sa.String(length=36), nullable=False),
+    sa.Column('employee_code', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('last_event_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('user_id', sa.String(length=36), nullable=True),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('department_id', sa.String(length=36), nullable=True),
+    sa.Column('employment_status', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('employee_id'),
+    if_not_exists=True
+    )
+    op.create_index(op.f('ix_employee_projections_department_id'), 'employee_projections', ['department_id'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_employee_projections_employee_code'), 'employee_projections', ['employee_code'], unique=False, if_not_exists=True)
+    op.create_index(op.f('ix_employee_projections_user_id'), 'employee_projections', ['user_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_payroll_records_employee_period_id', 'payroll_records', ['employee_id', 'pay_period_start', 'id'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payroll_records_employee_period_id', table_name='payroll_records')
+    op.drop_index(op.f('ix_employee_projections_user_id'), table_name='employee_projections')
+    op.drop_index(op.f('ix_employee_projections_employee_code'), table_name='employee_projections')
+    op.drop_index(op.f('ix_employee_projections_department_id'), table_name='employee_projections')
+    op.drop_table('employee_projections')
+    op.drop_index('ix_event_log_type_occurred_at', table_name='event_log')
+    op.drop_index(op.f('ix_event_log_occurred_at'), table_name='event_log')
+    op.drop_table('event_log')
+    op.drop_index('ix_outbox_events_unpublished', table_name='outbox_events', postgresql_where=sa.text('published_at IS NULL'))
+    op.drop_index(op.f('ix_outbox_events_is_deleted'), table_name='outbox_events')
+    op.drop_index(op.f('ix_outbox_events_id'), table_name='outbox_events')
+    op.drop_table('outbox_events')
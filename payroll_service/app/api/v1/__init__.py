@@ -1,8 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1 import payroll, health
+from app.api.v1 import payroll, health, dead_letters
 from payroll_service.app.api.v1 import payroll
 
 router = APIRouter(prefix="/v1")
 router.include_router(health.router, prefix="/health", tags=["Health"])
 router.include_router(payroll.router, prefix="/payroll", tags=["Payroll"])
 router.include_router(payroll.router, prefix="/reports", tags=["Reports"])
+router.include_router(dead_letters.router, prefix="/dead-letters", tags=["Dead Letters"])
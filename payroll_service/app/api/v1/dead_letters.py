@@ -0,0 +1,53 @@
+from typing import List, Optional
+
+from app.core.dependencies.auth import get_current_superuser
+from app.core.schemas import DeadLetter, DeadLetterReplay, DeadLetterReplayResult
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+
+# Checked before any endpoint dependency, so callers learn nothing about the queues
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+
+def get_event_consumer(
+    request: Request,
+    queue: Optional[str] = Query(None, description="Consumer queue, if the service has several"),
+):
+    consumers = request.app.state.event_consumers
+    if queue is None and len(consumers) == 1:
+        queue = next(iter(consumers))
+    if queue is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Specify the queue, one of: {', '.join(sorted(consumers))}",
+        )
+
+    consumer = consumers.get(queue)
+    if consumer is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Unknown consumer queue"
+        )
+    if consumer.channel is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event consumer is not running",
+        )
+    return consumer
+
+
+@router.get("", response_model=List[DeadLetter])
+async def get_dead_letters(
+    limit: int = Query(50, ge=1, le=500),
+    consumer=Depends(get_event_consumer),
+):
+    """Inspect the dead letters of this service's event consumer"""
+    return await consumer.dead_letters(limit)
+
+
+@router.post("/replay", response_model=DeadLetterReplayResult)
+async def replay_dead_letters(
+    replay: DeadLetterReplay,
+    consumer=Depends(get_event_consumer),
+):
+    """Move dead letters back onto the consumer queue"""
+    replayed = await consumer.replay_dead_letters(replay.event_ids, replay.limit)
+    return {"replayed": replayed}
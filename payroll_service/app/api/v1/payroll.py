@@ -3,8 +3,9 @@ from typing import List, Optional
 
 from app.core.db import SessionDep
 from app.core.dependencies.auth import check_permission, get_current_user_from_token
+from app.core.utils.cache import cache, invalidate_tags
 from app.services.payroll import EmployeeSalaryService, PayrollService
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from schemas.payroll import (
     EmployeeSalaryCreate,
     EmployeeSalaryResponse,
@@ -16,6 +17,7 @@ from schemas.payroll import (
 )
 
 from hr_shared.auth.jwt_utils import TokenData
+from shared.db.pagination import with_next_cursor
 
 router = APIRouter()
 
@@ -83,6 +85,11 @@ async def create_payroll_record(
 ):
     """Create payroll record for employee"""
     payroll = await PayrollService.create_payroll_record(db, payroll_data)
+    await invalidate_tags(
+        f"payroll_records:{payroll.employee_id}",
+        f"my_payroll:{payroll.employee_id}",
+        "payroll_summary",
+    )
     return payroll
 
 
@@ -104,19 +111,27 @@ async def get_payroll_record(
 @router.get(
     "/records/employee/{employee_id}", response_model=List[PayrollRecordResponse]
 )
+@with_next_cursor(sort_key="pay_period_start")
+@cache(
+    key_prefix="payroll_records:{employee_id}",
+    expiration=600,
+    query_key_params=["year", "skip", "limit", "cursor"],
+)
 async def get_employee_payroll_records(
+    request: Request,
     db: SessionDep,
     employee_id: str,
     year: Optional[int] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
     current_user: TokenData = Depends(check_permission("payroll:read")),
 ):
     """Get payroll records for employee"""
     payrolls = await PayrollService.get_employee_payroll_records(
-        db, employee_id, year, skip, limit
+        db, employee_id, year, skip, limit, cursor
     )
-    return payrolls
+    return [PayrollRecordResponse.model_validate(payroll) for payroll in payrolls]
 
 
 @router.patch("/records/{payroll_id}", response_model=PayrollRecordResponse)
@@ -128,6 +143,11 @@ async def update_payroll_record(
 ):
     """Update payroll record"""
     payroll = await PayrollService.update_payroll_record(db, payroll_id, payroll_data)
+    await invalidate_tags(
+        f"payroll_records:{payroll.employee_id}",
+        f"my_payroll:{payroll.employee_id}",
+        "payroll_summary",
+    )
     return payroll
 
 
@@ -143,11 +163,22 @@ async def process_payroll_payment(
     payroll = await PayrollService.process_payment(
         db, payroll_id, payment_method, payment_reference
     )
+    await invalidate_tags(
+        f"payroll_records:{payroll.employee_id}",
+        f"my_payroll:{payroll.employee_id}",
+        "payroll_summary",
+    )
     return payroll
 
 
 @router.get("/summary", response_model=PayrollSummary)
+@cache(
+    key_prefix="payroll_summary",
+    expiration=600,
+    query_key_params=["start_date", "end_date"],
+)
 async def get_payroll_summary(
+    request: Request,
     start_date: date,
     end_date: date,
     db: SessionDep,
@@ -162,7 +193,16 @@ async def get_payroll_summary(
 
 
 @router.get("/my-payroll", response_model=List[PayrollRecordResponse])
+@cache(
+    key_prefix="my_payroll",
+    expiration=600,
+    query_key_params=["year", "skip", "limit"],
+    scope="user",
+    # Per employee, so a change to one employee's records leaves the others cached
+    tags=["my_payroll:{current_user.employee_id}"],
+)
 async def get_my_payroll_records(
+    request: Request,
     db: SessionDep,
     year: Optional[int] = None,
     skip: int = Query(0, ge=0),
@@ -173,7 +213,7 @@ async def get_my_payroll_records(
     payrolls = await PayrollService.get_employee_payroll_records(
         db, current_user.employee_id, year, skip, limit
     )
-    return payrolls
+    return [PayrollRecordResponse.model_validate(payroll) for payroll in payrolls]
 
 
 @router.get("/my-salary", response_model=EmployeeSalaryResponse)
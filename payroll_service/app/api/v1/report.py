@@ -4,8 +4,8 @@ from typing import List, Optional
 from app.core.db import SessionDep
 from app.core.dependencies.auth import check_permission
 from app.models.payroll import PayrollRecord
+from app.services.employee_projection import EmployeeProjectionService
 from app.services.payroll import PayrollService
-from clients.employee import EmployeeServiceClient
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from services.report import PayrollReportService
@@ -32,22 +32,10 @@ async def download_payslip(
             status_code=status.HTTP_404_NOT_FOUND, detail="Payroll record not found"
         )
 
-    # Get employee info from Employee Service
-    from app.core.config import settings
-
-    employee_client = EmployeeServiceClient(settings.EMPLOYEE_SERVICE_URL)
-
-    # Extract token from request header
-    from fastapi import Request
-
-    request: Request = ...  # This would be injected
-    auth_header = request.headers.get("Authorization")
-    token = auth_header.split(" ")[1] if auth_header else ""
-
-    employee = await employee_client.get_employee(payroll.employee_id, token)
-
-    employee_name = f"{employee.get('first_name', '')} {employee.get('last_name', '')}"
-    employee_code = employee.get("employee_code", "N/A")
+    # Employee details come from the local projection, no call to the Employee Service
+    employee = await EmployeeProjectionService.get_employee(db, payroll.employee_id)
+    employee_name = employee.full_name if employee else ""
+    employee_code = employee.employee_code if employee else "N/A"
 
     # Generate PDF
     pdf_buffer = await PayrollReportService.generate_payslip_pdf(
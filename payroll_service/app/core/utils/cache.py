@@ -1,6 +1,8 @@
 import functools
+import hashlib
 import json
 import re
+from enum import Enum
 from collections.abc import AsyncGenerator, Callable
 from typing import Annotated, Any
 
@@ -12,10 +14,43 @@ from app.core.exceptions.cache_exceptions import (
 from fastapi import Depends, Request
 from fastapi.encoders import jsonable_encoder
 from redis.asyncio import ConnectionPool, Redis
+from redis.commands.core import AsyncScript
+from shared.cache.metrics import cache_metrics
 
 pool: ConnectionPool | None = None
 client: Redis | None = None
 
+TAG_KEY_PREFIX = "tag"
+MISSING_KEY_PREFIX = "missing"
+_GLOB_CHARACTERS = re.compile(r"[*?\[]")
+
+# Adds ARGV[1] (a cache key) to every tag set in KEYS and makes sure each tag set
+# lives at least ARGV[2] seconds, so a tag never expires before one of its members.
+_REGISTER_TAGS_LUA = """
+local ttl = tonumber(ARGV[2])
+for _, tag in ipairs(KEYS) do
+    redis.call('SADD', tag, ARGV[1])
+    if redis.call('TTL', tag) < ttl then
+        redis.call('EXPIRE', tag, ttl)
+    end
+end
+return #KEYS
+"""
+
+# Deletes every member of every tag set in KEYS, then the tag sets themselves.
+# Members are deleted in chunks to stay below Lua's unpack() limit.
+_INVALIDATE_TAGS_LUA = """
+local deleted = 0
+for _, tag in ipairs(KEYS) do
+    local members = redis.call('SMEMBERS', tag)
+    for i = 1, #members, 500 do
+        deleted = deleted + redis.call('DEL', unpack(members, i, math.min(i + 499, #members)))
+    end
+    redis.call('DEL', tag)
+end
+return deleted
+"""
+
 
 def _infer_resource_id(
     kwargs: dict[str, Any], resource_id_type: type | tuple[type, ...]
@@ -97,7 +132,9 @@ def _construct_data_dict(
     """
     data_dict = {}
     for key in data_inside_brackets:
-        data_dict[key] = kwargs[key]
+        # '{current_user.employee_id}' formats an attribute of the current_user argument
+        name = key.split(".")[0]
+        data_dict[name] = kwargs[name]
     return data_dict
 
 
@@ -151,6 +188,254 @@ def _format_extra_data(
     return formatted_extra
 
 
+_scripts: dict[str, AsyncScript] = {}
+
+
+def _get_script(source: str) -> AsyncScript:
+    """Return a registered Lua script, so it is sent once and then called by its SHA."""
+    script = _scripts.get(source)
+    if script is None:
+        script = client.register_script(source)  # type: ignore
+        _scripts[source] = script
+    return script
+
+
+def _normalize_query_value(value: Any) -> Any:
+    """Normalize a query parameter value so equivalent requests produce the same cache key.
+
+    Parameters
+    ----------
+    value: Any
+        The parsed value of a query parameter.
+
+    Returns
+    -------
+    Any
+        A JSON serializable, order-independent representation of the value.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted(_normalize_query_value(item) for item in value)
+    return jsonable_encoder(value)
+
+
+def _caller_scope(kwargs: dict[str, Any], scope: str, scope_kwarg: str) -> str:
+    """Build the part of a cache key that depends on who is calling the endpoint.
+
+    Parameters
+    ----------
+    kwargs: Dict[str, Any]
+        A dictionary of keyword arguments, which must contain the caller's token data under `scope_kwarg`.
+    scope: str
+        'user' to cache per user, or 'permissions' to share entries between callers with the same permissions.
+    scope_kwarg: str
+        The name of the keyword argument holding the caller's token data.
+
+    Returns
+    -------
+    str
+        The caller scope.
+    """
+    token_data = kwargs[scope_kwarg]
+    if scope == "user":
+        return f"user:{token_data.user_id}"
+
+    if token_data.is_superuser:
+        return "permissions:*"
+    return "permissions:" + ",".join(sorted(set(token_data.permissions)))
+
+
+def build_query_cache_key(
+    prefix: str, params: dict[str, Any], scope: str | None = None
+) -> str:
+    """Build a deterministic cache key from query parameters and an optional caller scope.
+
+    Parameters with a `None` value are dropped and the rest are sorted, so the key does not depend on
+    the order in which the client sent them.
+
+    Parameters
+    ----------
+    prefix: str
+        The formatted key prefix.
+    params: Dict[str, Any]
+        The query parameters, by name.
+    scope: str | None, optional
+        The caller scope, as built by `_caller_scope`.
+
+    Returns
+    -------
+    str
+        The cache key.
+
+    Example
+    -------
+    >>> build_query_cache_key("employees", {"limit": 100, "skip": 0, "department_id": None})
+    'employees:q:...'
+    """
+    normalized = {
+        name: _normalize_query_value(value)
+        for name, value in sorted(params.items())
+        if value is not None
+    }
+    payload = json.dumps([normalized, scope], sort_keys=True, separators=(",", ":"))
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    return f"{prefix}:q:{digest}"
+
+
+def _tag_key(tag: str) -> str:
+    """Build the Redis key of the set holding every cache key registered under `tag`.
+
+    Parameters
+    ----------
+    tag: str
+        The already formatted tag name, e.g. 'employees' or 'payroll_records:42'.
+
+    Returns
+    -------
+    str
+        The Redis key of the tag set.
+    """
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def _format_tags(tags: list[str], kwargs: dict[str, Any]) -> list[str]:
+    """Format tag templates using keyword arguments.
+
+    Parameters
+    ----------
+    tags: List[str]
+        Tag templates, which may reference keyword arguments with curly brackets, e.g. 'payroll_records:{employee_id}'.
+    kwargs: Dict[str, Any]
+        A dictionary of keyword arguments.
+
+    Returns
+    -------
+    List[str]
+        The formatted tags.
+    """
+    return [_format_prefix(tag, kwargs) for tag in tags]
+
+
+def _prefix_tags(prefix: str) -> list[str]:
+    """List the tags a key cached under `prefix` is registered under: the prefix and each of its parents.
+
+    Registering the parents keeps the prefix semantics of `pattern_to_invalidate_extra`, so invalidating
+    'payroll_records' also deletes the keys cached under 'payroll_records:42'.
+
+    Parameters
+    ----------
+    prefix: str
+        The formatted key prefix, e.g. 'payroll_records:42'.
+
+    Returns
+    -------
+    List[str]
+        The tags, shortest first, e.g. ['payroll_records', 'payroll_records:42'].
+    """
+    segments = prefix.split(":")
+    return [":".join(segments[: index + 1]) for index in range(len(segments))]
+
+
+async def set_cached(
+    cache_key: str, serialized_data: str, expiration: int, tags: list[str] | None = None
+) -> None:
+    """Store a serialized value in Redis and register its key under the given tags.
+
+    The value and the tag registration are sent in a single pipeline, so caching a response costs one
+    round trip regardless of the number of tags.
+
+    Parameters
+    ----------
+    cache_key: str
+        The key under which the value is stored.
+    serialized_data: str
+        The serialized value.
+    expiration: int
+        The expiration time for the value in seconds.
+    tags: List[str] | None, optional
+        Formatted tags the key is registered under. Invalidating any of them deletes the key.
+    """
+    if client is None:
+        return
+
+    async with client.pipeline(transaction=False) as pipe:
+        pipe.set(cache_key, serialized_data, ex=expiration)
+        if tags:
+            await _get_script(_REGISTER_TAGS_LUA)(
+                keys=[_tag_key(tag) for tag in tags],
+                args=[cache_key, expiration],
+                client=pipe,
+            )
+        await pipe.execute()
+
+
+async def set_cached_many(
+    entries: dict[str, str], expiration: int, tags: list[str] | None = None
+) -> None:
+    """Store several serialized values in Redis in one round trip, registering each under the given tags.
+
+    Used to preload caches, so the entries must be stored under the same keys and tags the `cache`
+    decorator would use for them.
+
+    Parameters
+    ----------
+    entries: Dict[str, str]
+        The serialized values by cache key.
+    expiration: int
+        The expiration time for the values in seconds.
+    tags: List[str] | None, optional
+        Formatted tags every key is registered under.
+    """
+    if client is None or not entries:
+        return
+
+    async with client.pipeline(transaction=False) as pipe:
+        for cache_key, serialized_data in entries.items():
+            pipe.set(cache_key, serialized_data, ex=expiration)
+            if tags:
+                await _get_script(_REGISTER_TAGS_LUA)(
+                    keys=[_tag_key(tag) for tag in tags],
+                    args=[cache_key, expiration],
+                    client=pipe,
+                )
+        await pipe.execute()
+
+
+async def invalidate_tags(*tags: str) -> int:
+    """Delete every cache key registered under any of the given tags.
+
+    Each tag is deleted by a Lua script, so it is atomic and costs O(affected keys) instead of
+    a walk over the whole keyspace. The scripts for all tags share one round trip.
+
+    Parameters
+    ----------
+    *tags: str
+        Formatted tags to invalidate.
+
+    Returns
+    -------
+    int
+        The number of cache keys deleted.
+
+    Example
+    -------
+    >>> await invalidate_tags("employees", f"employee:{employee_id}")
+    """
+    if client is None or not tags:
+        return 0
+
+    # One script call per tag, pipelined, so deletions can be counted per tag
+    async with client.pipeline(transaction=False) as pipe:
+        for tag in tags:
+            await _get_script(_INVALIDATE_TAGS_LUA)(keys=[_tag_key(tag)], client=pipe)
+        counts = await pipe.execute()
+
+    for tag, count in zip(tags, counts):
+        cache_metrics.record_eviction(tag, count)
+    return sum(counts)
+
+
 async def _delete_keys_by_pattern(pattern: str) -> None:
     """Delete keys from Redis that match a given pattern using the SCAN command.
 
@@ -199,6 +484,11 @@ def cache(
     resource_id_type: type | tuple[type, ...] = int,
     to_invalidate_extra: dict[str, Any] | None = None,
     pattern_to_invalidate_extra: list[str] | None = None,
+    tags: list[str] | None = None,
+    tags_to_invalidate: list[str] | None = None,
+    query_key_params: list[str] | None = None,
+    scope: str | None = None,
+    scope_kwarg: str = "current_user",
 ) -> Callable:
     """Cache decorator for FastAPI endpoints.
 
@@ -223,7 +513,23 @@ def cache(
         These keys are invalidated when the decorated function is called with a method other than GET.
     pattern_to_invalidate_extra: List[str] | None, optional
         A list of string patterns for cache keys that should be invalidated when the decorated function is called.
-        This allows for bulk invalidation of cache keys based on a matching pattern.
+        This allows for bulk invalidation of cache keys based on a matching pattern. Patterns without glob
+        characters are resolved through the key prefix tags instead of a keyspace scan, so they match the keys
+        cached under that prefix or any prefix nested in it, e.g. 'user_items' covers 'user_items:{user_id}'.
+    tags: List[str] | None, optional
+        Tag templates the cached key is registered under on GET requests, in addition to its formatted key prefix.
+        Templates may reference attributes of an argument, e.g. 'my_payroll:{current_user.employee_id}'.
+    tags_to_invalidate: List[str] | None, optional
+        Tag templates whose registered keys are deleted when the decorated function is called with a method
+        other than GET.
+    query_key_params: List[str] | None, optional
+        Opt-in for list endpoints. The names of the keyword arguments (query parameters) the response depends on.
+        When provided, the cache key is built from their normalized values instead of a single resource ID.
+    scope: str | None, optional
+        'user' or 'permissions'. Adds the caller's user ID or permission set to the cache key, for endpoints whose
+        response depends on who is calling. Defaults to None, meaning entries are shared between callers.
+    scope_kwarg: str, default "current_user"
+        The name of the keyword argument holding the caller's token data. Used only if `scope` is provided.
 
     Returns
     -------
@@ -250,6 +556,28 @@ def cache(
     This decorator caches the response data of the endpoint function using a unique cache key.
     The cached data is retrieved for GET requests, and the cache is invalidated for other types of requests.
 
+    List Endpoint Example
+    ---------------------
+    ```python
+    @app.get("/employees")
+    @cache(
+        key_prefix="employees",
+        query_key_params=["department_id", "skip", "limit"],
+        scope="permissions",
+    )
+    async def list_employees(
+        request: Request,
+        department_id: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        current_user: TokenData = Depends(get_current_user_from_token),
+    ):
+        return await EmployeeService.get_employees(db, department_id, skip=skip, limit=limit)
+    ```
+
+    Here `?limit=100&department_id=1` and `?department_id=1` share a cache entry, because the key is built
+    from the parsed parameters, while callers with different permissions never share one.
+
     Advanced Example Usage
     -------------
     ```python
@@ -289,9 +617,14 @@ def cache(
     Note
     ----
     - resource_id_type is used only if resource_id is not passed.
-    - `to_invalidate_extra` and `pattern_to_invalidate_extra` are used for cache invalidation on methods other than GET.
-    - Using `pattern_to_invalidate_extra` can be resource-intensive on large datasets. Use it judiciously and
-      consider the potential impact on Redis performance.
+    - `to_invalidate_extra`, `pattern_to_invalidate_extra` and `tags_to_invalidate` are used for cache invalidation
+      on methods other than GET.
+    - Every cached key is registered as a tag under its formatted key prefix and each parent of it, split on ':'.
+      `pattern_to_invalidate_extra=["user_items"]` or `tags_to_invalidate=["user_items"]` touch the keys cached
+      under 'user_items' and 'user_items:{user_id}' alike. A pattern matching part of a segment needs a glob.
+    - Using `pattern_to_invalidate_extra` with glob characters still scans the keyspace. Prefer tags.
+    - Hits, misses, recompute time, payload size and invalidated keys are recorded in `cache_metrics`,
+      labelled with the first segment of `key_prefix`.
     """
 
     def wrapper(func: Callable) -> Callable:
@@ -300,49 +633,80 @@ def cache(
             if client is None:
                 raise MissingClientError
 
-            if resource_id_name:
-                resource_id = kwargs[resource_id_name]
-            else:
-                resource_id = _infer_resource_id(
-                    kwargs=kwargs, resource_id_type=resource_id_type
+            formatted_key_prefix = _format_prefix(key_prefix, kwargs)
+            if query_key_params is not None:
+                caller_scope = (
+                    _caller_scope(kwargs, scope, scope_kwarg) if scope else None
+                )
+                cache_key = build_query_cache_key(
+                    formatted_key_prefix,
+                    {name: kwargs.get(name) for name in query_key_params},
+                    caller_scope,
                 )
+            else:
+                if resource_id_name:
+                    resource_id = kwargs[resource_id_name]
+                else:
+                    resource_id = _infer_resource_id(
+                        kwargs=kwargs, resource_id_type=resource_id_type
+                    )
+                cache_key = f"{formatted_key_prefix}:{resource_id}"
 
-            formatted_key_prefix = _format_prefix(key_prefix, kwargs)
-            cache_key = f"{formatted_key_prefix}:{resource_id}"
             if request.method == "GET":
                 if (
                     to_invalidate_extra is not None
                     or pattern_to_invalidate_extra is not None
+                    or tags_to_invalidate is not None
                 ):
                     raise InvalidRequestError
 
                 cached_data = await client.get(cache_key)
                 if cached_data:
+                    cache_metrics.record_lookup(key_prefix, "hit")
                     return json.loads(cached_data.decode())
+                cache_metrics.record_lookup(key_prefix, "miss")
 
+            elapsed = cache_metrics.timer()
             result = await func(request, *args, **kwargs)
 
             if request.method == "GET":
+                cache_metrics.observe_recompute(key_prefix, elapsed())
                 serializable_data = jsonable_encoder(result)
                 serialized_data = json.dumps(serializable_data)
+                cache_metrics.observe_payload(key_prefix, len(serialized_data))
 
-                await client.set(cache_key, serialized_data)
-                await client.expire(cache_key, expiration)
+                cache_tags = _prefix_tags(formatted_key_prefix)
+                if tags is not None:
+                    cache_tags.extend(_format_tags(tags, kwargs))
+                await set_cached(cache_key, serialized_data, expiration, cache_tags)
 
-                return json.loads(serialized_data)
+                return serializable_data
 
             else:
-                await client.delete(cache_key)
+                cache_metrics.record_eviction(key_prefix, await client.delete(cache_key))
                 if to_invalidate_extra is not None:
                     formatted_extra = _format_extra_data(to_invalidate_extra, kwargs)
                     for prefix, id in formatted_extra.items():
                         extra_cache_key = f"{prefix}:{id}"
                         await client.delete(extra_cache_key)
 
+                tags_to_delete: list[str] = []
+                if query_key_params is not None:
+                    tags_to_delete.append(formatted_key_prefix)
+
+                if tags_to_invalidate is not None:
+                    tags_to_delete.extend(_format_tags(tags_to_invalidate, kwargs))
+
                 if pattern_to_invalidate_extra is not None:
                     for pattern in pattern_to_invalidate_extra:
                         formatted_pattern = _format_prefix(pattern, kwargs)
-                        await _delete_keys_by_pattern(formatted_pattern + "*")
+                        if _GLOB_CHARACTERS.search(formatted_pattern):
+                            await _delete_keys_by_pattern(formatted_pattern + "*")
+                        else:
+                            tags_to_delete.append(formatted_pattern.rstrip(":"))
+
+                if tags_to_delete:
+                    await invalidate_tags(*tags_to_delete)
 
             return result
 
@@ -351,6 +715,66 @@ def cache(
     return wrapper
 
 
+def _missing_key(kind: str, value: Any) -> str:
+    """Build the Redis key recording that no `kind` resource exists for `value`."""
+    return f"{MISSING_KEY_PREFIX}:{kind}:{value}"
+
+
+async def is_known_missing(kind: str, value: Any) -> bool:
+    """Check whether a lookup was recently found to match no resource.
+
+    Parameters
+    ----------
+    kind: str
+        The kind of lookup, e.g. 'employee:code'.
+    value: Any
+        The looked up value.
+
+    Returns
+    -------
+    bool
+        True if a negative entry exists for the lookup. Always False when Redis is not available.
+    """
+    if client is None:
+        return False
+
+    return bool(await client.exists(_missing_key(kind, value)))
+
+
+async def remember_missing(kind: str, value: Any, expiration: int) -> None:
+    """Record that a lookup matched no resource, so repeated lookups skip the database.
+
+    Negative entries must be short-lived, since they are only cleared explicitly by `forget_missing`.
+
+    Parameters
+    ----------
+    kind: str
+        The kind of lookup, e.g. 'employee:code'.
+    value: Any
+        The looked up value.
+    expiration: int
+        The expiration time for the negative entry in seconds.
+    """
+    if client is None:
+        return
+
+    await client.set(_missing_key(kind, value), 1, ex=expiration)
+
+
+async def forget_missing(*lookups: tuple[str, Any]) -> None:
+    """Delete negative entries, typically right after the resource has been created.
+
+    Parameters
+    ----------
+    *lookups: Tuple[str, Any]
+        (kind, value) pairs, as passed to `remember_missing`.
+    """
+    if client is None or not lookups:
+        return
+
+    await client.delete(*[_missing_key(kind, value) for kind, value in lookups])
+
+
 async def async_get_redis() -> AsyncGenerator[Redis, None]:
     """Get a Redis client from the pool for each request."""
     client = Redis(connection_pool=pool)
@@ -1,99 +1,82 @@
-import json
+import logging
+from typing import List
 
-import aio_pika
 from shared.cache.permissions import get_permission_cache
+from shared.messaging.batching import MicroBatcher
+from shared.messaging.consumer import EventConsumer
+from shared.messaging.idempotency import IdempotencyStore
+
 from app.core.config import settings
 
-class AuthEventConsumer:
+logger = logging.getLogger(__name__)
+
+
+class AuthEventConsumer(EventConsumer):
     """
     Listen to auth events in Employee/Payroll services
-    Invalidate cache when permissions change
+    Invalidate cache when permissions change. Invalidations arriving within a short
+    window are deduplicated by user and deleted in one pipelined round trip
     """
 
-    def __init__(self, rabbitmq_url: str):
-        self.rabbitmq_url = rabbitmq_url
-        self.connection = None
-        self.channel = None
-
-    async def start(self):
-        """Start consuming auth events"""
-        self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
-        self.channel = await self.connection.channel()
-
-        # Declare exchange
-        exchange = await self.channel.declare_exchange(
-            "auth_events", aio_pika.ExchangeType.TOPIC, durable=True
+    def __init__(self, rabbitmq_url: str, idempotency: IdempotencyStore | None = None):
+        super().__init__(
+            rabbitmq_url,
+            exchange_name="auth_events",
+            # Queue is unique per service, e.g. "employee_service_auth_events"
+            queue_name=f"{settings.SERVICE_NAME}_auth_events",
+            # Permission/role events
+            routing_keys=["user.permissions.#", "user.role.#", "user.deactivated"],
+            handlers={
+                "user.permissions.changed": self.handle_permissions_changed,
+                "user.role.assigned": self.handle_role_changed,
+                "user.role.removed": self.handle_role_changed,
+                "user.deactivated": self.handle_user_deactivated,
+            },
+            # Handlers mostly wait on their batch, so let a full batch be in flight
+            prefetch_count=max(
+                settings.CONSUMER_PREFETCH_COUNT, settings.CONSUMER_BATCH_SIZE
+            ),
+            concurrency=max(settings.CONSUMER_CONCURRENCY, settings.CONSUMER_BATCH_SIZE),
+            idempotency=idempotency,
+            max_attempts=settings.CONSUMER_MAX_ATTEMPTS,
+            retry_base_delay=settings.CONSUMER_RETRY_BASE_DELAY,
+            retry_max_delay=settings.CONSUMER_RETRY_MAX_DELAY,
+            drain_timeout=settings.CONSUMER_DRAIN_TIMEOUT,
         )
-
-        # Declare queue (unique per service)
-        queue = await self.channel.declare_queue(
-            f"{settings.SERVICE_NAME}_auth_events",  # e.g., "employee_service_auth_events"
-            durable=True,
+        self.invalidations: MicroBatcher[str] = MicroBatcher(
+            self.invalidate_users,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
         )
 
-        # Bind to permission/role events
-        await queue.bind(exchange, routing_key="user.permissions.#")
-        await queue.bind(exchange, routing_key="user.role.#")
-        await queue.bind(exchange, routing_key="user.deactivated")
-
-        # Start consuming
-        await queue.consume(self.process_message)
-        print(f"✅ {settings.SERVICE_NAME}: Listening for auth events")
-
-    async def process_message(self, message: aio_pika.IncomingMessage):
-        """Process auth event"""
-        async with message.process():
-            try:
-                event_data = json.loads(message.body.decode())
-                event_type = event_data.get("event_type")
-
-                print(f"📩 Received auth event: {event_type}")
-
-                if event_type == "user.permissions.changed":
-                    await self.handle_permissions_changed(event_data)
-                elif event_type in ["user.role.assigned", "user.role.removed"]:
-                    await self.handle_role_changed(event_data)
-                elif event_type == "user.deactivated":
-                    await self.handle_user_deactivated(event_data)
-
-            except Exception as e:
-                print(f"❌ Error processing auth event: {e}")
-
     async def handle_permissions_changed(self, event_data: dict):
         """Handle permission change - invalidate cache"""
-        user_id = event_data["user_id"]
-
-        print(f"🔄 Permissions changed for user {user_id}")
-        print(f"   Removed: {event_data.get('removed_permissions', [])}")
-        print(f"   Added: {event_data.get('added_permissions', [])}")
-
-        # Invalidate cache - user will get fresh permissions on next request
-        cache = await get_permission_cache()
-        await cache.invalidate_all_for_user(user_id)
-
-        print(f"✅ Cache invalidated for user {user_id}")
+        logger.debug(
+            f"Permissions changed for user {event_data['user_id']}: "
+            f"removed {event_data.get('removed_permissions', [])}, "
+            f"added {event_data.get('added_permissions', [])}"
+        )
+        # User will get fresh permissions on next request
+        await self.invalidations.submit(event_data["user_id"])
 
     async def handle_role_changed(self, event_data: dict):
         """Handle role assignment/removal - invalidate cache"""
-        user_id = event_data["user_id"]
-        role_name = event_data["role_name"]
-
-        print(f"🔄 Role '{role_name}' changed for user {user_id}")
-
-        # Invalidate cache
-        cache = await get_permission_cache()
-        await cache.invalidate_all_for_user(user_id)
-
-        print(f"✅ Cache invalidated for user {user_id}")
+        logger.debug(
+            f"Role '{event_data['role_name']}' changed for user {event_data['user_id']}"
+        )
+        await self.invalidations.submit(event_data["user_id"])
 
     async def handle_user_deactivated(self, event_data: dict):
         """Handle user deactivation - invalidate everything"""
-        user_id = event_data["user_id"]
+        logger.debug(f"User {event_data['user_id']} deactivated")
+        await self.invalidations.submit(event_data["user_id"])
 
-        print(f"🚫 User {user_id} deactivated")
-
-        # Invalidate cache
+    @staticmethod
+    async def invalidate_users(user_ids: List[str]):
+        unique_user_ids = set(user_ids)
         cache = await get_permission_cache()
-        await cache.invalidate_all_for_user(user_id)
-
-        print(f"✅ All cache cleared for user {user_id}")
+        await cache.invalidate_all_for_users(unique_user_ids)
+        logger.info(
+            f"Invalidated cached access of {len(unique_user_ids)} users "
+            f"for {len(user_ids)} events"
+        )
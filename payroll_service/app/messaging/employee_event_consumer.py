@@ -0,0 +1,56 @@
+from typing import List
+
+from shared.messaging.batching import MicroBatcher
+from shared.messaging.consumer import EventConsumer
+from shared.messaging.idempotency import IdempotencyStore
+
+from app.core.config import settings
+from app.core.db import local_session
+from app.services.employee_projection import (
+    PROJECTED_EVENTS,
+    EmployeeProjectionService,
+)
+
+
+class EmployeeEventConsumer(EventConsumer):
+    """
+    Maintain the local employee projection from employee events
+    Events are applied in micro-batches, one upsert per batch
+    """
+
+    def __init__(self, rabbitmq_url: str, idempotency: IdempotencyStore | None = None):
+        super().__init__(
+            rabbitmq_url,
+            exchange_name="employee_events",
+            # Queue is unique per service, e.g. "payroll_service_employee_events"
+            queue_name=f"{settings.SERVICE_NAME}_employee_events",
+            routing_keys=["employee.*"],
+            handlers={
+                event_type: self.handle_employee_event
+                for event_type in PROJECTED_EVENTS
+            },
+            # Handlers mostly wait on their batch, so let a full batch be in flight
+            prefetch_count=max(
+                settings.CONSUMER_PREFETCH_COUNT, settings.CONSUMER_BATCH_SIZE
+            ),
+            concurrency=max(settings.CONSUMER_CONCURRENCY, settings.CONSUMER_BATCH_SIZE),
+            idempotency=idempotency,
+            max_attempts=settings.CONSUMER_MAX_ATTEMPTS,
+            retry_base_delay=settings.CONSUMER_RETRY_BASE_DELAY,
+            retry_max_delay=settings.CONSUMER_RETRY_MAX_DELAY,
+            drain_timeout=settings.CONSUMER_DRAIN_TIMEOUT,
+        )
+        self.projection: MicroBatcher[dict] = MicroBatcher(
+            self.apply_events,
+            max_size=settings.CONSUMER_BATCH_SIZE,
+            max_wait=settings.CONSUMER_BATCH_WAIT,
+        )
+
+    async def handle_employee_event(self, event_data: dict):
+        """Handle any employee event - update the projection"""
+        await self.projection.submit(event_data)
+
+    @staticmethod
+    async def apply_events(events: List[dict]):
+        async with local_session() as db:
+            await EmployeeProjectionService.apply_events(db, events)
@@ -1,6 +1,7 @@
-from uuid import uuid4
-from datetime import datetime, date
-from app.messaging.rabbitmq import RabbitMQClient
+from datetime import date
+from app.messaging.outbox import stage_event
+from shared.messaging.events import PayrollProcessedEvent, SalaryChangedEvent
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class PayrollEventPublisher:
@@ -10,36 +11,30 @@ class PayrollEventPublisher:
     
     @staticmethod
     async def publish_payroll_processed(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         payroll_record
     ):
         """
         Publish event when payroll is successfully processed
         Other services might need this (e.g., Finance Service, Accounting)
         """
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "payroll.processed",
-            "timestamp": datetime.utcnow().isoformat(),
-            "employee_id": payroll_record.employee_id,
-            "payroll_id": str(payroll_record.id),
-            "pay_period_start": payroll_record.pay_period_start.isoformat(),
-            "pay_period_end": payroll_record.pay_period_end.isoformat(),
-            "gross_salary": float(payroll_record.gross_salary),
-            "net_salary": float(payroll_record.net_salary),
-            "payment_date": payroll_record.payment_date.isoformat() if payroll_record.payment_date else None,
-            "payment_method": payroll_record.payment_method
-        }
-        
-        await rabbitmq.publish_event(
-            routing_key="payroll.processed",
-            event_data=event
+        event = PayrollProcessedEvent(
+            employee_id=str(payroll_record.employee_id),
+            payroll_id=str(payroll_record.id),
+            pay_period_start=payroll_record.pay_period_start,
+            pay_period_end=payroll_record.pay_period_end,
+            gross_salary=float(payroll_record.gross_salary),
+            net_salary=float(payroll_record.net_salary),
+            payment_date=payroll_record.payment_date,
+            payment_method=payroll_record.payment_method
         )
-        print(f"📤 Published payroll.processed event for employee {payroll_record.employee_id}")
+        
+        stage_event(db, "payroll.processed", event)
+        print(f"📤 Staged payroll.processed event for employee {payroll_record.employee_id}")
     
     @staticmethod
     async def publish_salary_changed(
-        rabbitmq: RabbitMQClient,
+        db: AsyncSession,
         employee_id: str,
         old_salary: float,
         new_salary: float,
@@ -49,19 +44,13 @@ class PayrollEventPublisher:
         Publish event when employee salary changes
         HR/Finance might need this for budgeting
         """
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": "salary.changed",
-            "timestamp": datetime.utcnow().isoformat(),
-            "employee_id": employee_id,
-            "old_salary": float(old_salary),
-            "new_salary": float(new_salary),
-            "effective_from": effective_from.isoformat(),
-            "change_percentage": ((new_salary - old_salary) / old_salary * 100) if old_salary > 0 else 0
-        }
-        
-        await rabbitmq.publish_event(
-            routing_key="salary.changed",
-            event_data=event
+        event = SalaryChangedEvent(
+            employee_id=str(employee_id),
+            old_salary=float(old_salary),
+            new_salary=float(new_salary),
+            effective_from=effective_from,
+            change_percentage=((new_salary - old_salary) / old_salary * 100) if old_salary > 0 else 0
         )
-        print(f"📤 Published salary.changed event for employee {employee_id}")
+        
+        stage_event(db, "salary.changed", event)
+        print(f"📤 Staged salary.changed event for employee {employee_id}")
@@ -1,61 +1,34 @@
-import json
-from datetime import datetime
-from typing import Annotated, Any, Dict
-from uuid import uuid4
+from typing import Annotated
 
-import aio_pika
 from fastapi import Depends
-
-
-class RabbitMQClient:
-    def __init__(self, rabbitmq_url: str):
-        self.rabbitmq_url = rabbitmq_url
-        self.connection = None
-        self.channel = None
-        self.exchange = None
-
-    async def connect(self):
-        """Establish connection to RabbitMQ"""
-        self.connection = await aio_pika.connect_robust(self.rabbitmq_url)
-        self.channel = await self.connection.channel()
-
-        # Declare exchange for employee events
-        self.exchange = await self.channel.declare_exchange(
-            "employee_events", aio_pika.ExchangeType.TOPIC, durable=True
-        )
-
-    async def close(self):
-        """Close connection"""
-        if self.connection:
-            await self.connection.close()
-
-    async def publish_event(self, routing_key: str, event_data: Dict[str, Any]):
-        """Publish an event to the exchange"""
-        if not self.channel:
-            await self.connect()
-
-        message = aio_pika.Message(
-            body=json.dumps(event_data).encode(),
-            content_type="application/json",
-            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-        )
-
-        await self.exchange.publish(message, routing_key=routing_key)
-
+from shared.messaging.rabbitmq import RabbitMQClient
 
 # Global RabbitMQ client instance
 rabbitmq_client = None
 
 
-async def get_rabbitmq_client() -> RabbitMQClient:
-    """Dependency to get RabbitMQ client"""
+def create_rabbitmq_client() -> RabbitMQClient:
+    """Create the process-wide client without connecting it"""
     global rabbitmq_client
     if rabbitmq_client is None:
         from app.core.config import settings
 
-        rabbitmq_client = RabbitMQClient(settings.RABBITMQ_URL)
-        await rabbitmq_client.connect()
+        rabbitmq_client = RabbitMQClient(
+            settings.RABBITMQ_URL,
+            settings.RABBITMQ_EXCHANGE,
+            channel_pool_size=settings.RABBITMQ_CHANNEL_POOL_SIZE,
+            batch_size=settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+            buffer_size=settings.RABBITMQ_PUBLISH_BUFFER_SIZE,
+            content_type=settings.EVENT_CONTENT_TYPE,
+        )
     return rabbitmq_client
 
 
+async def get_rabbitmq_client() -> RabbitMQClient:
+    """Dependency to get RabbitMQ client"""
+    client = create_rabbitmq_client()
+    await client.ensure_connected()
+    return client
+
+
 RabbitMQDep = Annotated[RabbitMQClient, Depends(get_rabbitmq_client)]
@@ -0,0 +1,8 @@
+from shared.messaging.outbox import OutboxEventMixin
+
+from app.models.base import BaseModel
+
+
+# OUTBOX EVENT
+class OutboxEvent(OutboxEventMixin, BaseModel):
+    """Domain event written in the same transaction as the change it describes"""
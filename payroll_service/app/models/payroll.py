@@ -4,7 +4,17 @@ from typing import List, Optional
 from uuid import uuid4
 
 from app.models.base import BaseModel
-from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -80,6 +90,15 @@ class PayrollRecord(BaseModel):
     """
 
     __tablename__ = "payroll_records"
+    __table_args__ = (
+        # Keyset pagination orders an employee's records by (pay_period_start, id)
+        Index(
+            "ix_payroll_records_employee_period_id",
+            "employee_id",
+            "pay_period_start",
+            "id",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid4())
@@ -0,0 +1,29 @@
+import calendar
+import json
+from datetime import date
+
+from app.core.db import local_session
+from app.core.utils.cache import build_query_cache_key, set_cached_many
+from app.core.utils.warmer import warm_set
+from app.services.payroll import PayrollService
+from fastapi.encoders import jsonable_encoder
+
+
+@warm_set("payroll_summary")
+async def warm_current_payroll_summary() -> int:
+    """Preload the payroll summary of the current month"""
+    today = date.today()
+    start_date = today.replace(day=1)
+    end_date = today.replace(day=calendar.monthrange(today.year, today.month)[1])
+
+    async with local_session() as db:
+        summary = await PayrollService.get_payroll_summary(db, start_date, end_date)
+
+    # Key, tag and expiration mirror the @cache decorator of GET /summary
+    cache_key = build_query_cache_key(
+        "payroll_summary", {"start_date": start_date, "end_date": end_date}
+    )
+    await set_cached_many(
+        {cache_key: json.dumps(jsonable_encoder(summary))}, 600, ["payroll_summary"]
+    )
+    return 1
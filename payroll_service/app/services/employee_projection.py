@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from app.models.employee_projection import EmployeeProjection
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Employee events that carry the projected fields
+PROJECTED_EVENTS = (
+    "employee.created",
+    "employee.updated",
+    "employee.terminated",
+    "employee.snapshot",
+)
+
+# Columns taken from events, which carry the employee's whole current state, so a
+# None clears the stored value
+PROJECTED_COLUMNS = (
+    "employee_code",
+    "email",
+    "user_id",
+    "first_name",
+    "last_name",
+    "department_id",
+    "employment_status",
+)
+
+# Status implied by the event type, for events published before they carried one
+IMPLIED_STATUS = {"employee.created": "active", "employee.terminated": "terminated"}
+
+
+class EmployeeProjectionService:
+
+    @staticmethod
+    def row_from_event(event_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map an employee event to a projection row"""
+        timestamp = event_data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return {
+            "employee_id": event_data["employee_id"],
+            "employee_code": event_data["employee_code"],
+            "email": event_data["employee_email"],
+            "user_id": event_data.get("user_id"),
+            "first_name": event_data.get("first_name"),
+            "last_name": event_data.get("last_name"),
+            "department_id": event_data.get("department_id"),
+            "employment_status": event_data.get("employment_status")
+            or IMPLIED_STATUS.get(event_data["event_type"]),
+            "last_event_at": timestamp,
+        }
+
+    @staticmethod
+    async def apply_events(db: AsyncSession, events: Iterable[Dict[str, Any]]) -> int:
+        """
+        Upsert the projection from a batch of employee events in one statement
+
+        A row only moves forward: an event older than the one the row reflects is
+        ignored, so batches can be applied out of order and events replayed safely.
+        The newest event of an employee replaces the whole row.
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for event_data in events:
+            row = EmployeeProjectionService.row_from_event(event_data)
+            current = rows.get(row["employee_id"])
+            if current is None or row["last_event_at"] >= current["last_event_at"]:
+                rows[row["employee_id"]] = row
+        if not rows:
+            return 0
+
+        insert = (
+            postgresql.insert
+            if db.bind.dialect.name == "postgresql"
+            else sqlite.insert
+        )
+        table = EmployeeProjection.__table__
+        stmt = insert(table).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.employee_id],
+            set_={
+                **{column: stmt.excluded[column] for column in PROJECTED_COLUMNS},
+                "last_event_at": stmt.excluded.last_event_at,
+            },
+            where=stmt.excluded.last_event_at >= table.c.last_event_at,
+        )
+        await db.execute(stmt)
+        await db.commit()
+        return len(rows)
+
+    @staticmethod
+    async def get_employee(
+        db: AsyncSession, employee_id: str
+    ) -> Optional[EmployeeProjection]:
+        """Get the projected employee"""
+        return await db.get(EmployeeProjection, employee_id)
@@ -2,7 +2,9 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import List, Optional
 
-from app.messaging.rabbitmq import RabbitMQClient
+from app.core.config import settings
+from app.core.utils.cache import forget_missing, is_known_missing, remember_missing
+from app.messaging.event_publisher import PayrollEventPublisher
 from fastapi import HTTPException, status
 from schemas.payroll import (
     EmployeeSalaryCreate,
@@ -13,6 +15,7 @@ from schemas.payroll import (
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from shared.db.pagination import paginate
 
 from models.payroll import (
     EmployeeSalary,
@@ -50,6 +53,7 @@ class EmployeeSalaryService:
         db.add(salary)
         await db.commit()
         await db.refresh(salary)
+        await forget_missing(("salary:employee_id", salary.employee_id))
 
         return salary
 
@@ -58,7 +62,11 @@ class EmployeeSalaryService:
         db: AsyncSession, employee_id: str, as_of_date: Optional[date] = None
     ) -> Optional[EmployeeSalary]:
         """Get current or historical salary for employee"""
-        if as_of_date is None:
+        # Only current lookups are negative cached, historical ones vary by date
+        is_current_lookup = as_of_date is None
+        if is_current_lookup:
+            if await is_known_missing("salary:employee_id", employee_id):
+                return None
             as_of_date = date.today()
 
         stmt = select(EmployeeSalary).where(
@@ -70,7 +78,13 @@ class EmployeeSalaryService:
             )
         )
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        salary = result.scalar_one_or_none()
+
+        if salary is None and is_current_lookup:
+            await remember_missing(
+                "salary:employee_id", employee_id, settings.NEGATIVE_CACHE_EXPIRATION
+            )
+        return salary
 
     @staticmethod
     async def get_salary_history(
@@ -219,8 +233,9 @@ class PayrollService:
         year: Optional[int] = None,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[PayrollRecord]:
-        """Get payroll records for employee"""
+        """Get payroll records for employee, latest period first, after `cursor` if given"""
         stmt = select(PayrollRecord).where(PayrollRecord.employee_id == employee_id)
 
         if year:
@@ -228,10 +243,14 @@ class PayrollService:
                 func.extract("year", PayrollRecord.pay_period_start) == year
             )
 
-        stmt = (
-            stmt.order_by(PayrollRecord.pay_period_start.desc())
-            .offset(skip)
-            .limit(limit)
+        stmt = paginate(
+            stmt,
+            PayrollRecord.pay_period_start,
+            PayrollRecord.id,
+            limit,
+            cursor,
+            skip,
+            descending=True,
         )
 
         result = await db.execute(stmt)
@@ -266,9 +285,8 @@ class PayrollService:
         payroll_id: str,
         payment_method: str,
         payment_reference: str,
-        rabbitmq: RabbitMQClient = None,
     ) -> PayrollRecord:
-        """Mark payroll as paid and publish event"""
+        """Mark payroll as paid and stage its event in the same transaction"""
         payroll = await PayrollService.get_payroll_record(db, payroll_id)
 
         if not payroll:
@@ -289,15 +307,11 @@ class PayrollService:
         payroll.payment_method = payment_method
         payroll.payment_reference = payment_reference
 
+        await PayrollEventPublisher.publish_payroll_processed(db, payroll)
+
         await db.commit()
         await db.refresh(payroll)
 
-        # Publish event
-        if rabbitmq:
-            from payroll_service.app.messaging.event_publisher import PayrollEventPublisher
-
-            await PayrollEventPublisher.publish_payroll_processed(rabbitmq, payroll)
-
         return payroll
 
     @staticmethod
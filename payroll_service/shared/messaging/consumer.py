@@ -0,0 +1,437 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Collection, Iterable
+from datetime import UTC, datetime
+from typing import Any, Dict, List, Optional
+
+import aio_pika
+
+from .codec import decode
+from .connection import ConnectionMonitor, connect_with_retry
+from .events import parse_event
+from .idempotency import CLAIMED, DONE, IdempotencyStore
+
+logger = logging.getLogger(__name__)
+
+# Called with the decoded event
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Direct exchange routing dead letters to '<queue>.dead_letter' by queue name
+DEAD_LETTER_EXCHANGE = "dead_letters"
+
+ATTEMPT_HEADER = "x-attempt"
+ERROR_HEADER = "x-last-error"
+DEAD_LETTERED_AT_HEADER = "x-dead-lettered-at"
+
+
+class EventConsumer:
+    """
+    Consume a queue bound to a topic exchange with a bounded pool of handlers
+
+    `prefetch_count` caps how many unacknowledged messages the broker pushes to this
+    consumer, `concurrency` how many of them are handled at once. The handler is picked
+    by the event_type of each message, and the event is validated against its
+    registered schema before the handler runs. With an idempotency store, an event whose
+    event_id was already handled is acked without running its handler again, and one
+    still being handled elsewhere is parked in a delay queue until that finishes.
+
+    A failed message is parked in a delay queue and comes back after an exponential
+    backoff. After `max_attempts` it is moved to the queue's dead-letter queue, where
+    it can be inspected and replayed.
+
+    `start` keeps retrying while the broker is unreachable, aio_pika then restores the
+    connection and consumer on its own. `stop` lets in-flight handlers finish for up
+    to `drain_timeout` seconds and hands prefetched messages that had not started
+    back to the broker, so a rolling deploy neither drops nor re-runs handled events.
+    """
+
+    def __init__(
+        self,
+        rabbitmq_url: str,
+        exchange_name: str,
+        queue_name: str,
+        routing_keys: Iterable[str],
+        handlers: Dict[str, Handler],
+        prefetch_count: int = 50,
+        concurrency: int = 10,
+        idempotency: Optional[IdempotencyStore] = None,
+        max_attempts: int = 5,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 300.0,
+        drain_timeout: float = 30.0,
+    ):
+        self.rabbitmq_url = rabbitmq_url
+        self.exchange_name = exchange_name
+        self.queue_name = queue_name
+        self.routing_keys = list(routing_keys)
+        self.handlers = handlers
+        self.prefetch_count = prefetch_count
+        self.concurrency = concurrency
+        self.idempotency = idempotency
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.drain_timeout = drain_timeout
+        self.monitor = ConnectionMonitor(queue_name)
+        self.in_flight = 0
+        self.connection = None
+        self.channel = None
+        self.queue = None
+        self.dead_letter_exchange = None
+        self.consumer_tag = None
+        self._handler_slots = asyncio.Semaphore(concurrency)
+        self._stopping = False
+        # Events this consumer holds an idempotency claim on while their handler runs
+        self._claimed: set = set()
+
+    async def start(self):
+        """Connect, declare the queue and its bindings, then start consuming"""
+        self.connection = await connect_with_retry(
+            lambda: aio_pika.connect_robust(self.rabbitmq_url), self.monitor
+        )
+        self.monitor.attach(self.connection)
+        self.channel = await self.connection.channel()
+        await self.channel.set_qos(prefetch_count=self.prefetch_count)
+
+        exchange = await self.channel.declare_exchange(
+            self.exchange_name, aio_pika.ExchangeType.TOPIC, durable=True
+        )
+        self.queue = await self.channel.declare_queue(self.queue_name, durable=True)
+        for routing_key in self.routing_keys:
+            await self.queue.bind(exchange, routing_key=routing_key)
+        await self._declare_retry_queues()
+
+        self.consumer_tag = await self.queue.consume(self._on_message)
+        logger.info(
+            f"Consuming {self.queue_name} with {self.concurrency} handlers, "
+            f"prefetch {self.prefetch_count}"
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Whether messages are being consumed"""
+        return (
+            self.consumer_tag is not None
+            and self.monitor.connected
+            and not self._stopping
+        )
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "queue": self.queue_name,
+            "ready": self.ready,
+            "in_flight": self.in_flight,
+            **self.monitor.status(),
+        }
+
+    @property
+    def dead_letter_queue_name(self) -> str:
+        return f"{self.queue_name}.dead_letter"
+
+    def retry_delay(self, attempt: int) -> float:
+        """Seconds to wait before delivering a message again after its `attempt`-th failure"""
+        return min(self.retry_base_delay * 2 ** (attempt - 1), self.retry_max_delay)
+
+    def retry_queue_name(self, attempt: int) -> str:
+        # Named after the delay, since a queue's TTL cannot change once declared
+        return f"{self.queue_name}.retry.{int(self.retry_delay(attempt) * 1000)}ms"
+
+    async def _declare_retry_queues(self):
+        self.dead_letter_exchange = await self.channel.declare_exchange(
+            DEAD_LETTER_EXCHANGE, aio_pika.ExchangeType.DIRECT, durable=True
+        )
+        dead_letter_queue = await self.channel.declare_queue(
+            self.dead_letter_queue_name, durable=True
+        )
+        await dead_letter_queue.bind(
+            self.dead_letter_exchange, routing_key=self.queue_name
+        )
+
+        # Delay queues have no consumers: messages expire after the backoff and are
+        # dead-lettered back onto the main queue through the default exchange
+        for attempt in range(1, self.max_attempts):
+            await self.channel.declare_queue(
+                self.retry_queue_name(attempt),
+                durable=True,
+                arguments={
+                    "x-message-ttl": int(self.retry_delay(attempt) * 1000),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue_name,
+                },
+            )
+
+    async def stop(self):
+        """Stop receiving messages, let in-flight handlers finish, then disconnect"""
+        self._stopping = True
+        if self.queue is not None and self.consumer_tag is not None:
+            try:
+                await self.queue.cancel(self.consumer_tag)
+            except Exception as e:
+                logger.warning(f"Could not cancel consuming {self.queue_name}: {e}")
+            self.consumer_tag = None
+
+        try:
+            await asyncio.wait_for(self._drain(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            # Their messages were never acked, so the broker redelivers them, and their
+            # claims are dropped so the redeliveries are not deferred until they expire
+            logger.warning(
+                f"{self.in_flight} handlers still running on {self.queue_name} after "
+                f"{self.drain_timeout}s, their messages will be redelivered"
+            )
+            await self._release_claims()
+
+        if self.channel:
+            await self.channel.close()
+
+        if self.connection:
+            await self.connection.close()
+
+    async def _release_claims(self):
+        for event_id in list(self._claimed):
+            try:
+                await self.idempotency.release(event_id)
+            except Exception as e:
+                logger.warning(f"Could not release event {event_id}: {e}")
+        self._claimed.clear()
+
+    async def _drain(self):
+        # Every running handler holds a slot, so taking them all waits for those to finish
+        for _ in range(self.concurrency):
+            await self._handler_slots.acquire()
+
+    async def _on_message(self, message: aio_pika.abc.AbstractIncomingMessage):
+        async with self._handler_slots:
+            if self._stopping:
+                # Prefetched but not started, another instance can take it right away
+                await message.nack(requeue=True)
+                return
+            self.in_flight += 1
+            try:
+                await self.process_message(message)
+            finally:
+                self.in_flight -= 1
+
+    async def process_message(self, message: aio_pika.abc.AbstractIncomingMessage):
+        """Run the handler for a message, acking it on success and retrying it on failure"""
+        event_data = self._decode(message)
+        if event_data is None:
+            logger.error(f"Dead-lettering malformed message on {self.queue_name}")
+            await self._fail(message, ValueError("Malformed event"), retry=False)
+            return
+
+        event_type = event_data.get("event_type")
+        handler = self.handlers.get(event_type)
+        if handler is None:
+            await message.ack()
+            return
+
+        try:
+            event_data = parse_event(event_data).model_dump(mode="json")
+        except ValueError as e:
+            # An event that fails its schema fails every time, so it is not retried
+            logger.error(f"Dead-lettering invalid {event_type} event: {e}")
+            await self._fail(message, e, retry=False)
+            return
+
+        event_id = event_data.get("event_id") or message.message_id
+        if event_id:
+            state = await self._claim(event_id)
+            if state == DONE:
+                logger.info(f"Skipping {event_type} event {event_id}, already handled")
+                await message.ack()
+                return
+            if state != CLAIMED:
+                # The claimant may still fail or die, so the message must not be lost
+                logger.info(f"Deferring {event_type} event {event_id}, being handled")
+                await self._defer(message)
+                return
+            if self.idempotency is not None:
+                self._claimed.add(event_id)
+
+        try:
+            await handler(event_data)
+        except Exception as e:
+            self._claimed.discard(event_id)
+            logger.exception(f"Failed to handle {event_type} event {event_id}: {e}")
+            if event_id and self.idempotency is not None:
+                try:
+                    await self.idempotency.release(event_id)
+                except Exception as e:
+                    logger.warning(f"Could not release event {event_id}: {e}")
+            await self._fail(message, e)
+            return
+
+        self._claimed.discard(event_id)
+        if event_id and self.idempotency is not None:
+            try:
+                await self.idempotency.complete(event_id)
+            except Exception as e:
+                logger.warning(f"Could not mark event {event_id} handled: {e}")
+        await message.ack()
+
+    async def _claim(self, event_id: str) -> str:
+        if self.idempotency is None:
+            return CLAIMED
+        try:
+            return await self.idempotency.claim(event_id)
+        except Exception as e:
+            # Handlers are safe to run twice, so an unavailable store only loses deduplication
+            logger.warning(f"Idempotency store unavailable, handling {event_id}: {e}")
+            return CLAIMED
+
+    @staticmethod
+    def _decode(message: aio_pika.abc.AbstractIncomingMessage) -> Optional[Dict[str, Any]]:
+        try:
+            event_data = decode(message.body, message.content_type)
+        except ValueError:
+            return None
+        return event_data if isinstance(event_data, dict) else None
+
+    @staticmethod
+    def _attempt(message: aio_pika.abc.AbstractIncomingMessage) -> int:
+        return int((message.headers or {}).get(ATTEMPT_HEADER, 1))
+
+    def _copy(
+        self, message: aio_pika.abc.AbstractIncomingMessage, **headers: Any
+    ) -> aio_pika.Message:
+        return aio_pika.Message(
+            body=message.body,
+            headers={**(message.headers or {}), **headers},
+            content_type=message.content_type,
+            message_id=message.message_id,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        )
+
+    async def _defer(self, message: aio_pika.abc.AbstractIncomingMessage):
+        """Deliver a message again after a delay, without spending one of its attempts"""
+        attempt = self._attempt(message)
+        if self.max_attempts < 2:
+            # No delay queues are declared
+            await message.nack(requeue=True)
+            return
+        try:
+            await self.channel.default_exchange.publish(
+                self._copy(message),
+                routing_key=self.retry_queue_name(min(attempt, self.max_attempts - 1)),
+            )
+        except Exception as e:
+            logger.exception(f"Could not defer message: {e}")
+            await message.nack(requeue=True)
+            return
+        await message.ack()
+
+    async def _fail(
+        self,
+        message: aio_pika.abc.AbstractIncomingMessage,
+        error: Exception,
+        retry: bool = True,
+    ):
+        """Park a failed message in its delay queue, or dead-letter it once out of attempts"""
+        attempt = self._attempt(message)
+        try:
+            if retry and attempt < self.max_attempts:
+                await self.channel.default_exchange.publish(
+                    self._copy(
+                        message, **{ATTEMPT_HEADER: attempt + 1, ERROR_HEADER: str(error)}
+                    ),
+                    routing_key=self.retry_queue_name(attempt),
+                )
+                logger.warning(
+                    f"Retrying message on {self.queue_name} in {self.retry_delay(attempt)}s "
+                    f"(attempt {attempt + 1} of {self.max_attempts})"
+                )
+            else:
+                await self.dead_letter_exchange.publish(
+                    self._copy(
+                        message,
+                        **{
+                            ERROR_HEADER: str(error),
+                            DEAD_LETTERED_AT_HEADER: datetime.now(UTC).isoformat(),
+                        },
+                    ),
+                    routing_key=self.queue_name,
+                )
+                logger.error(
+                    f"Dead-lettered message on {self.queue_name} after {attempt} attempts"
+                )
+        except Exception as e:
+            # The channel confirms publishes, so only ack once the copy is safely queued
+            logger.exception(f"Could not reschedule failed message: {e}")
+            await message.nack(requeue=True)
+            return
+        await message.ack()
+
+    async def _get_dead_letters(
+        self, limit: int
+    ) -> List[aio_pika.abc.AbstractIncomingMessage]:
+        # Fetched messages stay unacked, so the same one is never fetched twice
+        queue = await self.channel.get_queue(self.dead_letter_queue_name, ensure=False)
+        messages = []
+        while len(messages) < limit:
+            message = await queue.get(no_ack=False, fail=False)
+            if message is None:
+                break
+            messages.append(message)
+        return messages
+
+    async def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Describe up to `limit` dead letters, leaving them on the dead-letter queue"""
+        messages = await self._get_dead_letters(limit)
+        try:
+            dead_letters = []
+            for message in messages:
+                headers = message.headers or {}
+                event_data = self._decode(message)
+                dead_letters.append(
+                    {
+                        "event_id": (event_data or {}).get("event_id")
+                        or message.message_id,
+                        "event_type": (event_data or {}).get("event_type"),
+                        "attempts": self._attempt(message),
+                        "error": headers.get(ERROR_HEADER),
+                        "dead_lettered_at": headers.get(DEAD_LETTERED_AT_HEADER),
+                        "event": (
+                            event_data
+                            if event_data is not None
+                            else message.body.decode(errors="replace")
+                        ),
+                    }
+                )
+            return dead_letters
+        finally:
+            for message in messages:
+                await message.nack(requeue=True)
+
+    async def replay_dead_letters(
+        self, event_ids: Optional[Collection[str]] = None, limit: int = 100
+    ) -> int:
+        """
+        Move dead letters back onto the main queue with a fresh attempt count
+
+        Replays the first `limit` dead letters, or only those among them whose
+        event_id is in `event_ids`. Returns how many were replayed.
+        """
+        messages = await self._get_dead_letters(limit)
+        replayed = 0
+        try:
+            while messages:
+                message = messages[0]
+                event_id = (self._decode(message) or {}).get(
+                    "event_id"
+                ) or message.message_id
+                if event_ids is None or event_id in event_ids:
+                    await self.channel.default_exchange.publish(
+                        self._copy(message, **{ATTEMPT_HEADER: 1}),
+                        routing_key=self.queue_name,
+                    )
+                    await message.ack()
+                    replayed += 1
+                else:
+                    await message.nack(requeue=True)
+                messages.pop(0)
+        finally:
+            # Anything left after a failed publish goes back to the dead-letter queue
+            for message in messages:
+                await message.nack(requeue=True)
+        return replayed
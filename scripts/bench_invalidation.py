@@ -0,0 +1,117 @@
+"""
+Replay a burst of permission-change events against Redis, invalidating per event
+and coalesced, and compare throughput and Redis commands
+
+Kept out of the shared package, run it from a service directory, which vendors it as `shared`:
+
+    cd employee_service
+    PYTHONPATH=. python ../scripts/bench_invalidation.py --url redis://localhost:6379 --events 50000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import List
+
+from shared.cache.permissions import PermissionCache
+from shared.messaging.batching import MicroBatcher
+
+
+async def seed(cache: PermissionCache, user_ids: List[str]):
+    await cache.set_many_user_access(
+        {user_id: ["employees:read"] for user_id in user_ids},
+        {user_id: ["employee"] for user_id in user_ids},
+    )
+
+
+async def replay(
+    events: List[str], handle: Callable[[str], Awaitable[None]], concurrency: int
+):
+    """Handle every event with at most `concurrency` in flight, like a consumer"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def handle_event(user_id: str):
+        async with slots:
+            await handle(user_id)
+
+    await asyncio.gather(*(handle_event(user_id) for user_id in events))
+
+
+async def run(
+    cache: PermissionCache,
+    name: str,
+    events: List[str],
+    user_ids: List[str],
+    handle: Callable[[str], Awaitable[None]],
+    concurrency: int,
+):
+    await seed(cache, user_ids)
+    commands_before = (await cache.redis_client.info("stats"))[
+        "total_commands_processed"
+    ]
+    started = time.perf_counter()
+    await replay(events, handle, concurrency)
+    elapsed = time.perf_counter() - started
+    commands = (await cache.redis_client.info("stats"))[
+        "total_commands_processed"
+    ] - commands_before
+
+    print(
+        f"{name:<12}{elapsed:>10.2f}s{len(events) / elapsed:>14.0f}/s"
+        f"{commands - 1:>14}"  # minus the INFO call itself
+    )
+
+
+async def main(
+    url: str,
+    events: int,
+    users: int,
+    concurrency: int,
+    batch_size: int,
+    batch_wait: float,
+):
+    cache = PermissionCache(url)
+    user_ids = [f"bench-{n}" for n in range(users)]
+    # A bulk reassignment touches each user a few times in quick succession
+    burst = [random.choice(user_ids) for _ in range(events)]
+
+    coalescer: MicroBatcher[str] = MicroBatcher(
+        cache.invalidate_all_for_users, max_size=batch_size, max_wait=batch_wait
+    )
+
+    print(f"{events} events for {users} users, {concurrency} handlers\n")
+    print(f"{'MODE':<12}{'TIME':>11}{'THROUGHPUT':>16}{'COMMANDS':>14}")
+    try:
+        await run(
+            cache, "per-event", burst, user_ids, cache.invalidate_all_for_user, concurrency
+        )
+        await run(cache, "coalesced", burst, user_ids, coalescer.submit, concurrency)
+    finally:
+        await cache.redis_client.delete(
+            *(cache._user_permission_key(user_id) for user_id in user_ids),
+            *(cache._user_roles_key(user_id) for user_id in user_ids),
+        )
+        await cache.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="redis://localhost:6379")
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--batch-wait", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.url,
+            args.events,
+            args.users,
+            args.concurrency,
+            args.batch_size,
+            args.batch_wait,
+        )
+    )